@@ -1,14 +1,141 @@
 import hashlib
 import hmac
 import os
+import re
 import time
-from typing import Any, Dict
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from utils.crypto_utils import get_secret, hmac_sha256_hex
+from utils.crypto_utils import KeyRing, SigningKey, get_secret
 from utils.observability import get_logger, log_exception, log_json
 
 logger = get_logger(__name__)
 
+_KEY_ID_PATTERN = re.compile(r"[A-Za-z0-9_.-]{1,64}")
+_SIGNATURE_PATTERN = re.compile(r"[0-9a-fA-F]{64}")
+_KEY_RING = KeyRing(
+    lambda secret_name, **kwargs: get_secret(secret_name, **kwargs),
+    ttl_seconds=int(os.environ.get("KEY_RING_TTL_SECONDS", "300")),
+)
+
+_DECISION_CACHE: "OrderedDict[Tuple[str, ...], Tuple[Dict[str, Any], float]]" = (
+    OrderedDict()
+)
+_NEGATIVE_CACHE: "OrderedDict[Tuple[str, ...], Tuple[bool, float]]" = OrderedDict()
+# Client key ids whose secret could not be loaded (unknown, deleted, or a
+# Secrets Manager error), so random x-jarvis-key-id values cost one fetch each.
+_KEY_FAILURE_CACHE: "OrderedDict[Tuple[str, ...], Tuple[bool, float]]" = OrderedDict()
+_SOURCE_BUCKETS: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+_SOURCE_BUCKETS_MAX_ENTRIES = 4096
+
+
+def _signing_keys(key_id: Optional[str]) -> List[SigningKey]:
+    if not key_id:
+        return _KEY_RING.keys(os.environ["SECRET_NAME"])
+    client_prefix = os.environ.get("CLIENT_SECRET_PREFIX")
+    if not client_prefix:
+        raise ValueError("CLIENT_SECRET_PREFIX is not set")
+    if not _KEY_ID_PATTERN.fullmatch(key_id):
+        raise ValueError("Invalid key id")
+    try:
+        return _KEY_RING.keys(f"{client_prefix}{key_id}", key_id=key_id)
+    except Exception:
+        _key_failure_put(key_id, time.time())
+        raise
+
+
+def _cache_get(
+    cache: "OrderedDict[Tuple[str, ...], Tuple[Any, float]]",
+    key: Tuple[str, ...],
+    now: float,
+) -> Any:
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    value, expires_at = entry
+    if expires_at <= now:
+        cache.pop(key, None)
+        return None
+    cache.move_to_end(key)
+    return value
+
+
+def _cache_put(
+    cache: "OrderedDict[Tuple[str, ...], Tuple[Any, float]]",
+    key: Tuple[str, ...],
+    value: Any,
+    expires_at: float,
+    max_entries: int,
+) -> None:
+    if max_entries <= 0 or expires_at <= time.time():
+        return
+    cache[key] = (value, expires_at)
+    cache.move_to_end(key)
+    while len(cache) > max_entries:
+        cache.popitem(last=False)
+
+
+def _decision_cache_get(
+    key: Tuple[str, ...], now: float
+) -> Optional[Dict[str, Any]]:
+    return _cache_get(_DECISION_CACHE, key, now)
+
+
+def _decision_cache_put(
+    key: Tuple[str, ...], policy: Dict[str, Any], expires_at: float
+) -> None:
+    max_entries = int(os.environ.get("DECISION_CACHE_MAX_ENTRIES", "1024"))
+    _cache_put(_DECISION_CACHE, key, policy, expires_at, max_entries)
+
+
+def _negative_cache_hit(key: Tuple[str, ...], now: float) -> bool:
+    return bool(_cache_get(_NEGATIVE_CACHE, key, now))
+
+
+def _negative_cache_put(key: Tuple[str, ...], now: float) -> None:
+    ttl_seconds = int(os.environ.get("NEGATIVE_CACHE_TTL_SECONDS", "60"))
+    max_entries = int(os.environ.get("NEGATIVE_CACHE_MAX_ENTRIES", "4096"))
+    _cache_put(_NEGATIVE_CACHE, key, True, now + ttl_seconds, max_entries)
+
+
+def _key_failure_hit(key_id: str, now: float) -> bool:
+    return bool(_cache_get(_KEY_FAILURE_CACHE, (key_id,), now))
+
+
+def _key_failure_put(key_id: str, now: float) -> None:
+    ttl_seconds = int(os.environ.get("KEY_FAILURE_TTL_SECONDS", "30"))
+    max_entries = int(os.environ.get("KEY_FAILURE_CACHE_MAX_ENTRIES", "4096"))
+    _cache_put(_KEY_FAILURE_CACHE, (key_id,), True, now + ttl_seconds, max_entries)
+
+
+def _take_source_token(source_ip: str, now: float) -> bool:
+    """Spend one token from the per-source bucket; False once it is empty."""
+    rate = float(os.environ.get("SOURCE_RATE_PER_SECOND", "50"))
+    if not source_ip or rate <= 0:
+        return True
+    burst = float(os.environ.get("SOURCE_BURST", str(rate * 2)))
+    bucket = _SOURCE_BUCKETS.get(source_ip)
+    if bucket is None:
+        tokens = burst
+    else:
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    _SOURCE_BUCKETS[source_ip] = (tokens, now)
+    _SOURCE_BUCKETS.move_to_end(source_ip)
+    while len(_SOURCE_BUCKETS) > _SOURCE_BUCKETS_MAX_ENTRIES:
+        _SOURCE_BUCKETS.popitem(last=False)
+    return allowed
+
+
+def _parse_timestamp(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def _allow_resource_from_method_arn(method_arn: str) -> str:
     if not method_arn or method_arn == "*":
         return method_arn or "*"
@@ -29,6 +156,10 @@ def _allow_resource_from_method_arn(method_arn: str) -> str:
     )
 
 
+def _cacheable_policies() -> bool:
+    return os.environ.get("AUTHORIZER_CACHEABLE_POLICIES", "").lower() in ("1", "true", "yes")
+
+
 def _policy(effect: str, resource: str) -> Dict[str, Any]:
     return {
         "principalId": "jarvis-webhook",
@@ -41,6 +172,20 @@ def _policy(effect: str, resource: str) -> Dict[str, Any]:
     }
 
 
+def _is_http_api_event(event: Dict[str, Any]) -> bool:
+    return event.get("version") == "2.0"
+
+
+def _response(event: Dict[str, Any], effect: str, resource: str) -> Dict[str, Any]:
+    """IAM policy for REST APIs; simple boolean response for HTTP APIs."""
+    if _is_http_api_event(event):
+        return {
+            "isAuthorized": effect == "Allow",
+            "context": {"principalId": "jarvis-webhook"},
+        }
+    return _policy(effect, resource)
+
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     headers = event.get("headers") or {}
     headers_lc = {
@@ -48,26 +193,55 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     }
     timestamp = headers_lc.get("x-jarvis-timestamp")
     signature = headers_lc.get("x-jarvis-signature")
-    method_arn = event.get("methodArn", "")
+    key_id = headers_lc.get("x-jarvis-key-id")
+    # HTTP API (payload 2.0) events carry routeArn, which has the same shape.
+    method_arn = event.get("methodArn") or event.get("routeArn") or ""
     request_id = (
         event.get("requestContext", {}).get("requestId")
         or event.get("requestId")
         or ""
     )
-    allow_resource = _allow_resource_from_method_arn(method_arn)
+    cacheable = _cacheable_policies()
+    # Only REST authorizers turn a raised "Unauthorized" into an uncached 401;
+    # an HTTP API reports it as a 500, so those events get a Deny response.
+    raise_unauthorized = cacheable and not _is_http_api_event(event)
 
-    log_json(
-        logger,
-        "info",
-        "authorizer_request",
-        request_id=request_id,
-        method_arn=method_arn,
-        header_keys=list(headers_lc.keys()),
+    # Retries and bursty clients resend identical headers; reuse the Allow
+    # policy built for the same (timestamp, methodArn, signature) tuple.
+    cache_key = (str(timestamp), method_arn, str(signature), key_id or "")
+    now = time.time()
+    cached_policy = _decision_cache_get(cache_key, now)
+    if cached_policy is not None:
+        log_json(
+            logger,
+            "debug",
+            "authorizer_cache_hit",
+            request_id=request_id,
+            method_arn=method_arn,
+        )
+        return cached_policy
+
+    # Shed abusive traffic before any secret work or per-request logging.
+    request_context = event.get("requestContext") or {}
+    source_ip = (
+        request_context.get("identity", {}).get("sourceIp")
+        or request_context.get("http", {}).get("sourceIp")
+        or ""
     )
+    if not _take_source_token(source_ip, now):
+        log_json(
+            logger,
+            "debug",
+            "authorizer_deny_rate_limited",
+            request_id=request_id,
+            source_ip=source_ip,
+        )
+        if raise_unauthorized:
+            raise Exception("Unauthorized")
+        return _response(event, "Deny", method_arn)
 
-    try:
-        timestamp_int = int(timestamp)
-    except (TypeError, ValueError):
+    timestamp_int = _parse_timestamp(timestamp)
+    if timestamp_int is None:
         log_json(
             logger,
             "warning",
@@ -75,7 +249,57 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             request_id=request_id,
             method_arn=method_arn,
         )
-        return _policy("Deny", event["methodArn"])
+        return _response(event, "Deny", method_arn)
+
+    if not signature or not _SIGNATURE_PATTERN.fullmatch(signature):
+        log_json(
+            logger,
+            "warning",
+            "authorizer_deny_malformed_signature",
+            request_id=request_id,
+            method_arn=method_arn,
+        )
+        return _response(event, "Deny", method_arn)
+
+    if _negative_cache_hit(cache_key, now):
+        log_json(
+            logger,
+            "debug",
+            "authorizer_deny_cached",
+            request_id=request_id,
+            method_arn=method_arn,
+        )
+        return _response(event, "Deny", method_arn)
+
+    if key_id and _key_failure_hit(key_id, now):
+        log_json(
+            logger,
+            "debug",
+            "authorizer_deny_key_unavailable",
+            request_id=request_id,
+            method_arn=method_arn,
+            key_id=key_id,
+        )
+        if raise_unauthorized:
+            # Same as a failed load: a 401 is not cached against the headers.
+            raise Exception("Unauthorized")
+        return _response(event, "Deny", method_arn)
+
+    # API Gateway caches the returned policy per identity source (timestamp +
+    # signature). The signature only covers this exact methodArn, so a cached
+    # Allow must not be widened to other stages.
+    allow_resource = (
+        method_arn if cacheable else _allow_resource_from_method_arn(method_arn)
+    )
+
+    log_json(
+        logger,
+        "info",
+        "authorizer_request",
+        request_id=request_id,
+        method_arn=method_arn,
+        header_keys=list(headers_lc.keys()),
+    )
 
     max_skew = int(os.environ.get("MAX_SKEW_SECONDS", "300"))
     now_ts = int(time.time())
@@ -95,12 +319,18 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
 
     try:
-        secret_name = os.environ["SECRET_NAME"]
-        shared_secret = get_secret(secret_name)
+        signing_keys = _signing_keys(key_id)
 
         string_to_sign = f"{timestamp}.{method_arn}"
-        expected_sig = hmac_sha256_hex(shared_secret, string_to_sign)
         provided_sig = signature or ""
+        expected_sig = ""
+        matched_key = None
+        for signing_key in signing_keys:
+            candidate_sig = signing_key.sign_hex(string_to_sign)
+            expected_sig = expected_sig or candidate_sig
+            if hmac.compare_digest(candidate_sig, provided_sig):
+                matched_key = signing_key
+                break
 
         log_json(
             logger,
@@ -111,20 +341,24 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             string_to_sign_sha256=hashlib.sha256(
                 string_to_sign.encode("utf-8")
             ).hexdigest(),
+            key_id=key_id,
             provided_sig_prefix=(provided_sig or "")[:8],
             expected_sig_prefix=(expected_sig or "")[:8],
+            matched_version_stage=matched_key.version_stage if matched_key else None,
         )
 
-        if not hmac.compare_digest(expected_sig, provided_sig):
+        if matched_key is None:
             log_json(
                 logger,
                 "warning",
                 "authorizer_deny_signature_mismatch",
                 request_id=request_id,
                 method_arn=method_arn,
+                key_id=key_id,
                 signature_prefix=(signature or "")[:8],
             )
-            return _policy("Deny", event["methodArn"])
+            _negative_cache_put(cache_key, now)
+            return _response(event, "Deny", method_arn)
     except Exception:
         log_exception(
             logger,
@@ -132,6 +366,14 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             request_id=request_id,
             method_arn=method_arn,
         )
-        return _policy("Deny", event["methodArn"])
+        if raise_unauthorized:
+            # Raising returns 401 without a policy, so a transient failure is
+            # not cached against otherwise valid headers.
+            raise Exception("Unauthorized")
+        return _response(event, "Deny", method_arn)
 
-    return _policy("Allow", allow_resource)
+    policy = _response(event, "Allow", allow_resource)
+    # The timestamp is client-supplied: a future-dated request must not stay
+    # cached past the skew window (or past a key rotated out of the ring).
+    _decision_cache_put(cache_key, policy, min(timestamp_int, now_ts) + max_skew)
+    return policy
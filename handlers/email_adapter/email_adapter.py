@@ -9,13 +9,20 @@ from utils.aws_clients import get_account_id, get_s3_client
 from utils.crypto_utils import hmac_sha256_hex
 from utils.email_utils import parse_raw_email
 from utils.http_client import post_json
-from utils.lambda_time import http_timeout_seconds, remaining_ms
+from utils.idempotency import (
+    IDEMPOTENCY_KEY_FIELD,
+    body_idempotency_key,
+    email_idempotency_key,
+)
+from utils.lambda_time import Deadline
 from utils.observability import emit_metric, get_logger, log_exception, log_json
 from utils.s3_events import extract_s3_location_from_event, infer_message_id_from_key
 from utils.secrets import configure_secret_cache, get_secret_cached
 
 LOGGER = get_logger(__name__)
 METRIC_DIMS = {"Service": "jarvis", "Component": "email_adapter"}
+DEADLINE_RESERVE_MS = 1000
+PUBLISH_TIMEOUT_SECONDS = 10
 
 
 def emit_email_metric(
@@ -155,6 +162,12 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "subject": parsed_email["subject"],
             "text": parsed_email["text"],
             "s3": {"bucket": bucket, "key": decoded_key},
+            # Duplicate S3 events and SES redeliveries of one email share this
+            # key; without a Message-ID, the stored object identifies the email.
+            IDEMPOTENCY_KEY_FIELD: email_idempotency_key(
+                str(parsed_email.get("message_id") or "")
+            )
+            or body_idempotency_key(f"s3://{bucket}/{decoded_key}"),
         }
 
         try:
@@ -180,20 +193,9 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             error_logged = True
             raise
 
-        rem_ms = remaining_ms(context)
-        if rem_ms < 4000:
-            log_json(
-                LOGGER,
-                "warning",
-                "email_adapter_abort_low_time",
-                aws_request_id=aws_request_id,
-                bucket=bucket,
-                key=decoded_key,
-                message_id=message_id,
-                duration_ms=int((time.time() - start_time) * 1000),
-                remaining_ms=rem_ms,
-            )
-            raise RuntimeError("Aborting secret fetch due to low remaining time")
+        # One budget for the secret fetch and the publish, keeping time back
+        # for the error log and metrics on the way out.
+        deadline = Deadline.from_context(context, reserve_ms=DEADLINE_RESERVE_MS)
 
         # TODO: If Lambda runs in a VPC, ensure NAT or a VPC interface endpoint for
         # Secrets Manager; otherwise calls may hang.
@@ -202,7 +204,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             metric_dims=METRIC_DIMS,
             aws_request_id=aws_request_id,
         )
-        shared_secret = get_secret_cached(secret_name)
+        shared_secret = get_secret_cached(secret_name, deadline=deadline)
 
         publish_start = time.time()
         ingress_host = urlparse(ingress_url).hostname or ""
@@ -217,7 +219,6 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             duration_ms=int((publish_start - start_time) * 1000),
             ingress_host=ingress_host,
         )
-        timeout_seconds = http_timeout_seconds(context, cap=10, reserve_s=1, floor=1)
         publish_failure_emitted = False
         try:
             timestamp = str(int(time.time()))
@@ -241,7 +242,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     "x-jarvis-signature": signature,
                 },
                 body_bytes=body,
-                timeout_seconds=timeout_seconds,
+                timeout_seconds=PUBLISH_TIMEOUT_SECONDS,
+                deadline=deadline,
             )
             log_json(
                 LOGGER,
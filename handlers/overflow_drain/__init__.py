@@ -0,0 +1 @@
+"""Overflow drain handler package."""
@@ -0,0 +1,92 @@
+import json
+import os
+from typing import Any, Dict
+
+from utils.aws_clients import get_s3_client, get_sqs_client
+from utils.lambda_time import remaining_ms
+from utils.observability import get_logger, log_exception, log_json
+from utils.overflow import DEFAULT_PREFIX, DEFAULT_REJECTED_PREFIX, requeue_messages
+
+logger = get_logger(__name__)
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    bucket = os.environ["OVERFLOW_BUCKET"]
+    prefix = os.environ.get("OVERFLOW_PREFIX", DEFAULT_PREFIX)
+    rejected_prefix = os.environ.get("OVERFLOW_REJECTED_PREFIX", DEFAULT_REJECTED_PREFIX)
+    max_objects = int(os.environ.get("DRAIN_MAX_OBJECTS", "100"))
+    s3_client = get_s3_client()
+    sqs_client = get_sqs_client()
+
+    listing = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=max_objects)
+    objects = listing.get("Contents", [])
+    drained = 0
+    requeued = 0
+    remaining = 0
+    rejected = 0
+    for obj in objects:
+        if remaining_ms(context) < 5000:
+            log_json(logger, "warning", "overflow_drain_abort_low_time", drained=drained)
+            break
+        key = obj["Key"]
+        try:
+            body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+            messages = [
+                json.loads(line) for line in body.decode("utf-8").splitlines() if line.strip()
+            ]
+            still_failing, sender_faults = requeue_messages(sqs_client, messages)
+            if sender_faults:
+                # Dead-letter entries SQS rejects outright so they stop blocking
+                # the object from draining but stay around for inspection.
+                rejected_key = rejected_prefix + key[len(prefix) :]
+                s3_client.put_object(
+                    Bucket=bucket,
+                    Key=rejected_key,
+                    Body="\n".join(json.dumps(message) for message in sender_faults).encode(
+                        "utf-8"
+                    ),
+                    ContentType="application/x-ndjson",
+                )
+                log_json(
+                    logger,
+                    "warning",
+                    "overflow_drain_rejected",
+                    key=key,
+                    rejected_key=rejected_key,
+                    count=len(sender_faults),
+                )
+            if still_failing:
+                s3_client.put_object(
+                    Bucket=bucket,
+                    Key=key,
+                    Body="\n".join(json.dumps(message) for message in still_failing).encode(
+                        "utf-8"
+                    ),
+                    ContentType="application/x-ndjson",
+                )
+            else:
+                s3_client.delete_object(Bucket=bucket, Key=key)
+        except Exception:
+            log_exception(logger, "overflow_drain_object_failed", bucket=bucket, key=key)
+            continue
+        drained += 1
+        requeued += len(messages) - len(still_failing) - len(sender_faults)
+        remaining += len(still_failing)
+        rejected += len(sender_faults)
+
+    log_json(
+        logger,
+        "info",
+        "overflow_drain_done",
+        objects=len(objects),
+        drained=drained,
+        requeued=requeued,
+        remaining=remaining,
+        rejected=rejected,
+    )
+    return {
+        "objects": len(objects),
+        "requeued": requeued,
+        "remaining": remaining,
+        "rejected": rejected,
+    }
@@ -1,16 +1,42 @@
 import base64
+import hashlib
 import json
 import os
-from typing import Any, Dict
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
 
 import boto3
 
-from utils.observability import get_logger, log_exception
+from utils.claim_check import offload_large_body
+from utils.email_utils import parse_sender_email
+from utils.envelopes import build_raw_envelope
+from utils.idempotency import stamp_idempotency_key
+from utils.observability import get_logger, log_exception, log_json
+from utils.overflow import spill_messages
+from utils.retry import call_with_retries, retry_delay
+from utils.routing import compile_routing_table
+from utils.sqs_codec import encode_message_body
 
 logger = get_logger(__name__)
 
 sqs_client = boto3.client("sqs")
 QUEUE_URL = os.environ.get("INGRESS_QUEUE_URL")
+ENVELOPE_MODE = os.environ.get("ROUTER_ENVELOPE_MODE", "parsed").lower()
+MESSAGE_CODEC = os.environ.get("SQS_MESSAGE_CODEC", "")
+MESSAGE_CODEC_MIN_BYTES = int(os.environ.get("SQS_MESSAGE_CODEC_MIN_BYTES", "1024"))
+QUEUE_FIFO = os.environ.get("INGRESS_QUEUE_FIFO", "").lower() == "true"
+# Compiled once per container; lanes without a queue URL fall back to QUEUE_URL.
+ROUTING_TABLE = compile_routing_table(os.environ.get("ROUTING_RULES"))
+LANE_QUEUE_URLS: Dict[str, str] = json.loads(os.environ.get("LANE_QUEUE_URLS") or "{}")
+
+_GROUP_ID_INVALID_CHARS = re.compile(r"[^A-Za-z0-9!-/:-@\[-`{-~]")
+
+SQS_BATCH_LIMIT = 10
+SQS_BATCH_MAX_BYTES = 256 * 1024
+MAX_BATCH_ITEMS = int(os.environ.get("MAX_BATCH_ITEMS", "500"))
+BATCH_SEND_CONCURRENCY = int(os.environ.get("BATCH_SEND_CONCURRENCY", "4"))
 
 
 def _decode_body(event: Dict[str, Any]) -> str:
@@ -20,35 +46,351 @@ def _decode_body(event: Dict[str, Any]) -> str:
     return body
 
 
-def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
-    raw_body = _decode_body(event)
+def _parse_body(raw_body: str) -> Any:
     try:
-        parsed_body = json.loads(raw_body) if raw_body else None
+        return json.loads(raw_body) if raw_body else None
     except json.JSONDecodeError:
-        parsed_body = {"raw": raw_body}
+        return {"raw": raw_body}
 
-    request_id = event.get("requestContext", {}).get("requestId")
-    payload = {
-        "requestId": request_id,
-        "body": parsed_body,
+
+def _header(event: Dict[str, Any], name: str) -> str:
+    for key, value in (event.get("headers") or {}).items():
+        if key is not None and str(key).lower() == name:
+            return value or ""
+    return ""
+
+
+def _is_batch_resource(event: Dict[str, Any]) -> bool:
+    # REST proxy events set resource/path; HTTP API payload 2.0 sets rawPath.
+    resource = (
+        event.get("resource") or event.get("path") or event.get("rawPath") or ""
+    )
+    return resource.rstrip("/").endswith("/batch")
+
+
+def _is_ndjson(event: Dict[str, Any]) -> bool:
+    content_type = _header(event, "content-type").split(";", 1)[0].strip().lower()
+    return content_type in ("application/x-ndjson", "application/ndjson")
+
+
+def _split_ndjson(raw_body: str) -> List[Any]:
+    return [_parse_body(line) for line in raw_body.splitlines() if line.strip()]
+
+
+def _split_batch_body(raw_body: str) -> List[Any]:
+    """Split a JSON array or NDJSON body into one item per envelope."""
+    try:
+        parsed = json.loads(raw_body) if raw_body else []
+    except json.JSONDecodeError:
+        return _split_ndjson(raw_body)
+    return parsed if isinstance(parsed, list) else [parsed]
+
+
+def _fifo_fields(envelope: Dict[str, Any]) -> Dict[str, str]:
+    """Group by sender (or source) and deduplicate on a hash of the body content."""
+    body = envelope.get("body")
+    group_id = ""
+    if isinstance(body, dict):
+        if body.get("from"):
+            group_id = parse_sender_email(str(body["from"]))
+        elif body.get("source"):
+            group_id = str(body["source"])
+    if "rawBody" in envelope:
+        content = str(envelope["rawBody"])
+    else:
+        content = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    group_id = _GROUP_ID_INVALID_CHARS.sub("_", group_id)[:128]
+    dedup_id = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return {
+        # Deduplication is scoped per message group, so the fallback group must
+        # be stable across retries of the same body (the request ID is not).
+        "MessageGroupId": group_id or f"body-{dedup_id[:32]}",
+        "MessageDeduplicationId": dedup_id,
     }
 
-    if QUEUE_URL:
+
+def _queue_url_for(envelope: Dict[str, Any]) -> str:
+    if not LANE_QUEUE_URLS:
+        return QUEUE_URL
+    lane = ROUTING_TABLE.classify(envelope.get("body"))
+    return LANE_QUEUE_URLS.get(lane) or QUEUE_URL
+
+
+def _encode_envelope(envelope: Dict[str, Any]) -> Dict[str, Any]:
+    """Return SendMessage fields for ``envelope``: compressed, then claim-checked."""
+    message_body, attributes = encode_message_body(
+        json.dumps(envelope), MESSAGE_CODEC, MESSAGE_CODEC_MIN_BYTES
+    )
+    message: Dict[str, Any] = {"MessageBody": message_body}
+    offloaded = offload_large_body(envelope, message_body)
+    if offloaded is not message_body:
+        message["MessageBody"] = offloaded
+    elif attributes:
+        message["MessageAttributes"] = attributes
+    if QUEUE_FIFO:
+        message.update(_fifo_fields(envelope))
+    return message
+
+
+def _spill(
+    queue_url: str,
+    items: List[Tuple[int, Dict[str, Any]]],
+    request_id: Any,
+) -> bool:
+    try:
+        key = spill_messages(queue_url, [message for _, message in items])
+    except Exception:
+        log_exception(
+            logger,
+            "ingress_spill_failed",
+            request_id=request_id,
+            queue_url=queue_url,
+            entries=len(items),
+        )
+        return False
+    if key is None:
+        return False
+    log_json(
+        logger,
+        "warning",
+        "ingress_spilled",
+        request_id=request_id,
+        queue_url=queue_url,
+        entries=len(items),
+        key=key,
+    )
+    return True
+
+
+def _send_message(
+    queue_url: str, message: Dict[str, Any], request_id: Any, context: Any
+) -> Tuple[str, Any]:
+    """Send one message with retries, spilling to S3 if SQS keeps failing.
+
+    Returns ``("queued", message_id)``, ``("spilled", None)`` or ``("failed", None)``.
+    """
+    try:
+        response = call_with_retries(
+            lambda: sqs_client.send_message(QueueUrl=queue_url, **message),
+            context,
+        )
+        return "queued", (response or {}).get("MessageId")
+    except Exception:
+        log_exception(
+            logger,
+            "ingress_enqueue_failed",
+            request_id=request_id,
+            queue_url=queue_url,
+        )
+    if _spill(queue_url, [(0, message)], request_id):
+        return "spilled", None
+    return "failed", None
+
+
+def _send_batch_chunk(
+    queue_url: str,
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    request_id: Any = None,
+    context: Any = None,
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    errors: Dict[int, str] = {}
+    pending = chunk
+    attempt = 0
+    while pending:
+        entries = [{"Id": str(index), **message} for index, message in pending]
         try:
-            sqs_client.send_message(
-                QueueUrl=QUEUE_URL,
-                MessageBody=json.dumps(payload),
+            response = call_with_retries(
+                lambda: sqs_client.send_message_batch(QueueUrl=queue_url, Entries=entries),
+                context,
             )
-        except Exception:
+        except Exception as exc:
             log_exception(
                 logger,
-                "ingress_enqueue_failed",
-                request_id=request_id,
-                queue_url=QUEUE_URL,
+                "ingress_batch_enqueue_failed",
+                queue_url=queue_url,
+                entries=len(entries),
+            )
+            errors.update({index: type(exc).__name__ for index, _ in pending})
+            break
+        for success in response.get("Successful", []):
+            results.append(
+                {
+                    "index": int(success["Id"]),
+                    "status": "queued",
+                    "messageId": success.get("MessageId"),
+                }
             )
+        pending_by_index = dict(pending)
+        retry: List[Tuple[int, Dict[str, Any]]] = []
+        for failure in response.get("Failed", []):
+            index = int(failure["Id"])
+            if failure.get("SenderFault"):
+                # Invalid entries will never succeed; report them without spilling.
+                results.append(
+                    {"index": index, "status": "failed", "error": failure.get("Code", "")}
+                )
+                continue
+            errors[index] = failure.get("Code", "")
+            retry.append((index, pending_by_index[index]))
+        attempt += 1
+        delay = retry_delay(attempt, context) if retry else None
+        if delay is None:
+            break
+        time.sleep(delay)
+        for index, _ in retry:
+            errors.pop(index, None)
+        pending = retry
+
+    if errors:
+        failed_items = [(index, message) for index, message in chunk if index in errors]
+        spilled = _spill(queue_url, failed_items, request_id)
+        for index, _ in failed_items:
+            if spilled:
+                results.append({"index": index, "status": "spilled"})
+            else:
+                results.append({"index": index, "status": "failed", "error": errors[index]})
+    return results
+
+
+def _enqueue_batch(
+    envelopes: List[Dict[str, Any]], request_id: Any = None, context: Any = None
+) -> List[Dict[str, Any]]:
+    if not QUEUE_URL:
+        return [
+            {"index": index, "status": "failed", "error": "QueueNotConfigured"}
+            for index in range(len(envelopes))
+        ]
+    # One open chunk per destination queue, closed at 10 entries or 256 KB.
+    chunks: List[Tuple[str, List[Tuple[int, Dict[str, Any]]]]] = []
+    open_chunks: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    open_bytes: Dict[str, int] = {}
+    for index, envelope in enumerate(envelopes):
+        queue_url = _queue_url_for(envelope)
+        message = _encode_envelope(envelope)
+        body_bytes = len(message["MessageBody"].encode("utf-8"))
+        chunk = open_chunks.setdefault(queue_url, [])
+        if chunk and (
+            len(chunk) >= SQS_BATCH_LIMIT
+            or open_bytes[queue_url] + body_bytes > SQS_BATCH_MAX_BYTES
+        ):
+            chunks.append((queue_url, chunk))
+            chunk = open_chunks[queue_url] = []
+        if not chunk:
+            open_bytes[queue_url] = 0
+        chunk.append((index, message))
+        open_bytes[queue_url] += body_bytes
+    chunks.extend((queue_url, chunk) for queue_url, chunk in open_chunks.items())
+    results: List[Dict[str, Any]] = []
+    if len(chunks) == 1:
+        results.extend(_send_batch_chunk(*chunks[0], request_id, context))
+    else:
+        workers = max(1, min(BATCH_SEND_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk_results in executor.map(
+                lambda item: _send_batch_chunk(*item, request_id, context), chunks
+            ):
+                results.extend(chunk_results)
+    results.sort(key=lambda item: item["index"])
+    return results
+
+
+def _batch_handler(request_id: str, items: List[Any], context: Any) -> Dict[str, Any]:
+    if len(items) > MAX_BATCH_ITEMS:
+        return {
+            "statusCode": 413,
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps(
+                {
+                    "requestId": request_id,
+                    "error": f"Batch exceeds {MAX_BATCH_ITEMS} items",
+                }
+            ),
+        }
+    envelopes = [
+        stamp_idempotency_key(
+            {"requestId": request_id, "batchIndex": index, "body": item}
+        )
+        for index, item in enumerate(items)
+    ]
+    results = _enqueue_batch(envelopes, request_id, context)
+    failed = sum(1 for result in results if result["status"] == "failed")
+    spilled = sum(1 for result in results if result["status"] == "spilled")
+    log_json(
+        logger,
+        "info",
+        "ingress_batch_enqueued",
+        request_id=request_id,
+        count=len(envelopes),
+        failed=failed,
+        spilled=spilled,
+    )
+    return {
+        "statusCode": 207 if failed else 200,
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps({"requestId": request_id, "results": results}),
+    }
+
+
+# Spilled messages are durable in S3 and re-enqueued by the drain job; only a
+# failed spill is reported as an error so the caller retries.
+_ENQUEUE_STATUS_CODES = {"queued": 200, "spilled": 202, "failed": 503}
+
+
+def _passthrough_handler(
+    event: Dict[str, Any], request_id: str, context: Any
+) -> Dict[str, Any]:
+    envelope = stamp_idempotency_key(
+        build_raw_envelope(
+            request_id,
+            event.get("body") or "",
+            bool(event.get("isBase64Encoded")),
+        )
+    )
+    status, message_id = "queued", None
+    # Raw bodies are not parsed here, so they always take the default lane.
+    queue_url = _queue_url_for(envelope)
+    if queue_url:
+        status, message_id = _send_message(
+            queue_url, _encode_envelope(envelope), request_id, context
+        )
+    return {
+        "statusCode": _ENQUEUE_STATUS_CODES[status],
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps({"requestId": request_id, "messageId": message_id}),
+    }
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    request_id = event.get("requestContext", {}).get("requestId")
+
+    if ENVELOPE_MODE == "raw" and not (_is_batch_resource(event) or _is_ndjson(event)):
+        # Validation and parsing move to the worker; reply with a receipt only.
+        return _passthrough_handler(event, request_id, context)
+
+    raw_body = _decode_body(event)
+    if _is_batch_resource(event) or _is_ndjson(event):
+        return _batch_handler(request_id, _split_batch_body(raw_body), context)
+    parsed_body = _parse_body(raw_body)
+    if isinstance(parsed_body, list):
+        return _batch_handler(request_id, parsed_body, context)
+
+    payload = stamp_idempotency_key(
+        {
+            "requestId": request_id,
+            "body": parsed_body,
+        }
+    )
+
+    status = "queued"
+    queue_url = _queue_url_for(payload)
+    if queue_url:
+        status, _ = _send_message(
+            queue_url, _encode_envelope(payload), request_id, context
+        )
 
     return {
-        "statusCode": 200,
+        "statusCode": _ENQUEUE_STATUS_CODES[status],
         "headers": {"Content-Type": "application/json"},
         "body": json.dumps(payload),
     }
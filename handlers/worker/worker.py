@@ -1,67 +1,670 @@
+import asyncio
 import json
 import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time, timedelta
-from typing import Any, Dict
-from zoneinfo import ZoneInfo
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from utils.calendar.registry import get_provider
+from utils.calendar.base import AsyncCalendarProvider, CalendarProvider
+from utils.calendar.registry import get_async_provider, get_provider
+from utils.aws_clients import get_sqs_client
+from utils.envelopes import envelope_body, envelope_source
 from utils.email_utils import parse_sender_email
+from utils.idempotency import (
+    IDEMPOTENCY_KEY_FIELD,
+    DedupeStore,
+    body_idempotency_key,
+    dedupe_store_from_env,
+)
+from utils.fair_share import (
+    SenderUsage,
+    fair_schedule,
+    parse_sender_weights,
+    queue_url_from_arn,
+)
+from utils.lambda_time import Deadline, DeadlineExceeded
 
-from utils.observability import get_logger, log_json
+from utils.observability import get_logger, log_exception, log_json
+from utils.result_sink import ResultSink, get_result_sink
+from utils.sqs_codec import decode_record_body
 
 logger = get_logger(__name__)
 
 
+RECORD_CONCURRENCY = int(os.environ.get("WORKER_RECORD_CONCURRENCY", "1"))
+# In-flight calendar lookups per batch for the asyncio engine.
+ASYNC_CONCURRENCY = int(os.environ.get("WORKER_ASYNC_CONCURRENCY", "100"))
+SLOT_MINUTES = 30
+# Time kept back from the Lambda deadline to build and return the response.
+DEADLINE_RESERVE_MS = int(os.environ.get("WORKER_DEADLINE_RESERVE_MS", "1000"))
+
+# (sender, window_start, window_end, slot_minutes)
+LookupKey = Tuple[str, datetime, datetime, int]
+# (slots, failed)
+LookupResult = Tuple[Optional[List[dict]], bool]
+
+
+class WorkerConfig(NamedTuple):
+    """Environment parsed and validated once per container."""
+
+    zone: ZoneInfo
+    workday_start: Optional[time]
+    workday_end: Optional[time]
+    slot_minutes: int
+    provider: CalendarProvider
+    # Per-sender fair share: 0 disables the cap (lookups are still reordered).
+    sender_quota: int
+    sender_weights: Dict[str, float]
+    # Records each sender ran in recent batches; kept for the container.
+    sender_usage: SenderUsage
+    defer_seconds: int
+    defer_max_receives: int
+    # Idempotency keys whose calendar work already completed.
+    dedupe: DedupeStore
+
+
+class BatchContext(NamedTuple):
+    """Per-batch values shared by every record's handler chain."""
+
+    config: WorkerConfig
+    window_start: datetime
+    window_end: datetime
+
+
+# A step enriches a record plan ({"payload", "body", ...}) in place.
+PipelineStep = Callable[[Dict[str, Any], BatchContext], None]
+
+_CONFIG: Optional[WorkerConfig] = None
+_ASYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_ASYNC_PROVIDER: Optional[AsyncCalendarProvider] = None
+_SOURCE_PIPELINES: Dict[str, Tuple[PipelineStep, ...]] = {}
+
+
+def register_source(source: str, *steps: PipelineStep) -> None:
+    """Register the handler chain run for envelopes whose body has this source."""
+    _SOURCE_PIPELINES[source] = tuple(steps)
+
+
+def load_config() -> WorkerConfig:
+    time_zone = os.environ.get("DEFAULT_TIME_ZONE", "America/New_York")
+    try:
+        zone = ZoneInfo(time_zone)
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise ValueError(f"Invalid DEFAULT_TIME_ZONE: {time_zone}") from exc
+    workday_start = os.environ.get("WORKDAY_START")
+    workday_end = os.environ.get("WORKDAY_END")
+    start_time = end_time = None
+    if workday_start and workday_end:
+        start_time = _parse_time(workday_start)
+        end_time = _parse_time(workday_end)
+        if end_time <= start_time:
+            raise ValueError("WORKDAY_END must be after WORKDAY_START")
+    try:
+        sender_weights = parse_sender_weights(os.environ.get("WORKER_SENDER_WEIGHTS"))
+    except ValueError as exc:
+        raise ValueError(f"Invalid WORKER_SENDER_WEIGHTS: {exc}") from exc
+    half_life = float(os.environ.get("WORKER_SENDER_HALF_LIFE_SECONDS", "60"))
+    if half_life <= 0:
+        raise ValueError("WORKER_SENDER_HALF_LIFE_SECONDS must be positive")
+    defer_seconds = int(os.environ.get("WORKER_DEFER_SECONDS", "30"))
+    if not 0 <= defer_seconds <= 43200:
+        raise ValueError("WORKER_DEFER_SECONDS must be between 0 and 43200")
+    return WorkerConfig(
+        zone=zone,
+        workday_start=start_time,
+        workday_end=end_time,
+        slot_minutes=SLOT_MINUTES,
+        provider=get_provider(),
+        sender_quota=int(os.environ.get("WORKER_SENDER_QUOTA", "0")),
+        sender_weights=sender_weights,
+        sender_usage=SenderUsage(half_life),
+        defer_seconds=defer_seconds,
+        defer_max_receives=int(os.environ.get("WORKER_DEFER_MAX_RECEIVES", "3")),
+        dedupe=dedupe_store_from_env(),
+    )
+
+
+def get_config() -> WorkerConfig:
+    global _CONFIG
+    if _CONFIG is None:
+        _CONFIG = load_config()
+    return _CONFIG
+
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     records = event.get("Records", [])
     log_json(logger, "info", "sqs_records_received", count=len(records))
-    processed_records = []
+    batch = _batch_context(get_config())
+    deadline = Deadline.from_context(context, reserve_ms=DEADLINE_RESERVE_MS)
+
+    plans, lookup_keys = _plan_batch(records, batch)
+    provider = batch.config.provider
+
+    def run_lookups(on_done: Callable[[LookupKey, LookupResult], None]) -> None:
+        _run_bounded(
+            lambda key: on_done(key, _lookup_slots_safely(provider, key, deadline)),
+            lookup_keys,
+        )
+
+    return _build_response(records, plans, lookup_keys, run_lookups, batch, context)
+
+
+def async_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """asyncio engine: same plan and response as handler, but calendar lookups
+    run as coroutines on a loop kept across warm invocations, so keep-alive
+    connections to Google are reused between batches.
+    """
+    records = event.get("Records", [])
+    log_json(logger, "info", "sqs_records_received", count=len(records))
+    batch = _batch_context(get_config())
+    deadline = Deadline.from_context(context, reserve_ms=DEADLINE_RESERVE_MS)
+
+    plans, lookup_keys = _plan_batch(records, batch)
+
+    def run_lookups(on_done: Callable[[LookupKey, LookupResult], None]) -> None:
+        _event_loop().run_until_complete(
+            _lookup_all_async(_async_provider(), lookup_keys, deadline, on_done)
+        )
+
+    return _build_response(records, plans, lookup_keys, run_lookups, batch, context)
+
+
+def _plan_batch(
+    records: List[Dict[str, Any]], batch: BatchContext
+) -> Tuple[List[Tuple[Optional[Dict[str, Any]], bool]], List[LookupKey]]:
+    # Plan the whole batch first so records that need the same calendar
+    # lookup (reply storms, threads from one sender) share a single call.
+    plans = _run_bounded(lambda record: _plan_record_safely(record, batch), records)
+    batch_keys = set()
+    for plan, failed in plans:
+        key = plan.get("idempotencyKey") if plan is not None and not failed else None
+        if key in batch_keys:
+            plan["duplicate"] = True
+            plan.pop("lookup", None)
+        elif key:
+            batch_keys.add(key)
+    # Lookups start in fair-share order, so a sender flooding the batch
+    # cannot push everyone else's lookups past the deadline.
+    lookup_keys = _fair_share(records, plans, batch.config)
+    lookup_records = sum(
+        1
+        for plan, failed in plans
+        if not failed
+        and plan is not None
+        and plan.get("lookup")
+        and not plan.get("deferred")
+    )
+    if len(lookup_keys) < lookup_records:
+        log_json(
+            logger,
+            "info",
+            "calendar_lookups_coalesced",
+            records=lookup_records,
+            lookups=len(lookup_keys),
+        )
+    return plans, lookup_keys
+
+
+def _build_response(
+    records: List[Dict[str, Any]],
+    plans: List[Tuple[Optional[Dict[str, Any]], bool]],
+    lookup_keys: List[LookupKey],
+    run_lookups: Callable[[Callable[[LookupKey, LookupResult], None]], None],
+    batch: BatchContext,
+    context: Any,
+) -> Dict[str, Any]:
+    # With a result sink, payloads stream out as their lookups finish instead
+    # of being collected (with their source records) into the response.
+    batch_id = getattr(context, "aws_request_id", None) or uuid.uuid4().hex
+    sink = get_result_sink(batch_id)
+    results = _BatchResults(records, plans, sink)
+    try:
+        results.settle_without_lookup()
+        if lookup_keys:
+            run_lookups(results.lookup_done)
+        result_location = sink.close() if sink is not None else None
+        for key in results.completed_keys:
+            # Marked only once results are out, so failed work is retried.
+            batch.config.dedupe.mark(key)
+    except Exception:
+        # Results were not stored durably: fail the batch so it is redelivered.
+        log_exception(logger, "worker_result_sink_failed")
+        if sink is not None:
+            sink.abort()
+        raise
+    batch_item_failures = [
+        # ReportBatchItemFailures: only these messages are redelivered.
+        {"itemIdentifier": record.get("messageId", "")}
+        for record, failed in zip(records, results.failed)
+        if failed
+    ]
+    if results.duplicates:
+        log_json(logger, "info", "worker_duplicates_skipped", count=results.duplicates)
+    if batch_item_failures:
+        log_json(
+            logger,
+            "info",
+            "sqs_batch_partial",
+            processed=results.processed,
+            failed=len(batch_item_failures) - results.deferred,
+            deferred=results.deferred,
+        )
+    response: Dict[str, Any] = {
+        "status": "partial" if batch_item_failures else "ok",
+        "records": [results.outputs[index] for index in sorted(results.outputs)],
+        "batchItemFailures": batch_item_failures,
+    }
+    if sink is not None:
+        log_json(
+            logger,
+            "info",
+            "worker_results_written",
+            location=result_location,
+            count=results.processed,
+        )
+        response["resultLocation"] = result_location
+        response["resultCount"] = results.processed
+    return response
+
+
+class _BatchResults:
+    """Per-record outcomes for one batch, settled as soon as each is known.
+
+    lookup_done runs on the lookup's completion path (a pool thread or the
+    event loop), so a payload reaches the sink as soon as its slots arrive
+    and the plan drops it; with a sink the batch never holds every payload.
+    """
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        plans: List[Tuple[Optional[Dict[str, Any]], bool]],
+        sink: Optional[ResultSink],
+    ) -> None:
+        self.records = records
+        self.plans = plans
+        self.sink = sink
+        self.failed = [False] * len(records)
+        # Without a sink, processed records by index for the response.
+        self.outputs: Dict[int, Dict[str, Any]] = {}
+        self.processed = 0
+        self.deferred = 0
+        self.duplicates = 0
+        self.completed_keys: List[str] = []
+        self._waiting: Dict[LookupKey, List[int]] = {}
+        self._lock = threading.Lock()
+        for index, (plan, failed) in enumerate(plans):
+            if _awaits_lookup(plan, failed):
+                self._waiting.setdefault(plan["lookup"], []).append(index)
+        # FIFO: records settle in queue order within their message group, and
+        # once one fails every later record in the group fails with it, so a
+        # redelivery never lands behind a message that already went through.
+        queue_arn = records[0].get("eventSourceARN", "") if records else ""
+        self._fifo = queue_arn.endswith(".fifo")
+        self._group_queues: Dict[Optional[str], Deque[int]] = {}
+        self._outcomes: Dict[int, bool] = {}
+        self._broken_groups = set()
+        if self._fifo:
+            for index, record in enumerate(records):
+                group = _message_group(record)
+                self._group_queues.setdefault(group, deque()).append(index)
+
+    def settle_without_lookup(self) -> None:
+        for index, (plan, failed) in enumerate(self.plans):
+            if not _awaits_lookup(plan, failed):
+                self._settle(index, failed)
+
+    def lookup_done(self, key: LookupKey, result: LookupResult) -> None:
+        slots, failed = result
+        with self._lock:
+            for index in self._waiting.pop(key, []):
+                plan = self.plans[index][0]
+                if not failed:
+                    # Each record gets its own list so later mutation stays local.
+                    plan["body"]["calendar_slots"] = list(slots)
+                    plan["payload"]["body"] = plan["body"]
+                self._settle(index, failed)
+
+    def _settle(self, index: int, failed: bool) -> None:
+        if not self._fifo:
+            self._finish(index, failed)
+            return
+        group = _message_group(self.records[index])
+        queue = self._group_queues[group]
+        self._outcomes[index] = failed
+        while queue and queue[0] in self._outcomes:
+            head = queue.popleft()
+            failed = self._outcomes.pop(head)
+            if group in self._broken_groups:
+                self.failed[head] = True
+            elif self._finish(head, failed):
+                self._broken_groups.add(group)
+
+    def _finish(self, index: int, failed: bool) -> bool:
+        """Record one outcome; True if the record goes back to the queue."""
+        record = self.records[index]
+        plan = self.plans[index][0]
+        if plan is not None and plan.get("deferred"):
+            self.deferred += 1
+            failed = True
+        elif plan is not None and plan.get("duplicate"):
+            self.duplicates += 1
+            return False
+        if failed:
+            self.failed[index] = True
+            return True
+        if plan is None:
+            return False
+        self.processed += 1
+        if plan.get("idempotencyKey"):
+            self.completed_keys.append(plan["idempotencyKey"])
+        if self.sink is None:
+            self.outputs[index] = {"record": record, "payload": plan["payload"]}
+            return False
+        self.sink.write(
+            {"messageId": record.get("messageId"), "payload": plan["payload"]}
+        )
+        plan.pop("payload")
+        plan.pop("body", None)
+        return False
+
+
+def _message_group(record: Dict[str, Any]) -> Optional[str]:
+    # Without a group ID the whole batch is treated as one group.
+    return (record.get("attributes") or {}).get("MessageGroupId")
+
+
+def _awaits_lookup(plan: Optional[Dict[str, Any]], failed: bool) -> bool:
+    return (
+        not failed
+        and plan is not None
+        and bool(plan.get("lookup"))
+        and not plan.get("deferred")
+    )
+
+
+def _fair_share(
+    records: List[Dict[str, Any]],
+    plans: List[Tuple[Optional[Dict[str, Any]], bool]],
+    config: WorkerConfig,
+) -> List[LookupKey]:
+    """Order lookups fairly across senders and defer over-quota ones.
+
+    Every record in a batch shares one window, so a sender has one lookup
+    group per batch; fairness is therefore judged against the records each
+    sender ran in recent batches (config.sender_usage), not within the batch.
+    A group is charged its record count and deferred as a whole or not at
+    all, since its records share one provider call.
+    """
+    groups: Dict[LookupKey, List[int]] = {}
+    for index, (plan, failed) in enumerate(plans):
+        if not failed and plan is not None and plan.get("lookup"):
+            groups.setdefault(plan["lookup"], []).append(index)
+    keys = list(groups)
+    # Deferring counts as a receive; a group with any record near the DLQ
+    # redrive limit runs now.
+    pinned = [
+        any(_defer_exhausted(records[index], config) for index in groups[key])
+        for key in keys
+    ]
+    queue_arn = records[0].get("eventSourceARN", "") if records else ""
+    # FIFO groups already serialize a sender; deferring would reorder them.
+    quota = 0 if queue_arn.endswith(".fifo") else config.sender_quota
+    schedule = fair_schedule(
+        [key[0] for key in keys],
+        weights=config.sender_weights,
+        quota=quota,
+        pinned=pinned,
+        costs=[len(groups[key]) for key in keys],
+        usage=config.sender_usage,
+    )
+    if schedule.deferred:
+        deferred = [
+            index
+            for position in schedule.deferred
+            for index in groups[keys[position]]
+        ]
+        for index in deferred:
+            plans[index][0]["deferred"] = True
+        _defer_records([records[index] for index in deferred], config)
+    return [keys[position] for position in schedule.order]
+
+
+def _defer_exhausted(record: Dict[str, Any], config: WorkerConfig) -> bool:
+    attributes = record.get("attributes") or {}
+    receives = int(attributes.get("ApproximateReceiveCount") or 1)
+    return receives >= config.defer_max_receives
+
+
+def _defer_records(records: List[Dict[str, Any]], config: WorkerConfig) -> None:
+    """Push deferred messages' next delivery out by defer_seconds.
+
+    They are also reported in batchItemFailures; if this call fails they come
+    back after the queue's normal visibility timeout instead.
+    """
+    by_queue: Dict[str, List[Dict[str, Any]]] = {}
     for record in records:
-        log_json(logger, "info", "sqs_record", record=record)
-        body = record.get("body")
-        if not body:
-            continue
+        by_queue.setdefault(record.get("eventSourceARN", ""), []).append(record)
+    for queue_arn, queue_records in by_queue.items():
         try:
-            payload = json.loads(body)
-        except json.JSONDecodeError:
-            log_json(logger, "warning", "sqs_record_invalid_json", body=body)
-            continue
-        body_payload = payload.get("body", {})
-        source = body_payload.get("source")
-        if source == "email":
-            sender = parse_sender_email(body_payload.get("from", ""))
-
-            time_zone = os.environ.get("DEFAULT_TIME_ZONE", "America/New_York")
-            zone = ZoneInfo(time_zone)
-            tomorrow = datetime.now(tz=zone).date() + timedelta(days=1)
-
-            workday_start = os.environ.get("WORKDAY_START")
-            workday_end = os.environ.get("WORKDAY_END")
-            if workday_start and workday_end:
-                start_time = _parse_time(workday_start)
-                end_time = _parse_time(workday_end)
-                window_start = datetime.combine(tomorrow, start_time, tzinfo=zone)
-                window_end = datetime.combine(tomorrow, end_time, tzinfo=zone)
-            else:
-                window_start = datetime.combine(tomorrow, time(0, 0), tzinfo=zone)
-                window_end = window_start + timedelta(days=1)
-
-            provider = get_provider()
-            slots = provider.get_free_slots(sender, window_start, window_end, 30)
-            log_json(
-                logger,
-                "info",
-                "calendar_slots",
-                email=sender,
-                count=len(slots),
-                sample=slots[:3],
-            )
-            body_payload["calendar_slots"] = slots
-        payload["body"] = body_payload
-        processed_records.append({"record": record, "payload": payload})
-    return {"status": "ok", "records": processed_records}
+            queue_url = queue_url_from_arn(queue_arn)
+            for start in range(0, len(queue_records), 10):
+                entries = [
+                    {
+                        "Id": str(position),
+                        "ReceiptHandle": record["receiptHandle"],
+                        "VisibilityTimeout": config.defer_seconds,
+                    }
+                    for position, record in enumerate(
+                        queue_records[start : start + 10]
+                    )
+                ]
+                get_sqs_client().change_message_visibility_batch(
+                    QueueUrl=queue_url, Entries=entries
+                )
+        except Exception:
+            log_exception(logger, "sqs_defer_failed", queue_arn=queue_arn)
+    log_json(
+        logger,
+        "info",
+        "sqs_records_deferred",
+        count=len(records),
+        message_ids=[record.get("messageId", "") for record in records],
+        visibility_timeout=config.defer_seconds,
+    )
+
+
+def _run_bounded(func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+    """Map func over items on a bounded pool; results keep input order."""
+    items = list(items)
+    # Records are independent and mostly wait on S3 / Secrets Manager / Google.
+    workers = max(1, min(RECORD_CONCURRENCY, len(items)))
+    if workers == 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
+
+
+def _plan_record_safely(
+    record: Dict[str, Any], batch: BatchContext
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    try:
+        return _plan_record(record, batch), False
+    except Exception:
+        log_exception(
+            logger,
+            "sqs_record_failed",
+            message_id=record.get("messageId"),
+        )
+        return None, True
+
+
+def _plan_record(
+    record: Dict[str, Any], batch: BatchContext
+) -> Optional[Dict[str, Any]]:
+    log_json(logger, "info", "sqs_record", record=record)
+    body = decode_record_body(record)
+    if not body:
+        return None
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError:
+        log_json(logger, "warning", "sqs_record_invalid_json", body=body)
+        return None
+    # Claim-check envelopes carry only a bodyRef; fetch the body from S3
+    # only for sources with a handler chain. Raw envelopes are parsed here.
+    steps = _SOURCE_PIPELINES.get(envelope_source(payload))
+    if not steps:
+        return {"payload": payload}
+    plan = {"payload": payload, "body": envelope_body(payload)}
+    for step in steps:
+        step(plan, batch)
+        if plan.get("duplicate"):
+            break
+    return plan
+
+
+def _batch_context(config: WorkerConfig) -> BatchContext:
+    zone = config.zone
+    tomorrow = datetime.now(tz=zone).date() + timedelta(days=1)
+    if config.workday_start and config.workday_end:
+        window_start = datetime.combine(tomorrow, config.workday_start, tzinfo=zone)
+        window_end = datetime.combine(tomorrow, config.workday_end, tzinfo=zone)
+    else:
+        window_start = datetime.combine(tomorrow, time(0, 0), tzinfo=zone)
+        window_end = window_start + timedelta(days=1)
+    return BatchContext(config, window_start, window_end)
+
+
+def _skip_duplicate(plan: Dict[str, Any], batch: BatchContext) -> None:
+    # A key set by the sender (the email adapter's Message-ID key) wins: in raw
+    # mode the router's envelope key only hashes the raw body. Older or
+    # direct-SQS envelopes without either get a body hash.
+    body = plan["body"]
+    key = body.get(IDEMPOTENCY_KEY_FIELD) if isinstance(body, dict) else None
+    key = key or plan["payload"].get(IDEMPOTENCY_KEY_FIELD)
+    plan["idempotencyKey"] = key or body_idempotency_key(body)
+    if batch.config.dedupe.seen(plan["idempotencyKey"]):
+        plan["duplicate"] = True
+
+
+def _plan_calendar_lookup(plan: Dict[str, Any], batch: BatchContext) -> None:
+    sender = parse_sender_email(plan["body"].get("from", ""))
+    plan["lookup"] = (
+        sender,
+        batch.window_start,
+        batch.window_end,
+        batch.config.slot_minutes,
+    )
+
+
+def _lookup_slots_safely(
+    provider: Any, key: LookupKey, deadline: Deadline
+) -> LookupResult:
+    sender, window_start, window_end, slot_minutes = key
+    try:
+        # Lookups still queued when the budget runs out fail fast here and
+        # are redelivered instead of timing out the whole batch.
+        deadline.check("calendar lookup")
+        slots = provider.get_free_slots(
+            sender, window_start, window_end, slot_minutes, deadline=deadline
+        )
+    except Exception as exc:
+        return _lookup_failed(sender, exc)
+    return _lookup_succeeded(sender, slots)
+
+
+async def _lookup_all_async(
+    provider: AsyncCalendarProvider,
+    keys: List[LookupKey],
+    deadline: Deadline,
+    on_done: Callable[[LookupKey, LookupResult], None],
+) -> None:
+    limit = asyncio.Semaphore(max(1, ASYNC_CONCURRENCY))
+
+    async def bounded(key: LookupKey) -> None:
+        async with limit:
+            result = await _lookup_slots_async(provider, key, deadline)
+        on_done(key, result)
+
+    await asyncio.gather(*(bounded(key) for key in keys))
+
+
+async def _lookup_slots_async(
+    provider: AsyncCalendarProvider, key: LookupKey, deadline: Deadline
+) -> LookupResult:
+    sender, window_start, window_end, slot_minutes = key
+    try:
+        deadline.check("calendar lookup")
+        slots = await provider.get_free_slots(
+            sender, window_start, window_end, slot_minutes, deadline=deadline
+        )
+    except Exception as exc:
+        return _lookup_failed(sender, exc)
+    return _lookup_succeeded(sender, slots)
+
+
+def _lookup_succeeded(
+    sender: str, slots: List[dict]
+) -> LookupResult:
+    log_json(
+        logger,
+        "info",
+        "calendar_slots",
+        email=sender,
+        count=len(slots),
+        sample=slots[:3],
+    )
+    return slots, False
+
+
+def _lookup_failed(sender: str, exc: Exception) -> LookupResult:
+    if isinstance(exc, DeadlineExceeded):
+        log_json(
+            logger,
+            "warning",
+            "calendar_lookup_deadline_exceeded",
+            email=sender,
+            error_message=str(exc),
+        )
+    else:
+        log_exception(logger, "calendar_lookup_failed", email=sender)
+    return None, True
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    # One loop per container: the async provider's pooled connections are
+    # bound to it, so reusing it keeps them alive across warm invocations.
+    global _ASYNC_LOOP
+    if _ASYNC_LOOP is None or _ASYNC_LOOP.is_closed():
+        _ASYNC_LOOP = asyncio.new_event_loop()
+    return _ASYNC_LOOP
+
+
+def _async_provider() -> AsyncCalendarProvider:
+    global _ASYNC_PROVIDER
+    if _ASYNC_PROVIDER is None:
+        _ASYNC_PROVIDER = get_async_provider()
+    return _ASYNC_PROVIDER
 
 
 def _parse_time(value: str) -> time:
     parsed = datetime.strptime(value, "%H:%M").time()
     return parsed
+
+
+register_source("email", _skip_duplicate, _plan_calendar_lookup)
@@ -3,6 +3,11 @@ from aws_cdk import (
     Duration,
     Stack,
     aws_apigateway as apigateway,
+    aws_apigatewayv2 as apigatewayv2,
+    aws_apigatewayv2_authorizers as apigatewayv2_authorizers,
+    aws_apigatewayv2_integrations as apigatewayv2_integrations,
+    aws_events as events,
+    aws_events_targets as events_targets,
     aws_iam as iam,
     aws_lambda as _lambda,
     aws_lambda_event_sources as lambda_event_sources,
@@ -17,6 +22,35 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+from utils.fair_share import parse_sender_weights
+from utils.routing import DEFAULT_LANE, compile_routing_table
+
+DEFAULT_ROUTING_RULES = {
+    "default": DEFAULT_LANE,
+    "rules": [{"lane": "interactive", "field": "source", "equals": ["email"]}],
+}
+DEFAULT_LANE_MAX_CONCURRENCY = {"interactive": 10, DEFAULT_LANE: 2}
+INGRESS_INTEGRATIONS = ("lambda", "sqs")
+API_TYPES = ("rest", "http")
+GOOGLE_CALENDAR_QUERY_MODES = ("freebusy", "events")
+WORKER_ENGINES = {
+    "threads": "handlers.worker.worker.handler",
+    "asyncio": "handlers.worker.worker.async_handler",
+}
+
+# Direct SQS integration: wraps the JSON request body in the same
+# {requestId, body} envelope the router builds in parsed mode.
+SQS_SEND_MESSAGE_TEMPLATE = (
+    "#set($q = '\"')"
+    "#set($envelope = \"{${q}requestId${q}:${q}$context.requestId${q},"
+    "${q}body${q}:$input.json('$')}\")"
+    "Action=SendMessage&MessageBody=$util.urlEncode($envelope)"
+)
+SQS_RECEIPT_TEMPLATE = (
+    '{"requestId": "$context.requestId", "messageId": '
+    "\"$input.path('$.SendMessageResponse.SendMessageResult.MessageId')\"}"
+)
+
 
 class JarvisIngressStack(Stack):
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
@@ -39,6 +73,109 @@ class JarvisIngressStack(Stack):
             self.node.try_get_context("sharedSecretName")
             or "jarvis/webhook/shared_secret"
         )
+        client_secret_prefix = (
+            self.node.try_get_context("clientSecretPrefix")
+            or "jarvis/webhook/clients/"
+        )
+        authorizer_cache_ttl_seconds = int(
+            self.node.try_get_context("authorizerCacheTtlSeconds") or 0
+        )
+        claim_check_threshold_bytes = int(
+            self.node.try_get_context("claimCheckThresholdBytes") or 200 * 1024
+        )
+        claim_check_prefix = "ingress-payloads/"
+        overflow_prefix = "ingress-overflow/"
+        overflow_rejected_prefix = "ingress-overflow-rejected/"
+        sqs_message_codec = self.node.try_get_context("sqsMessageCodec") or ""
+        ingress_queue_fifo = (
+            str(self.node.try_get_context("ingressQueueFifo") or "").lower() == "true"
+        )
+        priority_lanes = (
+            str(self.node.try_get_context("priorityLanes") or "").lower() == "true"
+        )
+        routing_rules = (
+            self.node.try_get_context("routingRules") or DEFAULT_ROUTING_RULES
+        )
+        lane_max_concurrency = (
+            self.node.try_get_context("laneMaxConcurrency")
+            or DEFAULT_LANE_MAX_CONCURRENCY
+        )
+        worker_record_concurrency = int(
+            self.node.try_get_context("workerRecordConcurrency") or 10
+        )
+        worker_engine = (
+            self.node.try_get_context("workerEngine") or "threads"
+        ).lower()
+        if worker_engine not in WORKER_ENGINES:
+            raise ValueError(f"workerEngine must be one of {tuple(WORKER_ENGINES)}")
+        worker_async_concurrency = int(
+            self.node.try_get_context("workerAsyncConcurrency") or 100
+        )
+        worker_batch_size = int(self.node.try_get_context("workerBatchSize") or 10)
+        google_calendar_query_mode = (
+            self.node.try_get_context("googleCalendarQueryMode") or "freebusy"
+        ).lower()
+        if google_calendar_query_mode not in GOOGLE_CALENDAR_QUERY_MODES:
+            raise ValueError(
+                f"googleCalendarQueryMode must be one of {GOOGLE_CALENDAR_QUERY_MODES}"
+            )
+        worker_dedupe_ttl_seconds = int(
+            self.node.try_get_context("workerDedupeTtlSeconds") or 86400
+        )
+        # Lambda grants one vCPU per 1,769 MB, up to 6 vCPUs at 10,240 MB.
+        worker_process_pool_size = int(
+            self.node.try_get_context("workerProcessPoolSize") or 0
+        )
+        if worker_process_pool_size == 1 or not 0 <= worker_process_pool_size <= 6:
+            raise ValueError("workerProcessPoolSize must be 0 or between 2 and 6")
+        worker_result_sink = (
+            self.node.try_get_context("workerResultSink") or ""
+        ).lower()
+        if worker_result_sink not in ("", "s3"):
+            raise ValueError("workerResultSink must be empty or 's3'")
+        worker_results_prefix = "worker-results/"
+        worker_sender_quota = int(
+            self.node.try_get_context("workerSenderQuota") or 0
+        )
+        # Validated at synth time; the worker re-parses the same JSON.
+        worker_sender_weights = parse_sender_weights(
+            self.node.try_get_context("workerSenderWeights")
+        )
+        worker_defer_seconds = int(
+            self.node.try_get_context("workerDeferSeconds") or 30
+        )
+        worker_sender_half_life_seconds = int(
+            self.node.try_get_context("workerSenderHalfLifeSeconds") or 60
+        )
+        if worker_sender_half_life_seconds <= 0:
+            raise ValueError("workerSenderHalfLifeSeconds must be positive")
+        worker_max_batching_window_seconds = int(
+            self.node.try_get_context("workerMaxBatchingWindowSeconds") or 0
+        )
+        worker_max_concurrency = self.node.try_get_context("workerMaxConcurrency")
+        router_envelope_mode = (
+            self.node.try_get_context("routerEnvelopeMode") or "parsed"
+        )
+        ingress_integration = (
+            self.node.try_get_context("ingressIntegration") or "lambda"
+        ).lower()
+        if ingress_integration not in INGRESS_INTEGRATIONS:
+            raise ValueError(
+                f"ingressIntegration must be one of {INGRESS_INTEGRATIONS}"
+            )
+        direct_sqs = ingress_integration == "sqs"
+        api_type = (self.node.try_get_context("apiType") or "rest").lower()
+        if api_type not in API_TYPES:
+            raise ValueError(f"apiType must be one of {API_TYPES}")
+        http_api = api_type == "http"
+        if direct_sqs and http_api:
+            raise ValueError("ingressIntegration=sqs requires apiType=rest")
+        if direct_sqs and priority_lanes:
+            raise ValueError("ingressIntegration=sqs does not support priorityLanes")
+        # A mapping template cannot hash the body, so it has no content-based
+        # MessageDeduplicationId; the request ID would make every send unique.
+        if direct_sqs and ingress_queue_fifo:
+            raise ValueError("ingressIntegration=sqs does not support ingressQueueFifo")
         account_id = Stack.of(self).account
 
         shared_secret = secretsmanager.Secret.from_secret_name_v2(
@@ -50,6 +187,12 @@ class JarvisIngressStack(Stack):
         inbound_email_bucket = s3.Bucket(
             self,
             "JarvisInboundEmailBucket",
+            lifecycle_rules=[
+                s3.LifecycleRule(
+                    prefix=claim_check_prefix,
+                    expiration=Duration.days(14),
+                ),
+            ],
         )
         inbound_email_bucket.add_to_resource_policy(
             iam.PolicyStatement(
@@ -60,9 +203,21 @@ class JarvisIngressStack(Stack):
             )
         )
 
+        # FIFO mode: per-sender message groups (high-throughput FIFO) and
+        # router-supplied content-hash deduplication IDs.
+        fifo_queue_options = (
+            {
+                "fifo": True,
+                "deduplication_scope": sqs.DeduplicationScope.MESSAGE_GROUP,
+                "fifo_throughput_limit": sqs.FifoThroughputLimit.PER_MESSAGE_GROUP_ID,
+            }
+            if ingress_queue_fifo
+            else {}
+        )
         dead_letter_queue = sqs.Queue(
             self,
             "JarvisIngressDlq",
+            fifo=True if ingress_queue_fifo else None,
         )
         ingress_queue = sqs.Queue(
             self,
@@ -71,23 +226,44 @@ class JarvisIngressStack(Stack):
                 max_receive_count=5,
                 queue=dead_letter_queue,
             ),
-        )
-        inbound_email_bucket.add_event_notification(
-            s3.EventType.OBJECT_CREATED,
-            s3n.SqsDestination(ingress_queue),
-            s3.NotificationKeyFilter(prefix="ingress-queue/"),
-        )
-        ingress_queue.add_to_resource_policy(
-            iam.PolicyStatement(
-                principals=[iam.ServicePrincipal("s3.amazonaws.com")],
-                actions=["sqs:SendMessage"],
-                resources=[ingress_queue.queue_arn],
-                conditions={
-                    "ArnLike": {"aws:SourceArn": inbound_email_bucket.bucket_arn},
-                    "StringEquals": {"aws:SourceAccount": account_id},
-                },
+            **fifo_queue_options,
+        )
+        # Priority lanes: the default lane keeps JarvisIngressQueue; every other
+        # lane in the routing table gets its own queue and event-source mapping.
+        routing_table = compile_routing_table(routing_rules)
+        lane_queues = {routing_table.default_lane: ingress_queue}
+        if priority_lanes:
+            for lane in routing_table.lanes:
+                if lane in lane_queues:
+                    continue
+                lane_queues[lane] = sqs.Queue(
+                    self,
+                    f"JarvisIngress{lane.title().replace('-', '').replace('_', '')}Queue",
+                    dead_letter_queue=sqs.DeadLetterQueue(
+                        max_receive_count=5,
+                        queue=dead_letter_queue,
+                    ),
+                    **fifo_queue_options,
+                )
+
+        # S3 event notifications cannot target FIFO queues.
+        if not ingress_queue_fifo:
+            inbound_email_bucket.add_event_notification(
+                s3.EventType.OBJECT_CREATED,
+                s3n.SqsDestination(ingress_queue),
+                s3.NotificationKeyFilter(prefix="ingress-queue/"),
+            )
+            ingress_queue.add_to_resource_policy(
+                iam.PolicyStatement(
+                    principals=[iam.ServicePrincipal("s3.amazonaws.com")],
+                    actions=["sqs:SendMessage"],
+                    resources=[ingress_queue.queue_arn],
+                    conditions={
+                        "ArnLike": {"aws:SourceArn": inbound_email_bucket.bucket_arn},
+                        "StringEquals": {"aws:SourceAccount": account_id},
+                    },
+                )
             )
-        )
 
         lambda_code = _lambda.Code.from_asset(
             ".",
@@ -102,31 +278,133 @@ class JarvisIngressStack(Stack):
             ],
         )
 
-        router_fn = _lambda.Function(
-            self,
-            "RouterFunction",
-            runtime=_lambda.Runtime.PYTHON_3_11,
-            handler="handlers.router.ingress_router.handler",
-            code=lambda_code,
-            environment={"INGRESS_QUEUE_URL": ingress_queue.queue_url},
-        )
+        router_fn = None
+        overflow_drain_fn = None
+        if not direct_sqs:
+            router_fn = _lambda.Function(
+                self,
+                "RouterFunction",
+                runtime=_lambda.Runtime.PYTHON_3_11,
+                handler="handlers.router.ingress_router.handler",
+                code=lambda_code,
+                environment={
+                    "INGRESS_QUEUE_URL": ingress_queue.queue_url,
+                    "CLAIM_CHECK_BUCKET": inbound_email_bucket.bucket_name,
+                    "CLAIM_CHECK_PREFIX": claim_check_prefix,
+                    "CLAIM_CHECK_THRESHOLD_BYTES": str(claim_check_threshold_bytes),
+                    "OVERFLOW_BUCKET": inbound_email_bucket.bucket_name,
+                    "OVERFLOW_PREFIX": overflow_prefix,
+                    "ROUTER_ENVELOPE_MODE": router_envelope_mode,
+                    "SQS_MESSAGE_CODEC": sqs_message_codec,
+                    "INGRESS_QUEUE_FIFO": "true" if ingress_queue_fifo else "false",
+                    **(
+                        {
+                            "ROUTING_RULES": self.to_json_string(routing_rules),
+                            "LANE_QUEUE_URLS": self.to_json_string(
+                                {
+                                    lane: queue.queue_url
+                                    for lane, queue in lane_queues.items()
+                                }
+                            ),
+                        }
+                        if priority_lanes
+                        else {}
+                    ),
+                },
+            )
+            inbound_email_bucket.grant_put(router_fn, f"{claim_check_prefix}*")
+            inbound_email_bucket.grant_put(router_fn, f"{overflow_prefix}*")
+
+            # Re-enqueues messages the router spilled to S3 while SQS was failing.
+            overflow_drain_fn = _lambda.Function(
+                self,
+                "OverflowDrainFunction",
+                runtime=_lambda.Runtime.PYTHON_3_11,
+                handler="handlers.overflow_drain.overflow_drain.handler",
+                code=lambda_code,
+                timeout=Duration.minutes(1),
+                environment={
+                    "OVERFLOW_BUCKET": inbound_email_bucket.bucket_name,
+                    "OVERFLOW_PREFIX": overflow_prefix,
+                    "OVERFLOW_REJECTED_PREFIX": overflow_rejected_prefix,
+                },
+            )
+            inbound_email_bucket.grant_read_write(overflow_drain_fn, f"{overflow_prefix}*")
+            inbound_email_bucket.grant_put(overflow_drain_fn, f"{overflow_rejected_prefix}*")
+            inbound_email_bucket.grant_delete(overflow_drain_fn, f"{overflow_prefix}*")
+            events.Rule(
+                self,
+                "OverflowDrainSchedule",
+                schedule=events.Schedule.rate(Duration.minutes(1)),
+                targets=[events_targets.LambdaFunction(overflow_drain_fn)],
+            )
 
         worker_fn = _lambda.Function(
             self,
             "WorkerFunction",
             runtime=_lambda.Runtime.PYTHON_3_11,
-            handler="handlers.worker.worker.handler",
+            handler=WORKER_ENGINES[worker_engine],
             code=lambda_code,
+            # The process pool needs one vCPU per worker; size memory for it.
+            memory_size=(
+                min(10240, 1769 * worker_process_pool_size)
+                if worker_process_pool_size
+                else None
+            ),
             environment={
                 "CALENDAR_PROVIDER": "google",
                 "GOOGLE_OAUTH_CLIENT_SECRET_NAME": "jarvis/google_oauth/client",
                 "GOOGLE_OAUTH_USER_SECRET_PREFIX": "jarvis/calendar/google/",
                 "DEFAULT_TIME_ZONE": "America/New_York",
+                "GOOGLE_CALENDAR_QUERY_MODE": google_calendar_query_mode,
+                "WORKER_RECORD_CONCURRENCY": str(worker_record_concurrency),
+                "WORKER_ASYNC_CONCURRENCY": str(worker_async_concurrency),
+                **(
+                    {"PROCESS_POOL_SIZE": str(worker_process_pool_size)}
+                    if worker_process_pool_size
+                    else {}
+                ),
+                "WORKER_SENDER_QUOTA": str(worker_sender_quota),
+                "WORKER_SENDER_WEIGHTS": self.to_json_string(worker_sender_weights),
+                "WORKER_DEFER_SECONDS": str(worker_defer_seconds),
+                "WORKER_SENDER_HALF_LIFE_SECONDS": str(
+                    worker_sender_half_life_seconds
+                ),
+                "DEDUPE_TTL_SECONDS": str(worker_dedupe_ttl_seconds),
+                **(
+                    {
+                        "RESULT_SINK": "s3",
+                        "RESULT_SINK_BUCKET": inbound_email_bucket.bucket_name,
+                        "RESULT_SINK_PREFIX": worker_results_prefix,
+                    }
+                    if worker_result_sink
+                    else {}
+                ),
             },
         )
-        worker_fn.add_event_source(
-            lambda_event_sources.SqsEventSource(ingress_queue)
-        )
+        for lane, lane_queue in lane_queues.items():
+            max_concurrency = (
+                lane_max_concurrency.get(lane)
+                if priority_lanes
+                else worker_max_concurrency
+            )
+            worker_fn.add_event_source(
+                lambda_event_sources.SqsEventSource(
+                    lane_queue,
+                    batch_size=worker_batch_size,
+                    max_batching_window=(
+                        Duration.seconds(worker_max_batching_window_seconds)
+                        if worker_max_batching_window_seconds > 0
+                        else None
+                    ),
+                    max_concurrency=int(max_concurrency) if max_concurrency else None,
+                    report_batch_item_failures=True,
+                )
+            )
+        inbound_email_bucket.grant_read(worker_fn, f"{claim_check_prefix}*")
+        if worker_result_sink:
+            # grant_put includes s3:Abort* for multipart uploads.
+            inbound_email_bucket.grant_put(worker_fn, f"{worker_results_prefix}*")
         worker_client_secret = secretsmanager.Secret.from_secret_name_v2(
             self,
             "WorkerGoogleOauthClientSecret",
@@ -150,38 +428,152 @@ class JarvisIngressStack(Stack):
             code=lambda_code,
             environment={
                 "SECRET_NAME": shared_secret_name,
+                "CLIENT_SECRET_PREFIX": client_secret_prefix,
                 "MAX_SKEW_SECONDS": "300",
+                "AUTHORIZER_CACHEABLE_POLICIES": (
+                    "true" if authorizer_cache_ttl_seconds > 0 else "false"
+                ),
             },
         )
         shared_secret.grant_read(authorizer_fn)
-
-        api = apigateway.RestApi(
-            self,
-            "JarvisIngressApi",
-            deploy_options=apigateway.StageOptions(stage_name="dev"),
-            default_method_options=apigateway.MethodOptions(
-                authorization_type=apigateway.AuthorizationType.NONE,
-            ),
+        authorizer_fn.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["secretsmanager:GetSecretValue"],
+                resources=[
+                    f"arn:aws:secretsmanager:{Stack.of(self).region}:{account_id}:secret:{client_secret_prefix}*",
+                ],
+            )
         )
 
-        authorizer = apigateway.RequestAuthorizer(
-            self,
-            "JarvisRequestAuthorizer",
-            handler=authorizer_fn,
-            identity_sources=[
-                apigateway.IdentitySource.header("x-jarvis-timestamp"),
-                apigateway.IdentitySource.header("x-jarvis-signature"),
-            ],
-            results_cache_ttl=Duration.seconds(0),
-        )
+        if http_api:
+            # HTTP API variant: simple boolean authorizer responses cached per
+            # signed headers + route, and payload format 2.0 for the router.
+            api = apigatewayv2.HttpApi(
+                self,
+                "JarvisIngressHttpApi",
+                create_default_stage=False,
+            )
+            api_stage = api.add_stage(
+                "JarvisIngressHttpStage",
+                stage_name="dev",
+                auto_deploy=True,
+            )
+            api_url = api_stage.url
+            http_authorizer = apigatewayv2_authorizers.HttpLambdaAuthorizer(
+                "JarvisHttpLambdaAuthorizer",
+                authorizer_fn,
+                identity_source=[
+                    "$request.header.x-jarvis-timestamp",
+                    "$request.header.x-jarvis-signature",
+                    "$context.routeKey",
+                ],
+                response_types=[apigatewayv2_authorizers.HttpLambdaResponseType.SIMPLE],
+                results_cache_ttl=Duration.seconds(authorizer_cache_ttl_seconds),
+            )
+            router_integration = apigatewayv2_integrations.HttpLambdaIntegration(
+                "RouterIntegration",
+                router_fn,
+                payload_format_version=apigatewayv2.PayloadFormatVersion.VERSION_2_0,
+            )
+            for route_path in ("/ingress", "/ingress/batch"):
+                api.add_routes(
+                    path=route_path,
+                    methods=[apigatewayv2.HttpMethod.POST],
+                    integration=router_integration,
+                    authorizer=http_authorizer,
+                )
+        else:
+            api = apigateway.RestApi(
+                self,
+                "JarvisIngressApi",
+                deploy_options=apigateway.StageOptions(stage_name="dev"),
+                default_method_options=apigateway.MethodOptions(
+                    authorization_type=apigateway.AuthorizationType.NONE,
+                ),
+            )
+            api_url = api.url
 
-        ingress = api.root.add_resource("ingress")
-        ingress.add_method(
-            "POST",
-            apigateway.LambdaIntegration(router_fn, proxy=True),
-            authorization_type=apigateway.AuthorizationType.CUSTOM,
-            authorizer=authorizer,
-        )
+            authorizer = apigateway.RequestAuthorizer(
+                self,
+                "JarvisRequestAuthorizer",
+                handler=authorizer_fn,
+                identity_sources=[
+                    apigateway.IdentitySource.header("x-jarvis-timestamp"),
+                    apigateway.IdentitySource.header("x-jarvis-signature"),
+                ],
+                results_cache_ttl=Duration.seconds(authorizer_cache_ttl_seconds),
+            )
+
+            ingress = api.root.add_resource("ingress")
+            if direct_sqs:
+                # API Gateway calls SendMessage itself; no router Lambda in the path.
+                # Batch splitting, claim checks, and compression need the router,
+                # so /ingress/batch is not exposed in this mode.
+                sqs_integration_role = iam.Role(
+                    self,
+                    "IngressSqsIntegrationRole",
+                    assumed_by=iam.ServicePrincipal("apigateway.amazonaws.com"),
+                )
+                ingress_queue.grant_send_messages(sqs_integration_role)
+                ingress.add_method(
+                    "POST",
+                    apigateway.AwsIntegration(
+                        service="sqs",
+                        path=f"{account_id}/{ingress_queue.queue_name}",
+                        integration_http_method="POST",
+                        options=apigateway.IntegrationOptions(
+                            credentials_role=sqs_integration_role,
+                            passthrough_behavior=apigateway.PassthroughBehavior.NEVER,
+                            request_parameters={
+                                "integration.request.header.Content-Type": (
+                                    "'application/x-www-form-urlencoded'"
+                                ),
+                                "integration.request.header.Accept": "'application/json'",
+                            },
+                            request_templates={
+                                "application/json": SQS_SEND_MESSAGE_TEMPLATE,
+                            },
+                            integration_responses=[
+                                apigateway.IntegrationResponse(
+                                    status_code="200",
+                                    response_templates={
+                                        "application/json": SQS_RECEIPT_TEMPLATE,
+                                    },
+                                ),
+                                apigateway.IntegrationResponse(
+                                    status_code="503",
+                                    selection_pattern="[45]\\d{2}",
+                                    response_templates={
+                                        "application/json": (
+                                            '{"requestId": "$context.requestId", '
+                                            '"error": "enqueue_failed"}'
+                                        ),
+                                    },
+                                ),
+                            ],
+                        ),
+                    ),
+                    method_responses=[
+                        apigateway.MethodResponse(status_code="200"),
+                        apigateway.MethodResponse(status_code="503"),
+                    ],
+                    authorization_type=apigateway.AuthorizationType.CUSTOM,
+                    authorizer=authorizer,
+                )
+            else:
+                ingress.add_method(
+                    "POST",
+                    apigateway.LambdaIntegration(router_fn, proxy=True),
+                    authorization_type=apigateway.AuthorizationType.CUSTOM,
+                    authorizer=authorizer,
+                )
+                ingress_batch = ingress.add_resource("batch")
+                ingress_batch.add_method(
+                    "POST",
+                    apigateway.LambdaIntegration(router_fn, proxy=True),
+                    authorization_type=apigateway.AuthorizationType.CUSTOM,
+                    authorizer=authorizer,
+                )
 
         email_adapter_fn = _lambda.Function(
             self,
@@ -192,7 +584,7 @@ class JarvisIngressStack(Stack):
             memory_size=512,
             timeout=Duration.seconds(30),
             environment={
-                "INGRESS_URL": f"{api.url}ingress",
+                "INGRESS_URL": f"{api_url}ingress",
                 "SECRET_NAME": shared_secret_name,
             },
         )
@@ -252,13 +644,22 @@ class JarvisIngressStack(Stack):
         )
         ses_activation.node.add_dependency(receipt_rule_set)
 
-        ingress_queue.grant_send_messages(router_fn)
+        if router_fn is not None:
+            for lane_queue in lane_queues.values():
+                lane_queue.grant_send_messages(router_fn)
+                lane_queue.grant_send_messages(overflow_drain_fn)
 
         CfnOutput(
             self,
             "IngressUrl",
-            value=f"{api.url}ingress",
+            value=f"{api_url}ingress",
         )
+        if not direct_sqs:
+            CfnOutput(
+                self,
+                "IngressBatchUrl",
+                value=f"{api_url}ingress/batch",
+            )
         CfnOutput(
             self,
             "WebhookSecretArn",
@@ -34,11 +34,44 @@ except ModuleNotFoundError:
             self.response = response
             self.operation_name = operation_name
 
+    class BotoCoreError(Exception):
+        def __init__(self, **kwargs):
+            super().__init__(str(kwargs))
+            self.kwargs = kwargs
+
+    class HTTPClientError(BotoCoreError):
+        pass
+
+    class ConnectionError(BotoCoreError):
+        pass
+
+    class EndpointConnectionError(ConnectionError):
+        pass
+
+    class ConnectTimeoutError(ConnectionError):
+        pass
+
+    class ReadTimeoutError(HTTPClientError):
+        pass
+
+    class ConnectionClosedError(HTTPClientError):
+        pass
+
     class Config:
         def __init__(self, **kwargs):
             self.kwargs = kwargs
 
     exceptions_stub.ClientError = ClientError
+    for _error in (
+        BotoCoreError,
+        HTTPClientError,
+        ConnectionError,
+        EndpointConnectionError,
+        ConnectTimeoutError,
+        ReadTimeoutError,
+        ConnectionClosedError,
+    ):
+        setattr(exceptions_stub, _error.__name__, _error)
     config_stub.Config = Config
     botocore_stub.exceptions = exceptions_stub
     botocore_stub.config = config_stub
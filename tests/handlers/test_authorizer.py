@@ -4,6 +4,16 @@ import time
 import pytest
 
 import handlers.authorizer.authorizer as authorizer
+from utils.crypto_utils import hmac_sha256_hex
+
+
+@pytest.fixture(autouse=True)
+def _reset_authorizer_caches():
+    authorizer._DECISION_CACHE.clear()
+    authorizer._NEGATIVE_CACHE.clear()
+    authorizer._KEY_FAILURE_CACHE.clear()
+    authorizer._SOURCE_BUCKETS.clear()
+    authorizer._KEY_RING.clear()
 
 
 def test_allow_resource_from_method_arn():
@@ -25,12 +35,12 @@ def test_handler_allows_valid_signature(monkeypatch):
     log_calls = []
 
     monkeypatch.setenv("SECRET_NAME", "secret")
-    monkeypatch.setattr(authorizer, "get_secret", lambda name: "shared")
+    monkeypatch.setattr(authorizer, "get_secret", lambda name, **kwargs: "shared")
     monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: log_calls.append((args, kwargs)))
 
     method_arn = "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource"
     string_to_sign = f"{now}.{method_arn}"
-    signature = authorizer.hmac_sha256_hex("shared", string_to_sign)
+    signature = hmac_sha256_hex("shared", string_to_sign)
 
     event = {
         "headers": {
@@ -70,7 +80,7 @@ def test_handler_denies_signature_mismatch(monkeypatch):
     log_calls = []
 
     monkeypatch.setenv("SECRET_NAME", "secret")
-    monkeypatch.setattr(authorizer, "get_secret", lambda name: "shared")
+    monkeypatch.setattr(authorizer, "get_secret", lambda name, **kwargs: "shared")
     monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: log_calls.append((args, kwargs)))
 
     now = int(time.time())
@@ -92,14 +102,14 @@ def test_handler_denies_on_exception(monkeypatch):
     log_calls = []
 
     monkeypatch.setenv("SECRET_NAME", "secret")
-    monkeypatch.setattr(authorizer, "get_secret", lambda name: (_ for _ in ()).throw(RuntimeError("boom")))
+    monkeypatch.setattr(authorizer, "get_secret", lambda name, **kwargs: (_ for _ in ()).throw(RuntimeError("boom")))
     monkeypatch.setattr(authorizer, "log_exception", lambda *args, **kwargs: log_calls.append((args, kwargs)))
 
     now = int(time.time())
     event = {
         "headers": {
             "x-jarvis-timestamp": str(now),
-            "x-jarvis-signature": "sig",
+            "x-jarvis-signature": "0" * 64,
         },
         "methodArn": "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource",
     }
@@ -108,3 +118,349 @@ def test_handler_denies_on_exception(monkeypatch):
 
     assert result["policyDocument"]["Statement"][0]["Effect"] == "Deny"
     assert log_calls
+
+
+def test_handler_reuses_cached_allow_decision(monkeypatch):
+    secret_calls = []
+
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setattr(
+        authorizer,
+        "get_secret",
+        lambda name, **kwargs: secret_calls.append(kwargs["version_stage"]) or "shared",
+    )
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+
+    now = int(time.time())
+    method_arn = "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource"
+    signature = hmac_sha256_hex("shared", f"{now}.{method_arn}")
+    event = {
+        "headers": {
+            "x-jarvis-timestamp": str(now),
+            "x-jarvis-signature": signature,
+        },
+        "methodArn": method_arn,
+    }
+
+    first = authorizer.handler(event, context={})
+    second = authorizer.handler(event, context={})
+
+    assert first["policyDocument"]["Statement"][0]["Effect"] == "Allow"
+    assert second is first
+    assert secret_calls == ["AWSCURRENT", "AWSPREVIOUS"]
+
+
+def test_handler_caps_cache_expiry_for_future_timestamps(monkeypatch):
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setenv("MAX_SKEW_SECONDS", "300")
+    monkeypatch.setattr(authorizer, "get_secret", lambda name, **kwargs: "shared")
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+
+    now = int(time.time())
+    future = now + 10 * 365 * 24 * 3600
+    method_arn = "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource"
+    event = {
+        "headers": {
+            "x-jarvis-timestamp": str(future),
+            "x-jarvis-signature": hmac_sha256_hex("shared", f"{future}.{method_arn}"),
+        },
+        "methodArn": method_arn,
+    }
+
+    result = authorizer.handler(event, context={})
+
+    assert result["policyDocument"]["Statement"][0]["Effect"] == "Allow"
+    [(_, expires_at)] = authorizer._DECISION_CACHE.values()
+    assert expires_at <= time.time() + 300
+
+
+def test_decision_cache_expires_and_is_bounded(monkeypatch):
+    monkeypatch.setenv("DECISION_CACHE_MAX_ENTRIES", "2")
+    now = time.time()
+    policy = authorizer._policy("Allow", "resource")
+
+    authorizer._decision_cache_put(("1", "arn", "a"), policy, now + 60)
+    authorizer._decision_cache_put(("2", "arn", "b"), policy, now + 60)
+    authorizer._decision_cache_put(("3", "arn", "c"), policy, now + 60)
+    authorizer._decision_cache_put(("4", "arn", "d"), policy, now - 1)
+
+    assert list(authorizer._DECISION_CACHE) == [("2", "arn", "b"), ("3", "arn", "c")]
+    assert authorizer._decision_cache_get(("3", "arn", "c"), now) is policy
+    assert authorizer._decision_cache_get(("3", "arn", "c"), now + 61) is None
+    assert ("3", "arn", "c") not in authorizer._DECISION_CACHE
+
+
+def test_handler_accepts_previous_secret_version(monkeypatch):
+    versions = {"AWSCURRENT": "rotated", "AWSPREVIOUS": "shared"}
+
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setattr(
+        authorizer, "get_secret", lambda name, **kwargs: versions[kwargs["version_stage"]]
+    )
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+
+    now = int(time.time())
+    method_arn = "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource"
+    event = {
+        "headers": {
+            "x-jarvis-timestamp": str(now),
+            "x-jarvis-signature": hmac_sha256_hex("shared", f"{now}.{method_arn}"),
+        },
+        "methodArn": method_arn,
+    }
+
+    result = authorizer.handler(event, context={})
+
+    assert result["policyDocument"]["Statement"][0]["Effect"] == "Allow"
+
+
+def test_handler_uses_client_key_for_key_id(monkeypatch):
+    requested = []
+
+    def fake_get_secret(name, **kwargs):
+        requested.append(name)
+        if kwargs["version_stage"] == "AWSPREVIOUS":
+            raise RuntimeError("no previous version")
+        return "client-secret"
+
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setenv("CLIENT_SECRET_PREFIX", "jarvis/webhook/clients/")
+    monkeypatch.setattr(authorizer, "get_secret", fake_get_secret)
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+
+    now = int(time.time())
+    method_arn = "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource"
+    event = {
+        "headers": {
+            "X-Jarvis-Key-Id": "acme",
+            "x-jarvis-timestamp": str(now),
+            "x-jarvis-signature": hmac_sha256_hex(
+                "client-secret", f"{now}.{method_arn}"
+            ),
+        },
+        "methodArn": method_arn,
+    }
+
+    result = authorizer.handler(event, context={})
+
+    assert result["policyDocument"]["Statement"][0]["Effect"] == "Allow"
+    assert set(requested) == {"jarvis/webhook/clients/acme"}
+
+
+def test_handler_denies_invalid_key_id(monkeypatch):
+    log_calls = []
+
+    monkeypatch.setenv("CLIENT_SECRET_PREFIX", "jarvis/webhook/clients/")
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(authorizer, "log_exception", lambda *args, **kwargs: log_calls.append(args))
+
+    event = {
+        "headers": {
+            "x-jarvis-key-id": "../other",
+            "x-jarvis-timestamp": str(int(time.time())),
+            "x-jarvis-signature": "0" * 64,
+        },
+        "methodArn": "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource",
+    }
+
+    result = authorizer.handler(event, context={})
+
+    assert result["policyDocument"]["Statement"][0]["Effect"] == "Deny"
+    assert log_calls
+
+
+def test_handler_denies_malformed_signature_before_secret_fetch(monkeypatch):
+    log_calls = []
+
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setattr(
+        authorizer,
+        "get_secret",
+        lambda name, **kwargs: (_ for _ in ()).throw(AssertionError("secret fetched")),
+    )
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: log_calls.append(args[2]))
+
+    event = {
+        "headers": {
+            "x-jarvis-timestamp": str(int(time.time())),
+            "x-jarvis-signature": "abc123",
+        },
+        "methodArn": "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource",
+    }
+
+    result = authorizer.handler(event, context={})
+
+    assert result["policyDocument"]["Statement"][0]["Effect"] == "Deny"
+    assert log_calls == ["authorizer_deny_malformed_signature"]
+
+
+def test_handler_negative_caches_signature_mismatch(monkeypatch):
+    secret_calls = []
+
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(authorizer, "_signing_keys", lambda key_id: secret_calls.append(key_id) or [])
+
+    event = {
+        "headers": {
+            "x-jarvis-timestamp": str(int(time.time())),
+            "x-jarvis-signature": "f" * 64,
+        },
+        "methodArn": "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource",
+    }
+
+    first = authorizer.handler(event, context={})
+    second = authorizer.handler(event, context={})
+
+    assert first["policyDocument"]["Statement"][0]["Effect"] == "Deny"
+    assert second["policyDocument"]["Statement"][0]["Effect"] == "Deny"
+    assert len(secret_calls) == 1
+
+
+def test_handler_negative_caches_unknown_key_ids(monkeypatch):
+    secret_calls = []
+
+    def missing_secret(name, **kwargs):
+        secret_calls.append(name)
+        raise RuntimeError("ResourceNotFoundException")
+
+    monkeypatch.setenv("CLIENT_SECRET_PREFIX", "jarvis/webhook/clients/")
+    monkeypatch.setattr(authorizer, "get_secret", missing_secret)
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(authorizer, "log_exception", lambda *args, **kwargs: None)
+
+    def event(signature):
+        return {
+            "headers": {
+                "x-jarvis-timestamp": str(int(time.time())),
+                "x-jarvis-signature": signature,
+                "x-jarvis-key-id": "random-key",
+            },
+            "methodArn": "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource",
+        }
+
+    first = authorizer.handler(event("a" * 64), context={})
+    # A different signature misses the decision caches but not the key cache.
+    second = authorizer.handler(event("b" * 64), context={})
+
+    assert first["policyDocument"]["Statement"][0]["Effect"] == "Deny"
+    assert second["policyDocument"]["Statement"][0]["Effect"] == "Deny"
+    assert secret_calls == ["jarvis/webhook/clients/random-key"]
+
+
+def test_handler_rate_limits_per_source_ip(monkeypatch):
+    monkeypatch.setenv("SOURCE_RATE_PER_SECOND", "1")
+    monkeypatch.setenv("SOURCE_BURST", "2")
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+
+    def event_from(source_ip):
+        return {
+            "headers": {"x-jarvis-timestamp": "invalid"},
+            "methodArn": "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/resource",
+            "requestContext": {"identity": {"sourceIp": source_ip}},
+        }
+
+    for _ in range(2):
+        authorizer.handler(event_from("10.0.0.1"), context={})
+
+    assert not authorizer._take_source_token("10.0.0.1", time.time())
+    assert authorizer._take_source_token("10.0.0.2", time.time())
+    assert authorizer._take_source_token("10.0.0.1", time.time() + 5)
+
+
+def test_handler_cacheable_mode_pins_allow_to_method_arn(monkeypatch):
+    monkeypatch.setenv("AUTHORIZER_CACHEABLE_POLICIES", "true")
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setattr(authorizer, "get_secret", lambda name, **kwargs: "shared")
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+
+    now = int(time.time())
+    method_arn = "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/ingress"
+    event = {
+        "headers": {
+            "x-jarvis-timestamp": str(now),
+            "x-jarvis-signature": hmac_sha256_hex("shared", f"{now}.{method_arn}"),
+        },
+        "methodArn": method_arn,
+    }
+
+    result = authorizer.handler(event, context={})
+
+    statement = result["policyDocument"]["Statement"][0]
+    assert statement["Effect"] == "Allow"
+    assert statement["Resource"] == method_arn
+
+
+def test_handler_cacheable_mode_does_not_return_transient_deny(monkeypatch):
+    monkeypatch.setenv("AUTHORIZER_CACHEABLE_POLICIES", "true")
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setattr(
+        authorizer, "get_secret", lambda name, **kwargs: (_ for _ in ()).throw(RuntimeError("boom"))
+    )
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(authorizer, "log_exception", lambda *args, **kwargs: None)
+
+    event = {
+        "headers": {
+            "x-jarvis-timestamp": str(int(time.time())),
+            "x-jarvis-signature": "0" * 64,
+        },
+        "methodArn": "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/ingress",
+    }
+
+    with pytest.raises(Exception, match="Unauthorized"):
+        authorizer.handler(event, context={})
+
+
+def test_handler_cacheable_mode_denies_http_api_events_without_raising(monkeypatch):
+    monkeypatch.setenv("AUTHORIZER_CACHEABLE_POLICIES", "true")
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setenv("SOURCE_RATE_PER_SECOND", "1")
+    monkeypatch.setenv("SOURCE_BURST", "1")
+    monkeypatch.setattr(
+        authorizer, "get_secret", lambda name, **kwargs: (_ for _ in ()).throw(RuntimeError("boom"))
+    )
+    monkeypatch.setattr(authorizer, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(authorizer, "log_exception", lambda *args, **kwargs: None)
+
+    event = {
+        "version": "2.0",
+        "type": "REQUEST",
+        "routeArn": "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/ingress",
+        "headers": {
+            "x-jarvis-timestamp": str(int(time.time())),
+            "x-jarvis-signature": "0" * 64,
+        },
+        "requestContext": {"requestId": "req-1", "http": {"sourceIp": "1.2.3.4"}},
+    }
+    deny = {"isAuthorized": False, "context": {"principalId": "jarvis-webhook"}}
+
+    # A raised "Unauthorized" would surface as a 500 from an HTTP API.
+    assert authorizer.handler(event, context={}) == deny  # secret failure
+    assert authorizer.handler(event, context={}) == deny  # rate limited
+
+
+def test_handler_returns_simple_response_for_http_api_events(monkeypatch):
+    now = int(time.time())
+    monkeypatch.setenv("SECRET_NAME", "secret")
+    monkeypatch.setattr(authorizer, "get_secret", lambda name, **kwargs: "shared")
+
+    route_arn = "arn:aws:execute-api:us-east-1:123456789012:abc/dev/POST/ingress"
+    signature = hmac_sha256_hex("shared", f"{now}.{route_arn}")
+    event = {
+        "version": "2.0",
+        "type": "REQUEST",
+        "routeArn": route_arn,
+        "headers": {
+            "x-jarvis-timestamp": str(now),
+            "x-jarvis-signature": signature,
+        },
+        "requestContext": {"requestId": "req-1", "http": {"sourceIp": "1.2.3.4"}},
+    }
+
+    assert authorizer.handler(event, context={})["isAuthorized"] is True
+
+    event["headers"]["x-jarvis-signature"] = "0" * 64
+    assert authorizer.handler(event, context={}) == {
+        "isAuthorized": False,
+        "context": {"principalId": "jarvis-webhook"},
+    }
@@ -5,6 +5,9 @@ from types import SimpleNamespace
 import pytest
 
 import handlers.email_adapter.email_adapter as email_adapter
+from utils import secrets
+from utils.idempotency import body_idempotency_key
+from utils.lambda_time import DeadlineExceeded
 
 
 def _make_event(key="folder%2Fmessage.eml"):
@@ -58,20 +61,25 @@ def test_handler_success_end_to_end(monkeypatch):
             "text": "Body",
         },
     )
-    monkeypatch.setattr(email_adapter, "get_secret_cached", lambda name: "shared")
+    secret_calls = []
+    monkeypatch.setattr(
+        email_adapter,
+        "get_secret_cached",
+        lambda name, deadline: secret_calls.append(deadline) or "shared",
+    )
     monkeypatch.setattr(email_adapter, "get_account_id", lambda: "123456789012")
     monkeypatch.setattr(email_adapter, "build_method_arn_for_ingress", lambda *args, **kwargs: "arn")
     monkeypatch.setattr(email_adapter, "hmac_sha256_hex", lambda secret, msg: "sig")
-    monkeypatch.setattr(email_adapter, "http_timeout_seconds", lambda *args, **kwargs: 5)
     monkeypatch.setattr(
         email_adapter,
         "post_json",
-        lambda url, headers, body_bytes, timeout_seconds: post_calls.append(
+        lambda url, headers, body_bytes, timeout_seconds, deadline: post_calls.append(
             {
                 "url": url,
                 "headers": headers,
                 "body": body_bytes,
                 "timeout": timeout_seconds,
+                "deadline": deadline,
             }
         )
         or (200, "ok"),
@@ -89,7 +97,14 @@ def test_handler_success_end_to_end(monkeypatch):
     assert body["source"] == "email"
     assert body["s3"]["bucket"] == "my-bucket"
     assert body["s3"]["key"] == "folder/message.eml"
+    # No Message-ID header: the stored object identifies the email.
+    assert body["idempotencyKey"] == body_idempotency_key(
+        "s3://my-bucket/folder/message.eml"
+    )
     assert post_calls[0]["headers"]["x-jarvis-signature"] == "sig"
+    # The secret fetch and the publish share one invocation deadline.
+    assert post_calls[0]["deadline"] is secret_calls[0]
+    assert 0 < secret_calls[0].remaining_seconds() <= 9
     assert metric_calls
     assert log_calls
 
@@ -134,7 +149,7 @@ def test_handler_secret_fetch_failure_logs(monkeypatch):
 
     monkeypatch.setattr(email_adapter, "get_s3_client", lambda: FakeS3())
     monkeypatch.setattr(email_adapter, "parse_raw_email", lambda raw: {"from": "a", "subject": "b", "text": "c"})
-    monkeypatch.setattr(email_adapter, "get_secret_cached", lambda name: (_ for _ in ()).throw(RuntimeError("boom")))
+    monkeypatch.setattr(email_adapter, "get_secret_cached", lambda name, deadline: (_ for _ in ()).throw(RuntimeError("boom")))
     monkeypatch.setattr(email_adapter, "log_exception", lambda *args, **kwargs: log_calls.append((args, kwargs)))
     monkeypatch.setattr(email_adapter, "log_json", lambda *args, **kwargs: None)
     monkeypatch.setattr(email_adapter, "emit_metric", lambda *args, **kwargs: None)
@@ -160,7 +175,7 @@ def test_handler_http_non_2xx_logs_and_raises(monkeypatch):
 
     monkeypatch.setattr(email_adapter, "get_s3_client", lambda: FakeS3())
     monkeypatch.setattr(email_adapter, "parse_raw_email", lambda raw: {"from": "a", "subject": "b", "text": "c"})
-    monkeypatch.setattr(email_adapter, "get_secret_cached", lambda name: "secret")
+    monkeypatch.setattr(email_adapter, "get_secret_cached", lambda name, deadline: "secret")
     monkeypatch.setattr(email_adapter, "get_account_id", lambda: "123")
     monkeypatch.setattr(email_adapter, "build_method_arn_for_ingress", lambda *args, **kwargs: "arn")
     monkeypatch.setattr(email_adapter, "post_json", lambda *args, **kwargs: (500, "bad"))
@@ -176,7 +191,7 @@ def test_handler_http_non_2xx_logs_and_raises(monkeypatch):
 
 def test_handler_low_remaining_time_aborts(monkeypatch):
     event = _make_event()
-    context = _make_context(remaining_ms=3000)
+    context = _make_context(remaining_ms=500)
 
     monkeypatch.setenv("SECRET_NAME", "secret")
     monkeypatch.setenv("INGRESS_URL", "https://example.com")
@@ -193,7 +208,14 @@ def test_handler_low_remaining_time_aborts(monkeypatch):
     monkeypatch.setattr(email_adapter, "log_exception", lambda *args, **kwargs: log_calls.append((args, kwargs)))
     monkeypatch.setattr(email_adapter, "emit_metric", lambda *args, **kwargs: None)
 
-    with pytest.raises(RuntimeError, match="low remaining time"):
+    monkeypatch.setattr(secrets, "_SECRET_CACHE", {})
+    monkeypatch.setattr(
+        secrets,
+        "_fetch_secret",
+        lambda name: pytest.fail("secret fetched past the deadline"),
+    )
+
+    with pytest.raises(DeadlineExceeded):
         email_adapter.handler(event, context)
 
-    assert any(call[0][2] == "email_adapter_abort_low_time" for call in log_calls)
+    assert any(call[0][1] == "email_adapter_error" for call in log_calls)
@@ -4,21 +4,39 @@ import json
 
 import pytest
 
+from utils.idempotency import body_idempotency_key
 
-def _load_module(monkeypatch, queue_url="https://queue"):
+
+def _load_module(
+    monkeypatch, queue_url="https://queue", envelope_mode="parsed", codec="", fifo=False
+):
     import boto3
 
     class FakeSqs:
         def __init__(self):
             self.calls = []
 
-        def send_message(self, QueueUrl, MessageBody):
-            self.calls.append({"QueueUrl": QueueUrl, "MessageBody": MessageBody})
+        def send_message(self, QueueUrl, MessageBody, **kwargs):
+            self.calls.append({"QueueUrl": QueueUrl, "MessageBody": MessageBody, **kwargs})
+            return {"MessageId": f"msg-{len(self.calls)}"}
+
+        def send_message_batch(self, QueueUrl, Entries):
+            self.calls.append({"QueueUrl": QueueUrl, "Entries": Entries})
+            return {
+                "Successful": [
+                    {"Id": entry["Id"], "MessageId": f"msg-{entry['Id']}"}
+                    for entry in Entries
+                ],
+                "Failed": [],
+            }
 
     fake_sqs = FakeSqs()
 
     monkeypatch.setattr(boto3, "client", lambda service: fake_sqs)
     monkeypatch.setenv("INGRESS_QUEUE_URL", queue_url)
+    monkeypatch.setenv("ROUTER_ENVELOPE_MODE", envelope_mode)
+    monkeypatch.setenv("SQS_MESSAGE_CODEC", codec)
+    monkeypatch.setenv("INGRESS_QUEUE_FIFO", "true" if fifo else "false")
 
     import handlers.router.ingress_router as ingress_router
 
@@ -60,9 +78,287 @@ def test_handler_logs_exception_on_send_failure(monkeypatch):
     monkeypatch.setattr(ingress_router, "log_exception", lambda *args, **kwargs: fake_sqs.calls.append({"log": True}))
     monkeypatch.setattr(ingress_router.sqs_client, "send_message", fail_send_message)
 
+    monkeypatch.setattr(ingress_router.time, "sleep", lambda seconds: None)
+
     event = {"body": "{}", "requestContext": {"requestId": "req-2"}}
 
     result = ingress_router.handler(event, context={})
 
-    assert result["statusCode"] == 200
+    assert result["statusCode"] == 503
     assert {"log": True} in fake_sqs.calls
+
+
+def test_handler_splits_json_array_into_batches(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch)
+
+    items = [{"n": n} for n in range(23)]
+    event = {
+        "body": json.dumps(items),
+        "requestContext": {"requestId": "req-3"},
+    }
+
+    result = ingress_router.handler(event, context={})
+
+    assert result["statusCode"] == 200
+    assert sorted(len(call["Entries"]) for call in fake_sqs.calls) == [3, 10, 10]
+    sent = [
+        json.loads(entry["MessageBody"])
+        for call in fake_sqs.calls
+        for entry in call["Entries"]
+    ]
+    assert sorted(envelope["body"]["n"] for envelope in sent) == list(range(23))
+    assert all(envelope["requestId"] == "req-3" for envelope in sent)
+    results = json.loads(result["body"])["results"]
+    assert [item["index"] for item in results] == list(range(23))
+    assert results[5] == {"index": 5, "status": "queued", "messageId": "msg-5"}
+
+
+def test_handler_accepts_ndjson_on_batch_resource(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch)
+
+    event = {
+        "resource": "/ingress/batch",
+        "body": '{"a": 1}\n\nnot-json\n{"b": 2}\n',
+        "requestContext": {"requestId": "req-4"},
+    }
+
+    result = ingress_router.handler(event, context={})
+
+    assert result["statusCode"] == 200
+    entries = fake_sqs.calls[0]["Entries"]
+    assert [json.loads(entry["MessageBody"])["body"] for entry in entries] == [
+        {"a": 1},
+        {"raw": "not-json"},
+        {"b": 2},
+    ]
+
+
+def test_handler_accepts_http_api_payload_v2_batch(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch)
+
+    event = {
+        "version": "2.0",
+        "routeKey": "POST /ingress/batch",
+        "rawPath": "/dev/ingress/batch",
+        "headers": {"content-type": "application/json"},
+        "body": base64.b64encode(b'[{"a": 1}, {"b": 2}]').decode("ascii"),
+        "isBase64Encoded": True,
+        "requestContext": {"requestId": "req-v2", "http": {"method": "POST"}},
+    }
+
+    result = ingress_router.handler(event, context={})
+
+    assert result["statusCode"] == 200
+    assert json.loads(result["body"])["requestId"] == "req-v2"
+    assert len(fake_sqs.calls[0]["Entries"]) == 2
+
+
+def test_handler_reports_partial_batch_failures(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch)
+
+    def partial_send(QueueUrl, Entries):
+        ids = [entry["Id"] for entry in Entries]
+        return {
+            "Successful": [{"Id": "0", "MessageId": "msg-0"}] if "0" in ids else [],
+            "Failed": [{"Id": "1", "Code": "InternalError"}] if "1" in ids else [],
+        }
+
+    monkeypatch.setattr(ingress_router.sqs_client, "send_message_batch", partial_send)
+    monkeypatch.setattr(ingress_router.time, "sleep", lambda seconds: None)
+
+    event = {
+        "body": '{"a": 1}\n{"b": 2}',
+        "headers": {"Content-Type": "application/x-ndjson"},
+        "requestContext": {"requestId": "req-5"},
+    }
+
+    result = ingress_router.handler(event, context={})
+
+    assert result["statusCode"] == 207
+    assert json.loads(result["body"])["results"][1] == {
+        "index": 1,
+        "status": "failed",
+        "error": "InternalError",
+    }
+
+
+def test_handler_offloads_large_payload(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch)
+    stored = {}
+
+    class FakeS3:
+        def put_object(self, Bucket, Key, Body, ContentType):
+            stored[(Bucket, Key)] = Body
+
+    monkeypatch.setenv("CLAIM_CHECK_BUCKET", "bucket")
+    monkeypatch.setenv("CLAIM_CHECK_THRESHOLD_BYTES", "64")
+    monkeypatch.setattr("utils.claim_check.get_s3_client", lambda: FakeS3())
+
+    event = {
+        "body": json.dumps({"source": "email", "text": "x" * 200}),
+        "requestContext": {"requestId": "req-6"},
+    }
+
+    result = ingress_router.handler(event, context={})
+
+    assert result["statusCode"] == 200
+    sent = json.loads(fake_sqs.calls[0]["MessageBody"])
+    assert "body" not in sent
+    assert sent["source"] == "email"
+    assert (sent["bodyRef"]["bucket"], sent["bodyRef"]["key"]) in stored
+
+
+def test_handler_passthrough_mode_returns_receipt(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch, envelope_mode="raw")
+    body = base64.b64encode(b'{"hello": "world"}').decode("utf-8")
+
+    event = {
+        "body": body,
+        "isBase64Encoded": True,
+        "requestContext": {"requestId": "req-7"},
+    }
+
+    result = ingress_router.handler(event, context={})
+
+    assert result["statusCode"] == 200
+    assert json.loads(result["body"]) == {"requestId": "req-7", "messageId": "msg-1"}
+    sent = json.loads(fake_sqs.calls[0]["MessageBody"])
+    assert sent == {
+        "requestId": "req-7",
+        "rawBody": body,
+        "isBase64Encoded": True,
+        "idempotencyKey": body_idempotency_key(body),
+    }
+
+
+def test_handler_compresses_message_with_codec(monkeypatch):
+    from utils.sqs_codec import decode_record_body
+
+    ingress_router, fake_sqs = _load_module(monkeypatch, codec="zlib")
+    payload = {"source": "email", "text": "hello " * 1000}
+
+    event = {"body": json.dumps(payload), "requestContext": {"requestId": "req-8"}}
+
+    ingress_router.handler(event, context={})
+
+    call = fake_sqs.calls[0]
+    assert call["MessageAttributes"]["jarvis-codec"]["StringValue"] == "zlib+base64"
+    record = {
+        "body": call["MessageBody"],
+        "messageAttributes": {"jarvis-codec": {"stringValue": "zlib+base64"}},
+    }
+    assert json.loads(decode_record_body(record))["body"] == payload
+
+
+def test_handler_sets_fifo_group_and_dedup_ids(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch, fifo=True)
+    body = {"source": "email", "from": "\"Name\" <user@example.com>", "text": "hi"}
+
+    for request_id in ("req-9", "req-10"):
+        ingress_router.handler(
+            {"body": json.dumps(body), "requestContext": {"requestId": request_id}},
+            context={},
+        )
+    ingress_router.handler(
+        {"body": json.dumps({"source": "hook one"}), "requestContext": {"requestId": "req-11"}},
+        context={},
+    )
+
+    first, second, third = fake_sqs.calls
+    assert first["MessageGroupId"] == "user@example.com"
+    assert first["MessageDeduplicationId"] == second["MessageDeduplicationId"]
+    assert third["MessageGroupId"] == "hook_one"
+    assert third["MessageDeduplicationId"] != first["MessageDeduplicationId"]
+
+
+def test_handler_fifo_retries_without_sender_share_group(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch, fifo=True)
+    body = json.dumps({"event": "ping", "id": 42})
+
+    for request_id in ("req-1", "req-2"):
+        ingress_router.handler(
+            {"body": body, "requestContext": {"requestId": request_id}}, context={}
+        )
+
+    first, second = fake_sqs.calls
+    assert first["MessageDeduplicationId"] == second["MessageDeduplicationId"]
+    assert first["MessageGroupId"] == second["MessageGroupId"]
+    assert first["MessageGroupId"].startswith("body-")
+
+
+def test_handler_routes_envelopes_to_lane_queues(monkeypatch):
+    monkeypatch.setenv(
+        "ROUTING_RULES",
+        json.dumps({"rules": [{"lane": "interactive", "field": "source", "equals": ["email"]}]}),
+    )
+    monkeypatch.setenv("LANE_QUEUE_URLS", json.dumps({"interactive": "https://fast-queue"}))
+    ingress_router, fake_sqs = _load_module(monkeypatch)
+
+    ingress_router.handler(
+        {"body": json.dumps({"source": "email"}), "requestContext": {"requestId": "r1"}},
+        context={},
+    )
+    ingress_router.handler(
+        {"body": json.dumps([{"source": "email"}, {"source": "hook"}, {"source": "email"}])},
+        context={},
+    )
+
+    assert fake_sqs.calls[0]["QueueUrl"] == "https://fast-queue"
+    batches = {call["QueueUrl"]: call["Entries"] for call in fake_sqs.calls[1:]}
+    assert [entry["Id"] for entry in batches["https://fast-queue"]] == ["0", "2"]
+    assert [entry["Id"] for entry in batches["https://queue"]] == ["1"]
+
+
+def test_handler_retries_throttled_send(monkeypatch):
+    from botocore.exceptions import ClientError
+
+    ingress_router, fake_sqs = _load_module(monkeypatch)
+    attempts = []
+
+    def flaky_send(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) < 3:
+            raise ClientError({"Error": {"Code": "RequestThrottled"}}, "SendMessage")
+        return {"MessageId": "msg-ok"}
+
+    monkeypatch.setattr(ingress_router.sqs_client, "send_message", flaky_send)
+    monkeypatch.setattr(ingress_router.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr("utils.retry.time.sleep", lambda seconds: None)
+
+    result = ingress_router.handler(
+        {"body": "{}", "requestContext": {"requestId": "req-12"}}, context={}
+    )
+
+    assert result["statusCode"] == 200
+    assert len(attempts) == 3
+
+
+def test_handler_spills_to_s3_when_sqs_keeps_failing(monkeypatch):
+    ingress_router, fake_sqs = _load_module(monkeypatch)
+    stored = {}
+
+    class FakeS3:
+        def put_object(self, Bucket, Key, Body, ContentType):
+            stored[(Bucket, Key)] = Body
+
+    def fail_send(**kwargs):
+        raise RuntimeError("unreachable")
+
+    monkeypatch.setenv("OVERFLOW_BUCKET", "bucket")
+    monkeypatch.setattr("utils.overflow.get_s3_client", lambda: FakeS3())
+    monkeypatch.setattr(ingress_router.sqs_client, "send_message", fail_send)
+    monkeypatch.setattr(ingress_router, "log_exception", lambda *args, **kwargs: None)
+    monkeypatch.setattr("utils.retry.time.sleep", lambda seconds: None)
+
+    result = ingress_router.handler(
+        {"body": json.dumps({"a": 1}), "requestContext": {"requestId": "req-13"}},
+        context={},
+    )
+
+    assert result["statusCode"] == 202
+    [(bucket, key)] = stored
+    assert bucket == "bucket"
+    assert key.startswith("ingress-overflow/")
+    spilled = json.loads(stored[(bucket, key)])
+    assert spilled["QueueUrl"] == "https://queue"
+    assert json.loads(spilled["MessageBody"])["body"] == {"a": 1}
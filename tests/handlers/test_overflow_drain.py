@@ -0,0 +1,73 @@
+import io
+import json
+from types import SimpleNamespace
+
+import handlers.overflow_drain.overflow_drain as overflow_drain
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = dict(objects)
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys):
+        return {"Contents": [{"Key": key} for key in sorted(self.objects) if key.startswith(Prefix)]}
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[Key] = Body
+
+    def delete_object(self, Bucket, Key):
+        del self.objects[Key]
+
+
+class FakeSqs:
+    def send_message_batch(self, QueueUrl, Entries):
+        failed = []
+        for entry in Entries:
+            if entry["MessageBody"] == "bad":
+                failed.append({"Id": entry["Id"], "SenderFault": False})
+            elif entry["MessageBody"] == "invalid":
+                failed.append({"Id": entry["Id"], "SenderFault": True})
+        return {"Failed": failed}
+
+
+def test_handler_requeues_and_keeps_failures(monkeypatch):
+    good = json.dumps({"QueueUrl": "https://q", "MessageBody": "ok"})
+    bad = json.dumps({"QueueUrl": "https://q", "MessageBody": "bad"})
+    fake_s3 = FakeS3(
+        {
+            "ingress-overflow/a.ndjson": f"{good}\n{good}".encode(),
+            "ingress-overflow/b.ndjson": f"{good}\n{bad}".encode(),
+        }
+    )
+    monkeypatch.setenv("OVERFLOW_BUCKET", "bucket")
+    monkeypatch.setattr(overflow_drain, "get_s3_client", lambda: fake_s3)
+    monkeypatch.setattr(overflow_drain, "get_sqs_client", lambda: FakeSqs())
+    monkeypatch.setattr(overflow_drain, "log_json", lambda *args, **kwargs: None)
+
+    context = SimpleNamespace(get_remaining_time_in_millis=lambda: 60000)
+    result = overflow_drain.handler({}, context)
+
+    assert result == {"objects": 2, "requeued": 3, "remaining": 1, "rejected": 0}
+    assert list(fake_s3.objects) == ["ingress-overflow/b.ndjson"]
+    assert json.loads(fake_s3.objects["ingress-overflow/b.ndjson"])["MessageBody"] == "bad"
+
+
+def test_handler_dead_letters_sender_faults(monkeypatch):
+    good = json.dumps({"QueueUrl": "https://q", "MessageBody": "ok"})
+    invalid = json.dumps({"QueueUrl": "https://q", "MessageBody": "invalid"})
+    fake_s3 = FakeS3({"ingress-overflow/2024/a.ndjson": f"{good}\n{invalid}".encode()})
+    monkeypatch.setenv("OVERFLOW_BUCKET", "bucket")
+    monkeypatch.setattr(overflow_drain, "get_s3_client", lambda: fake_s3)
+    monkeypatch.setattr(overflow_drain, "get_sqs_client", lambda: FakeSqs())
+    monkeypatch.setattr(overflow_drain, "log_json", lambda *args, **kwargs: None)
+
+    context = SimpleNamespace(get_remaining_time_in_millis=lambda: 60000)
+    result = overflow_drain.handler({}, context)
+
+    assert result == {"objects": 1, "requeued": 1, "remaining": 0, "rejected": 1}
+    assert list(fake_s3.objects) == ["ingress-overflow-rejected/2024/a.ndjson"]
+    rejected = json.loads(fake_s3.objects["ingress-overflow-rejected/2024/a.ndjson"])
+    assert rejected["MessageBody"] == "invalid"
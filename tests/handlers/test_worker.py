@@ -3,6 +3,12 @@ import pytest
 import handlers.worker.worker as worker
 
 
+@pytest.fixture(autouse=True)
+def _reset_worker_config(monkeypatch):
+    # The config snapshot is per container; rebuild it for each test's env.
+    monkeypatch.setattr(worker, "_CONFIG", None)
+
+
 def test_worker_handler_logs_records(monkeypatch):
     log_calls = []
     monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: log_calls.append((args, kwargs)))
@@ -11,7 +17,7 @@ def test_worker_handler_logs_records(monkeypatch):
 
     result = worker.handler(event, context={})
 
-    assert result == {"status": "ok", "records": []}
+    assert result == {"status": "ok", "records": [], "batchItemFailures": []}
     assert len(log_calls) == 3
 
 
@@ -1,14 +1,25 @@
+import io
 import json
+import time
+from types import SimpleNamespace
+
+import pytest
 
 import handlers.worker.worker as worker
 
 
+@pytest.fixture(autouse=True)
+def _reset_worker_config(monkeypatch):
+    # The config snapshot is per container; rebuild it for each test's env.
+    monkeypatch.setattr(worker, "_CONFIG", None)
+
+
 class DummyProvider:
     def __init__(self, slots):
         self.slots = slots
         self.calls = []
 
-    def get_free_slots(self, email, start, end, slot_minutes):
+    def get_free_slots(self, email, start, end, slot_minutes, deadline=None):
         self.calls.append((email, start, end, slot_minutes))
         return self.slots
 
@@ -40,3 +51,655 @@ def test_worker_attaches_calendar_slots(monkeypatch):
     assert provider.calls
     assert provider.calls[0][0] == "user@example.com"
     assert result["records"][0]["payload"]["body"]["calendar_slots"] == slots
+
+
+def test_worker_resolves_claim_check_body_for_email(monkeypatch):
+    provider = DummyProvider([])
+    fetched = []
+
+    class FakeS3:
+        def get_object(self, Bucket, Key):
+            fetched.append((Bucket, Key))
+            return {"Body": io.BytesIO(json.dumps({"source": "email", "from": "user@example.com"}).encode())}
+
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr("utils.claim_check.get_s3_client", lambda: FakeS3())
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    ref = {"bucket": "bucket", "key": "ingress-payloads/req/1.json", "size": 10}
+    event = {
+        "Records": [
+            {"body": json.dumps({"requestId": "req", "source": "email", "bodyRef": ref})},
+            {"body": json.dumps({"requestId": "req", "source": "webhook", "bodyRef": ref})},
+        ]
+    }
+
+    result = worker.handler(event, context={})
+
+    assert fetched == [("bucket", "ingress-payloads/req/1.json")]
+    assert provider.calls[0][0] == "user@example.com"
+    assert result["records"][0]["payload"]["body"]["calendar_slots"] == []
+    assert "body" not in result["records"][1]["payload"]
+
+
+def test_worker_parses_raw_envelope(monkeypatch):
+    provider = DummyProvider([])
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    raw_body = json.dumps({"source": "email", "from": "user@example.com"})
+    event = {
+        "Records": [
+            {
+                "body": json.dumps(
+                    {"requestId": "req", "rawBody": raw_body, "isBase64Encoded": False}
+                )
+            }
+        ]
+    }
+
+    result = worker.handler(event, context={})
+
+    assert provider.calls[0][0] == "user@example.com"
+    assert result["records"][0]["payload"]["body"]["calendar_slots"] == []
+
+
+def test_worker_decodes_compressed_record(monkeypatch):
+    from utils.sqs_codec import encode_message_body
+
+    provider = DummyProvider([])
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    message_body = json.dumps(
+        {"body": {"source": "email", "from": "user@example.com", "text": "hi " * 1000}}
+    )
+    encoded, attributes = encode_message_body(message_body, "gzip")
+    event = {
+        "Records": [
+            {
+                "body": encoded,
+                "messageAttributes": {
+                    "jarvis-codec": {
+                        "stringValue": attributes["jarvis-codec"]["StringValue"],
+                        "dataType": "String",
+                    }
+                },
+            }
+        ]
+    }
+
+    worker.handler(event, context={})
+
+    assert provider.calls[0][0] == "user@example.com"
+
+
+def test_worker_processes_records_concurrently_in_order(monkeypatch):
+    class SlowProvider:
+        def get_free_slots(self, email, start, end, slot_minutes, deadline=None):
+            time.sleep(0.2)
+            return [{"start": email, "end": email}]
+
+    monkeypatch.setattr(worker, "get_provider", lambda: SlowProvider())
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(worker, "RECORD_CONCURRENCY", 10)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    senders = [f"user{index}@example.com" for index in range(10)]
+    event = {
+        "Records": [
+            {
+                "body": json.dumps(
+                    {"body": {"source": "email", "from": sender, "subject": str(index)}}
+                )
+            }
+            for index, sender in enumerate(senders)
+        ]
+    }
+
+    started = time.monotonic()
+    result = worker.handler(event, context={})
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    assert [
+        item["payload"]["body"]["calendar_slots"][0]["start"]
+        for item in result["records"]
+    ] == senders
+
+
+def test_worker_reports_only_failed_records(monkeypatch):
+    class FlakyProvider:
+        def get_free_slots(self, email, start, end, slot_minutes, deadline=None):
+            if email == "bad@example.com":
+                raise RuntimeError("calendar down")
+            return []
+
+    monkeypatch.setattr(worker, "get_provider", lambda: FlakyProvider())
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(worker, "log_exception", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    event = {
+        "Records": [
+            {
+                "messageId": f"msg-{index}",
+                "body": json.dumps({"body": {"source": "email", "from": sender}}),
+            }
+            for index, sender in enumerate(
+                ["ok@example.com", "bad@example.com", "ok2@example.com"]
+            )
+        ]
+    }
+
+    result = worker.handler(event, context={})
+
+    assert result["batchItemFailures"] == [{"itemIdentifier": "msg-1"}]
+    assert [item["record"]["messageId"] for item in result["records"]] == [
+        "msg-0",
+        "msg-2",
+    ]
+
+
+@pytest.mark.parametrize(
+    "groups, expected_failures",
+    [
+        (["g1", "g1", "g2", "g1"], ["msg-1", "msg-3"]),
+        ([None, None, None, None], ["msg-1", "msg-2", "msg-3"]),
+    ],
+)
+def test_fifo_worker_fails_records_behind_a_failure(
+    monkeypatch, groups, expected_failures
+):
+    class FlakyProvider:
+        def get_free_slots(self, email, start, end, slot_minutes, deadline=None):
+            if email == "bad@example.com":
+                raise RuntimeError("calendar down")
+            return []
+
+    monkeypatch.setattr(worker, "get_provider", lambda: FlakyProvider())
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(worker, "log_exception", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    senders = ["ok@example.com", "bad@example.com", "ok2@example.com", "ok3@example.com"]
+    event = {
+        "Records": [
+            {
+                "messageId": f"msg-{index}",
+                "eventSourceARN": "arn:aws:sqs:us-east-1:123456789012:jarvis.fifo",
+                "attributes": {"MessageGroupId": group} if group else {},
+                "body": json.dumps({"body": {"source": "email", "from": sender}}),
+            }
+            for index, (sender, group) in enumerate(zip(senders, groups))
+        ]
+    }
+
+    result = worker.handler(event, context={})
+
+    assert result["batchItemFailures"] == [
+        {"itemIdentifier": message_id} for message_id in expected_failures
+    ]
+    assert [item["record"]["messageId"] for item in result["records"]] == [
+        f"msg-{index}"
+        for index in range(4)
+        if f"msg-{index}" not in expected_failures
+    ]
+
+
+def test_worker_coalesces_lookups_per_sender(monkeypatch):
+    slots = [{"start": "2024-01-01T10:00:00+00:00", "end": "2024-01-01T10:30:00+00:00"}]
+    provider = DummyProvider(slots)
+    provider_builds = []
+
+    def build_provider():
+        provider_builds.append(1)
+        return provider
+
+    monkeypatch.setattr(worker, "get_provider", build_provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    senders = ["a@example.com", "b@example.com", "a@example.com", "A <a@example.com>"]
+    event = {
+        "Records": [
+            {
+                "body": json.dumps(
+                    {"body": {"source": "email", "from": sender, "subject": str(index)}}
+                )
+            }
+            for index, sender in enumerate(senders)
+        ]
+    }
+
+    result = worker.handler(event, context={})
+
+    assert provider_builds == [1]
+    assert sorted(call[0] for call in provider.calls) == [
+        "a@example.com",
+        "b@example.com",
+    ]
+    assert len(result["records"]) == 4
+    assert all(
+        item["payload"]["body"]["calendar_slots"] == slots for item in result["records"]
+    )
+
+
+def test_worker_config_is_loaded_once_per_container(monkeypatch):
+    builds = []
+
+    def build_provider():
+        builds.append(1)
+        return DummyProvider([])
+
+    monkeypatch.setattr(worker, "get_provider", build_provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+    monkeypatch.setenv("WORKDAY_START", "09:00")
+    monkeypatch.setenv("WORKDAY_END", "17:00")
+
+    event = {
+        "Records": [
+            {"body": json.dumps({"body": {"source": "email", "from": "a@example.com"}})}
+        ]
+    }
+    worker.handler(event, context={})
+    monkeypatch.setenv("WORKDAY_END", "12:00")
+    worker.handler(event, context={})
+
+    assert builds == [1]
+    assert worker.get_config().workday_end.hour == 17
+
+
+def test_worker_config_rejects_inverted_workday(monkeypatch):
+    monkeypatch.setattr(worker, "get_provider", lambda: DummyProvider([]))
+    monkeypatch.setenv("WORKDAY_START", "17:00")
+    monkeypatch.setenv("WORKDAY_END", "09:00")
+
+    with pytest.raises(ValueError):
+        worker.load_config()
+
+
+def test_worker_reports_lookups_past_deadline_as_partial(monkeypatch):
+    class SlowProvider:
+        def __init__(self):
+            self.calls = []
+
+        def get_free_slots(self, email, start, end, slot_minutes, deadline=None):
+            self.calls.append(email)
+            time.sleep(0.3)
+            return []
+
+    provider = SlowProvider()
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(worker, "DEADLINE_RESERVE_MS", 0)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    event = {
+        "Records": [
+            {
+                "messageId": f"msg-{index}",
+                "body": json.dumps({"body": {"source": "email", "from": sender}}),
+            }
+            for index, sender in enumerate(["a@example.com", "b@example.com"])
+        ]
+    }
+    context = SimpleNamespace(get_remaining_time_in_millis=lambda: 200)
+
+    result = worker.handler(event, context=context)
+
+    assert provider.calls == ["a@example.com"]
+    assert result["status"] == "partial"
+    assert result["batchItemFailures"] == [{"itemIdentifier": "msg-1"}]
+    assert [item["record"]["messageId"] for item in result["records"]] == ["msg-0"]
+
+
+def test_async_worker_runs_lookups_concurrently(monkeypatch):
+    import asyncio
+
+    class AsyncProvider:
+        def __init__(self):
+            self.in_flight = 0
+            self.peak = 0
+
+        async def get_free_slots(self, email, start, end, slot_minutes, deadline=None):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if email == "bad@example.com":
+                raise RuntimeError("calendar down")
+            return [{"email": email}]
+
+    provider = AsyncProvider()
+    monkeypatch.setattr(worker, "_ASYNC_PROVIDER", provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(worker, "log_exception", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    senders = ["a@example.com", "bad@example.com", "c@example.com"]
+    event = {
+        "Records": [
+            {
+                "messageId": sender,
+                "body": json.dumps({"body": {"source": "email", "from": sender}}),
+            }
+            for sender in senders
+        ]
+    }
+
+    result = worker.async_handler(event, context={})
+    loop = worker._ASYNC_LOOP
+    worker.async_handler(event, context={})
+
+    assert worker._ASYNC_LOOP is loop
+    assert provider.peak == 3
+    assert result["status"] == "partial"
+    assert result["batchItemFailures"] == [{"itemIdentifier": "bad@example.com"}]
+    assert [r["payload"]["body"]["calendar_slots"] for r in result["records"]] == [
+        [{"email": "a@example.com"}],
+        [{"email": "c@example.com"}],
+    ]
+
+
+def test_worker_never_defers_records_sharing_a_lookup(monkeypatch):
+    provider = DummyProvider([])
+    visibility_calls = []
+
+    class FakeSqs:
+        def change_message_visibility_batch(self, QueueUrl, Entries):
+            visibility_calls.append((QueueUrl, Entries))
+
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "get_sqs_client", lambda: FakeSqs())
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+    monkeypatch.setenv("WORKER_SENDER_QUOTA", "1")
+
+    def record(message_id, sender):
+        return {
+            "messageId": message_id,
+            "receiptHandle": f"rh-{message_id}",
+            "eventSourceARN": "arn:aws:sqs:us-east-1:123456789012:jarvis",
+            "body": json.dumps(
+                {"body": {"source": "email", "from": sender, "subject": message_id}}
+            ),
+        }
+
+    event = {
+        "Records": [
+            record("h1", "heavy@example.com"),
+            record("h2", "heavy@example.com"),
+            record("h3", "heavy@example.com"),
+            record("l1", "light@example.com"),
+        ]
+    }
+
+    result = worker.handler(event, context={})
+
+    # The heavy sender's records coalesce into one lookup, so the quota of
+    # one lookup admits all of them.
+    assert result["batchItemFailures"] == []
+    assert [r["record"]["messageId"] for r in result["records"]] == [
+        "h1",
+        "h2",
+        "h3",
+        "l1",
+    ]
+    assert visibility_calls == []
+    # The heavy lookup serves three records, so the light one starts first.
+    assert [call[0] for call in provider.calls] == [
+        "light@example.com",
+        "heavy@example.com",
+    ]
+
+
+def _sender_record(message_id, sender, receives="1"):
+    return {
+        "messageId": message_id,
+        "receiptHandle": f"rh-{message_id}",
+        "eventSourceARN": "arn:aws:sqs:us-east-1:123456789012:jarvis",
+        "attributes": {"ApproximateReceiveCount": receives},
+        "body": json.dumps(
+            {"body": {"source": "email", "from": sender, "subject": message_id}}
+        ),
+    }
+
+
+def test_worker_defers_sender_over_quota_across_invocations(monkeypatch):
+    provider = DummyProvider([])
+    visibility_calls = []
+
+    class FakeSqs:
+        def change_message_visibility_batch(self, QueueUrl, Entries):
+            visibility_calls.append((QueueUrl, Entries))
+
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "get_sqs_client", lambda: FakeSqs())
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+    monkeypatch.setenv("WORKER_SENDER_QUOTA", "2")
+    monkeypatch.setenv("WORKER_DEFER_SECONDS", "45")
+
+    # The heavy sender fills the first batch; its one lookup always runs.
+    first = worker.handler(
+        {
+            "Records": [
+                _sender_record("h1", "heavy@example.com"),
+                _sender_record("h2", "heavy@example.com"),
+                _sender_record("h3", "heavy@example.com"),
+            ]
+        },
+        context={},
+    )
+    second = worker.handler(
+        {
+            "Records": [
+                _sender_record("h4", "heavy@example.com"),
+                _sender_record("h5", "heavy@example.com"),
+                _sender_record("l1", "light@example.com"),
+            ]
+        },
+        context={},
+    )
+    third = worker.handler(
+        {"Records": [_sender_record("h6", "heavy@example.com", receives="3")]},
+        context={},
+    )
+
+    assert first["batchItemFailures"] == []
+    assert second["batchItemFailures"] == [
+        {"itemIdentifier": "h4"},
+        {"itemIdentifier": "h5"},
+    ]
+    assert [r["record"]["messageId"] for r in second["records"]] == ["l1"]
+    assert visibility_calls == [
+        (
+            "https://sqs.us-east-1.amazonaws.com/123456789012/jarvis",
+            [
+                {"Id": "0", "ReceiptHandle": "rh-h4", "VisibilityTimeout": 45},
+                {"Id": "1", "ReceiptHandle": "rh-h5", "VisibilityTimeout": 45},
+            ],
+        )
+    ]
+    # Near the redrive limit, the record runs even though heavy is over quota.
+    assert third["batchItemFailures"] == []
+    assert [call[0] for call in provider.calls] == [
+        "heavy@example.com",
+        "light@example.com",
+        "heavy@example.com",
+    ]
+
+
+def test_worker_orders_recently_busy_senders_last(monkeypatch):
+    provider = DummyProvider([])
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    worker.handler(
+        {"Records": [_sender_record(f"h{n}", "heavy@example.com") for n in range(3)]},
+        context={},
+    )
+    provider.calls.clear()
+    result = worker.handler(
+        {
+            "Records": [
+                _sender_record("h3", "heavy@example.com"),
+                _sender_record("l1", "light@example.com"),
+            ]
+        },
+        context={},
+    )
+
+    assert result["batchItemFailures"] == []
+    assert [call[0] for call in provider.calls] == [
+        "light@example.com",
+        "heavy@example.com",
+    ]
+
+
+def test_worker_streams_results_to_sink(monkeypatch, tmp_path):
+    import gzip
+
+    provider = DummyProvider([{"start": "s", "end": "e"}])
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+    monkeypatch.setenv("RESULT_SINK", "local")
+    monkeypatch.setenv("RESULT_SINK_DIR", str(tmp_path))
+
+    event = {
+        "Records": [
+            {
+                "messageId": "m1",
+                "body": json.dumps({"body": {"source": "email", "from": "a@example.com"}}),
+            },
+            {"messageId": "m2", "body": json.dumps({"body": {"source": "webhook"}})},
+        ]
+    }
+
+    result = worker.handler(event, SimpleNamespace(aws_request_id="req-1"))
+
+    assert result["records"] == []
+    assert result["resultCount"] == 2
+    assert result["resultLocation"].endswith("/req-1.ndjson.gz")
+    with gzip.open(result["resultLocation"], "rt") as handle:
+        lines = [json.loads(line) for line in handle]
+    # Records without a lookup are written first; m1 follows its lookup.
+    assert [line["messageId"] for line in lines] == ["m2", "m1"]
+    assert lines[1]["payload"]["body"]["calendar_slots"] == [{"start": "s", "end": "e"}]
+
+
+def test_worker_writes_each_result_when_its_lookup_finishes(monkeypatch):
+    events = []
+
+    class RecordingProvider:
+        def get_free_slots(self, email, *args, **kwargs):
+            events.append(("lookup", email))
+            return []
+
+    class RecordingSink:
+        def write(self, payload):
+            events.append(("write", payload["messageId"]))
+
+        def close(self):
+            return "memory://results"
+
+        def abort(self):
+            events.append(("abort", None))
+
+    monkeypatch.setattr(worker, "get_provider", lambda: RecordingProvider())
+    monkeypatch.setattr(worker, "get_result_sink", lambda batch_id: RecordingSink())
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    event = {
+        "Records": [
+            {
+                "messageId": f"m{index}",
+                "body": json.dumps(
+                    {"body": {"source": "email", "from": f"user{index}@example.com"}}
+                ),
+            }
+            for index in range(3)
+        ]
+    }
+
+    result = worker.handler(event, context={})
+
+    assert result["resultCount"] == 3
+    assert events == [
+        ("lookup", "user0@example.com"),
+        ("write", "m0"),
+        ("lookup", "user1@example.com"),
+        ("write", "m1"),
+        ("lookup", "user2@example.com"),
+        ("write", "m2"),
+    ]
+
+
+def test_worker_skips_duplicate_idempotency_keys(monkeypatch):
+    provider = DummyProvider([])
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    def record(message_id, key, sender="a@example.com"):
+        return {
+            "messageId": message_id,
+            "body": json.dumps(
+                {
+                    "idempotencyKey": key,
+                    "body": {"source": "email", "from": sender},
+                }
+            ),
+        }
+
+    first = worker.handler(
+        {"Records": [record("m1", "email:1"), record("m2", "email:1")]}, context={}
+    )
+    second = worker.handler(
+        {"Records": [record("m3", "email:1"), record("m4", "email:2", "b@example.com")]},
+        context={},
+    )
+
+    assert [r["record"]["messageId"] for r in first["records"]] == ["m1"]
+    assert [r["record"]["messageId"] for r in second["records"]] == ["m4"]
+    assert first["batchItemFailures"] == second["batchItemFailures"] == []
+    assert [call[0] for call in provider.calls] == ["a@example.com", "b@example.com"]
+
+
+def test_worker_prefers_body_key_for_raw_envelopes(monkeypatch):
+    from utils.envelopes import build_raw_envelope
+    from utils.idempotency import stamp_idempotency_key
+
+    provider = DummyProvider([])
+    monkeypatch.setattr(worker, "get_provider", lambda: provider)
+    monkeypatch.setattr(worker, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setenv("DEFAULT_TIME_ZONE", "UTC")
+
+    def record(message_id, s3_key):
+        # Same Message-ID key, different S3 object: the raw bodies differ.
+        body = {
+            "source": "email",
+            "from": "a@example.com",
+            "idempotencyKey": "email:1",
+            "s3": {"bucket": "inbound", "key": s3_key},
+        }
+        envelope = stamp_idempotency_key(
+            build_raw_envelope(message_id, json.dumps(body), False)
+        )
+        return {"messageId": message_id, "body": json.dumps(envelope)}
+
+    result = worker.handler(
+        {"Records": [record("m1", "ses-inbound/a"), record("m2", "ses-inbound/b")]},
+        context={},
+    )
+
+    assert [r["record"]["messageId"] for r in result["records"]] == ["m1"]
+    assert result["batchItemFailures"] == []
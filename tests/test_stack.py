@@ -1,4 +1,5 @@
 import aws_cdk as cdk
+import pytest
 from aws_cdk.assertions import Match, Template
 
 from jarvis_ingress.jarvis_ingress_stack import JarvisIngressStack
@@ -13,7 +14,7 @@ def test_stack_resources():
     )
     template = Template.from_stack(stack)
 
-    template.resource_count_is("AWS::Lambda::Function", 7)
+    template.resource_count_is("AWS::Lambda::Function", 8)
     template.resource_count_is("AWS::ApiGateway::RestApi", 1)
     template.resource_count_is("AWS::ApiGateway::Authorizer", 1)
 
@@ -39,6 +40,13 @@ def test_stack_resources():
         },
     )
 
+    template.has_resource_properties(
+        "AWS::Events::Rule",
+        {
+            "ScheduleExpression": "rate(1 minute)",
+        },
+    )
+
     template.has_output(
         "IngressUrl",
         {
@@ -51,3 +59,338 @@ def test_stack_resources():
             "Value": Match.any_value(),
         },
     )
+
+
+def test_stack_authorizer_cache_ttl_context():
+    app = cdk.App(context={"authorizerCacheTtlSeconds": "300"})
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource_properties(
+        "AWS::ApiGateway::Authorizer",
+        {
+            "AuthorizerResultTtlInSeconds": 300,
+            "IdentitySource": "method.request.header.x-jarvis-timestamp,method.request.header.x-jarvis-signature",
+        },
+    )
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Handler": "handlers.authorizer.authorizer.handler",
+            "Environment": {
+                "Variables": Match.object_like(
+                    {"AUTHORIZER_CACHEABLE_POLICIES": "true"}
+                ),
+            },
+        },
+    )
+
+
+def test_stack_fifo_ingress_queue_context():
+    app = cdk.App(context={"ingressQueueFifo": "true"})
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource_properties(
+        "AWS::SQS::Queue",
+        {
+            "FifoQueue": True,
+            "DeduplicationScope": "messageGroup",
+            "FifoThroughputLimit": "perMessageGroupId",
+        },
+    )
+    template.resource_count_is("AWS::SQS::QueuePolicy", 0)
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Handler": "handlers.router.ingress_router.handler",
+            "Environment": {
+                "Variables": Match.object_like({"INGRESS_QUEUE_FIFO": "true"}),
+            },
+        },
+    )
+
+
+def test_stack_priority_lanes_context():
+    app = cdk.App(context={"priorityLanes": "true"})
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.resource_count_is("AWS::SQS::Queue", 3)
+    template.resource_count_is("AWS::Lambda::EventSourceMapping", 2)
+    template.has_resource_properties(
+        "AWS::Lambda::EventSourceMapping",
+        {"ScalingConfig": {"MaximumConcurrency": 10}},
+    )
+    template.has_resource_properties(
+        "AWS::Lambda::EventSourceMapping",
+        {"ScalingConfig": {"MaximumConcurrency": 2}},
+    )
+
+
+def test_stack_direct_sqs_integration_context():
+    app = cdk.App(context={"ingressIntegration": "sqs"})
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.resource_count_is("AWS::Lambda::Function", 6)
+    template.resource_count_is("AWS::Events::Rule", 0)
+    template.has_resource_properties(
+        "AWS::ApiGateway::Method",
+        {
+            "AuthorizationType": "CUSTOM",
+            "HttpMethod": "POST",
+            "Integration": Match.object_like(
+                {
+                    "Type": "AWS",
+                    "IntegrationHttpMethod": "POST",
+                    "PassthroughBehavior": "NEVER",
+                    "RequestTemplates": {
+                        "application/json": Match.string_like_regexp(
+                            "Action=SendMessage"
+                        ),
+                    },
+                }
+            ),
+        },
+    )
+    outputs = template.find_outputs("IngressBatchUrl")
+    assert outputs == {}
+
+
+@pytest.mark.parametrize(
+    "context",
+    [
+        {"ingressIntegration": "sqs", "apiType": "http"},
+        {"ingressIntegration": "sqs", "priorityLanes": "true"},
+        {"ingressIntegration": "sqs", "ingressQueueFifo": "true"},
+    ],
+)
+def test_stack_direct_sqs_rejects_unsupported_context(context):
+    app = cdk.App(context=context)
+
+    with pytest.raises(ValueError):
+        JarvisIngressStack(
+            app,
+            "JarvisIngressStack",
+            env=cdk.Environment(region="us-east-1"),
+        )
+
+
+def test_stack_http_api_context():
+    app = cdk.App(context={"apiType": "http", "authorizerCacheTtlSeconds": "300"})
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.resource_count_is("AWS::ApiGateway::RestApi", 0)
+    template.resource_count_is("AWS::ApiGatewayV2::Api", 1)
+    template.resource_count_is("AWS::ApiGatewayV2::Route", 2)
+    template.has_resource_properties(
+        "AWS::ApiGatewayV2::Authorizer",
+        {
+            "AuthorizerType": "REQUEST",
+            "AuthorizerPayloadFormatVersion": "2.0",
+            "EnableSimpleResponses": True,
+            "AuthorizerResultTtlInSeconds": 300,
+            "IdentitySource": [
+                "$request.header.x-jarvis-timestamp",
+                "$request.header.x-jarvis-signature",
+                "$context.routeKey",
+            ],
+        },
+    )
+    template.has_resource_properties(
+        "AWS::ApiGatewayV2::Integration",
+        {"PayloadFormatVersion": "2.0"},
+    )
+    template.has_resource_properties(
+        "AWS::ApiGatewayV2::Stage",
+        {"StageName": "dev", "AutoDeploy": True},
+    )
+
+
+def test_stack_worker_event_source_context():
+    app = cdk.App(
+        context={
+            "workerBatchSize": "50",
+            "workerMaxBatchingWindowSeconds": "5",
+            "workerMaxConcurrency": "4",
+        }
+    )
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource_properties(
+        "AWS::Lambda::EventSourceMapping",
+        {
+            "BatchSize": 50,
+            "MaximumBatchingWindowInSeconds": 5,
+            "ScalingConfig": {"MaximumConcurrency": 4},
+            "FunctionResponseTypes": ["ReportBatchItemFailures"],
+        },
+    )
+
+
+def test_stack_worker_engine_context():
+    app = cdk.App(context={"workerEngine": "asyncio", "workerAsyncConcurrency": "50"})
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Handler": "handlers.worker.worker.async_handler",
+            "Environment": {
+                "Variables": Match.object_like({"WORKER_ASYNC_CONCURRENCY": "50"})
+            },
+        },
+    )
+
+
+def test_stack_worker_sender_fair_share_context():
+    app = cdk.App(
+        context={
+            "workerSenderQuota": "2",
+            "workerSenderWeights": '{"vip@example.com": 3}',
+        }
+    )
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Handler": "handlers.worker.worker.handler",
+            "Environment": {
+                "Variables": Match.object_like(
+                    {
+                        "WORKER_SENDER_QUOTA": "2",
+                        "WORKER_SENDER_WEIGHTS": '{"vip@example.com":3}',
+                        "WORKER_DEFER_SECONDS": "30",
+                        "WORKER_SENDER_HALF_LIFE_SECONDS": "60",
+                    }
+                )
+            },
+        },
+    )
+
+
+def test_stack_worker_process_pool_is_opt_in():
+    default = Template.from_stack(
+        JarvisIngressStack(
+            cdk.App(),
+            "JarvisIngressStack",
+            env=cdk.Environment(region="us-east-1"),
+        )
+    )
+    pooled = Template.from_stack(
+        JarvisIngressStack(
+            cdk.App(context={"workerProcessPoolSize": "2"}),
+            "JarvisIngressStack",
+            env=cdk.Environment(region="us-east-1"),
+        )
+    )
+
+    for function in default.find_resources("AWS::Lambda::Function").values():
+        variables = function["Properties"].get("Environment", {}).get("Variables", {})
+        assert "PROCESS_POOL_SIZE" not in variables
+    pooled.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Handler": "handlers.worker.worker.handler",
+            "MemorySize": 3538,
+            "Environment": {
+                "Variables": Match.object_like({"PROCESS_POOL_SIZE": "2"})
+            },
+        },
+    )
+    with pytest.raises(ValueError):
+        JarvisIngressStack(
+            cdk.App(context={"workerProcessPoolSize": "1"}),
+            "JarvisIngressStack",
+            env=cdk.Environment(region="us-east-1"),
+        )
+
+
+def test_stack_worker_sender_quota_defaults_off():
+    app = cdk.App()
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Handler": "handlers.worker.worker.handler",
+            "Environment": {
+                "Variables": Match.object_like({"WORKER_SENDER_QUOTA": "0"})
+            },
+        },
+    )
+
+
+def test_stack_worker_result_sink_context():
+    app = cdk.App(context={"workerResultSink": "s3"})
+    stack = JarvisIngressStack(
+        app,
+        "JarvisIngressStack",
+        env=cdk.Environment(region="us-east-1"),
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Handler": "handlers.worker.worker.handler",
+            "Environment": {
+                "Variables": Match.object_like(
+                    {"RESULT_SINK": "s3", "RESULT_SINK_PREFIX": "worker-results/"}
+                )
+            },
+        },
+    )
+
+
+def test_stack_rejects_unknown_calendar_query_mode():
+    app = cdk.App(context={"googleCalendarQueryMode": "scrape"})
+    with pytest.raises(ValueError):
+        JarvisIngressStack(
+            app,
+            "JarvisIngressStack",
+            env=cdk.Environment(region="us-east-1"),
+        )
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from utils.async_http import AsyncHttpClient
+
+
+async def _serve(routes):
+    """Local HTTP/1.1 stand-in; routes map a path to raw response bytes."""
+    requests = []
+
+    async def handle(reader, writer):
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head:
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            path = lines[0].split(" ")[1]
+            length = 0
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            body = await reader.readexactly(length)
+            requests.append((lines[0], body))
+            response = routes[path]
+            if response is None:
+                await asyncio.sleep(5)
+                return
+            writer.write(response)
+            await writer.drain()
+            if b"Connection: close" in response:
+                writer.close()
+                return
+
+    async def guarded(reader, writer):
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(guarded, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}", requests
+
+
+def test_keep_alive_connection_is_reused():
+    async def scenario():
+        server, base, requests = await _serve(
+            {"/ok": b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"}
+        )
+        client = AsyncHttpClient()
+        first = await client.request("GET", f"{base}/ok")
+        second = await client.request("POST", f"{base}/ok", body=b"data")
+        await client.close()
+        server.close()
+        return client, first, second, requests
+
+    client, first, second, requests = asyncio.run(scenario())
+
+    assert (first.status, first.body) == (200, b"ok")
+    assert second.body == b"ok"
+    assert client.connections_opened == 1
+    assert requests[1] == ("POST /ok HTTP/1.1", b"data")
+
+
+def test_chunked_body_and_connection_close():
+    async def scenario():
+        server, base, _ = await _serve(
+            {
+                "/chunked": (
+                    b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                    b"3\r\nabc\r\n4;ext=1\r\ndefg\r\n0\r\n\r\n"
+                ),
+                "/close": (
+                    b"HTTP/1.1 200 OK\r\nContent-Length: 1\r\n"
+                    b"Connection: close\r\n\r\nx"
+                ),
+            }
+        )
+        client = AsyncHttpClient()
+        chunked = await client.request("GET", f"{base}/chunked")
+        closed = await client.request("GET", f"{base}/close")
+        again = await client.request("GET", f"{base}/chunked")
+        await client.close()
+        server.close()
+        return client, chunked, closed, again
+
+    client, chunked, closed, again = asyncio.run(scenario())
+
+    assert chunked.body == b"abcdefg"
+    assert chunked.headers["transfer-encoding"] == "chunked"
+    assert closed.body == b"x"
+    assert again.body == b"abcdefg"
+    assert client.connections_opened == 2
+
+
+def test_request_timeout_discards_connection():
+    async def scenario():
+        server, base, _ = await _serve(
+            {"/slow": None, "/ok": b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"}
+        )
+        client = AsyncHttpClient()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.request("GET", f"{base}/slow", timeout=0.05)
+        response = await client.request("GET", f"{base}/ok")
+        await client.close()
+        server.close()
+        return client, response
+
+    client, response = asyncio.run(scenario())
+
+    assert response.status == 200
+    assert client.connections_opened == 2
+
+
+def test_rejects_unsupported_scheme():
+    with pytest.raises(ValueError):
+        asyncio.run(AsyncHttpClient().request("GET", "ftp://example.com/file"))
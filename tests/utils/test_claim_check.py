@@ -0,0 +1,62 @@
+import io
+import json
+
+from utils import claim_check
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+def test_offload_large_body_keeps_small_messages_inline(monkeypatch):
+    monkeypatch.setenv("CLAIM_CHECK_BUCKET", "bucket")
+    monkeypatch.setenv("CLAIM_CHECK_THRESHOLD_BYTES", "1000")
+    monkeypatch.setattr(
+        claim_check, "get_s3_client", lambda: (_ for _ in ()).throw(AssertionError("s3 used"))
+    )
+    envelope = {"requestId": "req-1", "body": {"source": "email"}}
+    message_body = json.dumps(envelope)
+
+    assert claim_check.offload_large_body(envelope, message_body) is message_body
+
+
+def test_offload_large_body_round_trips_through_s3(monkeypatch):
+    fake_s3 = FakeS3()
+    monkeypatch.setenv("CLAIM_CHECK_BUCKET", "bucket")
+    monkeypatch.setenv("CLAIM_CHECK_THRESHOLD_BYTES", "100")
+    monkeypatch.setattr(claim_check, "get_s3_client", lambda: fake_s3)
+    body = {"source": "email", "text": "x" * 500}
+    envelope = {"requestId": "req-1", "body": body}
+
+    pointer = json.loads(claim_check.offload_large_body(envelope, json.dumps(envelope)))
+
+    assert "body" not in pointer
+    assert pointer["requestId"] == "req-1"
+    assert pointer["source"] == "email"
+    assert pointer["bodyRef"]["bucket"] == "bucket"
+    assert pointer["bodyRef"]["key"].startswith("ingress-payloads/req-1/")
+    claim_check.fetch_offloaded_body(pointer)
+    assert pointer["body"] == body
+
+
+def test_offload_large_body_keeps_raw_body_unparsed(monkeypatch):
+    fake_s3 = FakeS3()
+    monkeypatch.setenv("CLAIM_CHECK_BUCKET", "bucket")
+    monkeypatch.setenv("CLAIM_CHECK_THRESHOLD_BYTES", "100")
+    monkeypatch.setattr(claim_check, "get_s3_client", lambda: fake_s3)
+    raw_body = "not json " * 50
+    envelope = {"requestId": "req-1", "rawBody": raw_body, "isBase64Encoded": False}
+
+    pointer = json.loads(claim_check.offload_large_body(envelope, json.dumps(envelope)))
+
+    assert "rawBody" not in pointer
+    assert pointer["bodyRef"]["field"] == "rawBody"
+    claim_check.fetch_offloaded_body(pointer)
+    assert pointer["rawBody"] == raw_body
@@ -7,10 +7,10 @@ def test_get_secret_cache_hit(monkeypatch):
     crypto_utils.SECRET_CACHE.clear()
     crypto_utils.SECRET_CACHE["name"] = "cached"
 
-    def fail_client(service_name):
-        raise AssertionError("boto3.client should not be called on cache hit")
+    def fail_client():
+        raise AssertionError("no client should be needed on a cache hit")
 
-    monkeypatch.setattr(crypto_utils.boto3, "client", fail_client)
+    monkeypatch.setattr(crypto_utils, "get_secretsmanager_client", fail_client)
 
     assert crypto_utils.get_secret("name") == "cached"
 
@@ -22,7 +22,7 @@ def test_get_secret_missing_secret_string_raises(monkeypatch):
         def get_secret_value(self, SecretId):
             return {"SecretString": ""}
 
-    monkeypatch.setattr(crypto_utils.boto3, "client", lambda service: FakeClient())
+    monkeypatch.setattr(crypto_utils, "get_secretsmanager_client", lambda: FakeClient())
 
     with pytest.raises(ValueError):
         crypto_utils.get_secret("name")
@@ -31,3 +31,59 @@ def test_get_secret_missing_secret_string_raises(monkeypatch):
 def test_hmac_sha256_hex():
     result = crypto_utils.hmac_sha256_hex("key", "message")
     assert result == "6e9ef29b75fffc5b7abae527d58fdadb2fe42e7219011976917343065f58ed4a"
+
+
+def test_get_secret_caches_per_version_stage(monkeypatch):
+    crypto_utils.SECRET_CACHE.clear()
+    requests = []
+
+    class FakeClient:
+        def get_secret_value(self, **kwargs):
+            requests.append(kwargs)
+            return {"SecretString": kwargs.get("VersionStage", "default")}
+
+    monkeypatch.setattr(crypto_utils, "get_secretsmanager_client", lambda: FakeClient())
+
+    assert crypto_utils.get_secret("name", version_stage="AWSPREVIOUS") == "AWSPREVIOUS"
+    assert crypto_utils.get_secret("name", version_stage="AWSPREVIOUS") == "AWSPREVIOUS"
+    assert crypto_utils.get_secret("name") == "default"
+    assert requests == [
+        {"SecretId": "name", "VersionStage": "AWSPREVIOUS"},
+        {"SecretId": "name"},
+    ]
+
+
+def test_signing_key_matches_hmac_sha256_hex():
+    key = crypto_utils.SigningKey("key")
+    assert key.sign_hex("message") == crypto_utils.hmac_sha256_hex("key", "message")
+    assert key.sign_hex("other") == crypto_utils.hmac_sha256_hex("key", "other")
+
+
+def test_key_ring_loads_current_and_previous_versions_once():
+    calls = []
+
+    def loader(name, version_stage, force_refresh):
+        calls.append((name, version_stage))
+        return {"AWSCURRENT": "new", "AWSPREVIOUS": "old"}[version_stage]
+
+    ring = crypto_utils.KeyRing(loader, ttl_seconds=60)
+
+    keys = ring.keys("secret")
+    assert [key.version_stage for key in keys] == ["AWSCURRENT", "AWSPREVIOUS"]
+    assert keys[1].sign_hex("m") == crypto_utils.hmac_sha256_hex("old", "m")
+    assert ring.keys("secret") is keys
+    assert calls == [("secret", "AWSCURRENT"), ("secret", "AWSPREVIOUS")]
+
+
+def test_key_ring_skips_missing_previous_version():
+    def loader(name, version_stage, force_refresh):
+        if version_stage == "AWSPREVIOUS":
+            raise RuntimeError("not found")
+        return "only"
+
+    ring = crypto_utils.KeyRing(loader, ttl_seconds=0)
+
+    keys = ring.keys("secret", key_id="acme")
+    assert len(keys) == 1
+    assert keys[0].key_id == "acme"
+    assert ring.keys("secret") is not keys
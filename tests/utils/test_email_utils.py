@@ -8,6 +8,7 @@ def test_parse_raw_email_plain_text():
         b"From: sender@example.com\r\n"
         b"To: receiver@example.com\r\n"
         b"Subject: Hello\r\n"
+        b"Message-ID: <abc@mail.example.com>\r\n"
         b"\r\n"
         b"Plain text body."
     )
@@ -17,6 +18,7 @@ def test_parse_raw_email_plain_text():
     assert parsed["from"] == "sender@example.com"
     assert parsed["to"] == "receiver@example.com"
     assert parsed["subject"] == "Hello"
+    assert parsed["message_id"] == "<abc@mail.example.com>"
     assert "Plain text body." in parsed["text"]
 
 
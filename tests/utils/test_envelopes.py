@@ -0,0 +1,45 @@
+import base64
+import io
+import json
+
+from utils import claim_check, envelopes
+
+
+def test_envelope_body_decodes_raw_envelope():
+    raw = base64.b64encode(json.dumps({"source": "email"}).encode()).decode()
+    envelope = envelopes.build_raw_envelope("req-1", raw, True)
+
+    assert envelopes.envelope_source(envelope) == "email"
+    assert envelope == {"requestId": "req-1", "body": {"source": "email"}}
+
+
+def test_envelope_body_wraps_invalid_json():
+    envelope = envelopes.build_raw_envelope("req-1", "plain text", False)
+
+    assert envelopes.envelope_body(envelope) == {"raw": "plain text"}
+    assert envelopes.envelope_source(envelope) is None
+
+
+def test_envelope_source_skips_fetch_for_parsed_pointer(monkeypatch):
+    monkeypatch.setattr(
+        claim_check, "get_s3_client", lambda: (_ for _ in ()).throw(AssertionError("s3 used"))
+    )
+    pointer = {"requestId": "req-1", "bodyRef": {"bucket": "b", "key": "k", "field": "body"}}
+
+    assert envelopes.envelope_source(pointer) is None
+
+
+def test_envelope_source_fetches_raw_pointer(monkeypatch):
+    class FakeS3:
+        def get_object(self, Bucket, Key):
+            return {"Body": io.BytesIO(b'{"source": "webhook"}')}
+
+    monkeypatch.setattr(claim_check, "get_s3_client", lambda: FakeS3())
+    pointer = {
+        "requestId": "req-1",
+        "isBase64Encoded": False,
+        "bodyRef": {"bucket": "b", "key": "k", "field": "rawBody"},
+    }
+
+    assert envelopes.envelope_source(pointer) == "webhook"
+    assert pointer["body"] == {"source": "webhook"}
@@ -0,0 +1,81 @@
+import pytest
+
+from utils.fair_share import (
+    SenderUsage,
+    fair_schedule,
+    parse_sender_weights,
+    queue_url_from_arn,
+)
+
+
+def test_fair_schedule_interleaves_heavy_sender():
+    senders = ["heavy", "heavy", "heavy", "light", None, "other"]
+
+    schedule = fair_schedule(senders, weights={}, quota=0)
+
+    assert schedule.order == [4, 0, 3, 5, 1, 2]
+    assert schedule.deferred == []
+
+
+def test_fair_schedule_caps_by_weighted_quota_and_keeps_pinned():
+    senders = ["heavy"] * 4 + ["vip"] * 4
+
+    schedule = fair_schedule(
+        senders,
+        weights={"vip": 2.0},
+        quota=1,
+        pinned=[False, False, False, True, False, False, False, False],
+    )
+
+    assert schedule.deferred == [1, 2, 6, 7]
+    assert schedule.order == [4, 0, 5, 3]
+
+
+def test_fair_schedule_charges_usage_across_calls():
+    now = [0.0]
+    usage = SenderUsage(half_life_seconds=10, clock=lambda: now[0])
+
+    first = fair_schedule(["heavy"], weights={}, quota=2, costs=[3], usage=usage)
+    second = fair_schedule(
+        ["heavy", "light"], weights={}, quota=2, costs=[1, 1], usage=usage
+    )
+    now[0] = 20.0  # Two half-lives: heavy's usage of 3 decays to 0.75.
+    third = fair_schedule(
+        ["light", "heavy"], weights={}, quota=2, costs=[1, 1], usage=usage
+    )
+
+    assert first == ([0], [])
+    assert second == ([1], [0])
+    assert usage.get("light") == pytest.approx(1.25)
+    assert third.deferred == []
+    assert third.order == [0, 1]
+    assert usage.get("HEAVY") == pytest.approx(1.75)
+
+
+def test_sender_usage_evicts_oldest_senders():
+    usage = SenderUsage(half_life_seconds=60, max_senders=2)
+    for sender in ("a", "b", "c"):
+        usage.add(sender, 1)
+
+    assert usage.get("a") == 0
+    assert usage.get("c") == pytest.approx(1, rel=1e-3)
+    with pytest.raises(ValueError):
+        SenderUsage(half_life_seconds=0)
+
+
+def test_parse_sender_weights_validates():
+    assert parse_sender_weights('{"VIP@example.com": 2}') == {"vip@example.com": 2.0}
+    assert parse_sender_weights(None) == {}
+    with pytest.raises(ValueError):
+        parse_sender_weights({"a@example.com": 0})
+    with pytest.raises(ValueError):
+        parse_sender_weights("[1]")
+
+
+def test_queue_url_from_arn():
+    assert (
+        queue_url_from_arn("arn:aws:sqs:us-east-1:123456789012:jarvis-queue")
+        == "https://sqs.us-east-1.amazonaws.com/123456789012/jarvis-queue"
+    )
+    with pytest.raises(ValueError):
+        queue_url_from_arn("arn:aws:sns:us-east-1:123456789012:topic")
@@ -1,7 +1,17 @@
 import json
 from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
 
 import utils.calendar.google as google
+from utils.lambda_time import Deadline, DeadlineExceeded
+
+
+@pytest.fixture(autouse=True)
+def _clear_token_cache(monkeypatch):
+    monkeypatch.setattr(google, "_TOKEN_CACHE", google.OrderedDict())
+    monkeypatch.setattr(google, "_TOKEN_REFRESHING", set())
 
 
 class DummyResponse:
@@ -23,10 +33,11 @@ class DummyResponse:
 
 
 def test_google_provider_slots(monkeypatch):
+    monkeypatch.setenv("GOOGLE_CALENDAR_QUERY_MODE", "events")
     monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET_NAME", "client-secret")
     monkeypatch.setenv("GOOGLE_OAUTH_USER_SECRET_PREFIX", "user-secret/")
 
-    def fake_get_secret(name: str) -> str:
+    def fake_get_secret(name: str, **kwargs) -> str:
         if name == "client-secret":
             return json.dumps({"client_id": "id", "client_secret": "secret"})
         if name == "user-secret/user@example.com":
@@ -123,3 +134,213 @@ def test_google_provider_pagination_limit(monkeypatch):
     assert total_events == 0
     assert pages_fetched == 4
     assert len(request_urls) == 4
+
+
+def test_google_provider_timeouts_follow_deadline(monkeypatch):
+    timeouts = []
+
+    def fake_urlopen(request, *args, **kwargs):
+        timeouts.append(kwargs["timeout"])
+        return DummyResponse(200, {"items": []})
+
+    monkeypatch.setattr(google, "urlopen", fake_urlopen)
+    monkeypatch.setattr(google, "log_json", lambda *args, **kwargs: None)
+
+    start = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)
+    google._fetch_busy_intervals(
+        access_token="token",
+        calendar_id="primary",
+        start=start,
+        end=end,
+        time_zone="UTC",
+        deadline=Deadline.from_context(
+            SimpleNamespace(get_remaining_time_in_millis=lambda: 3000)
+        ),
+    )
+    assert 2 < timeouts[0] <= 2.5
+
+    with pytest.raises(DeadlineExceeded):
+        google._fetch_busy_intervals(
+            access_token="token",
+            calendar_id="primary",
+            start=start,
+            end=end,
+            time_zone="UTC",
+            deadline=Deadline.from_context(
+                SimpleNamespace(get_remaining_time_in_millis=lambda: 200)
+            ),
+        )
+    assert len(timeouts) == 1
+
+
+def test_async_google_provider_shares_one_connection(monkeypatch):
+    import asyncio
+
+    from utils.calendar.google_async import AsyncGoogleCalendarProvider
+
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET_NAME", "client-secret")
+    monkeypatch.setenv("GOOGLE_OAUTH_USER_SECRET_PREFIX", "user-secret/")
+    secrets = {
+        "client-secret": {"client_id": "id", "client_secret": "secret"},
+        "user-secret/user@example.com": {"refresh_token": "refresh"},
+    }
+    monkeypatch.setattr(
+        google, "get_secret_cached", lambda name, **kwargs: json.dumps(secrets[name])
+    )
+    monkeypatch.setattr(google, "log_json", lambda *args, **kwargs: None)
+
+    token = json.dumps({"access_token": "token"}).encode()
+    free_busy = json.dumps(
+        {
+            "calendars": {
+                "primary": {
+                    "busy": [
+                        {"start": "2024-01-01T09:00:00Z", "end": "2024-01-01T10:00:00Z"}
+                    ]
+                }
+            }
+        }
+    ).encode()
+    paths = []
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode()
+                request_line = head.split("\r\n")[0]
+                paths.append(request_line.split(" ")[1])
+                length = int(head.lower().split("content-length: ")[1].split()[0])
+                await reader.readexactly(length)
+                body = token if request_line.startswith("POST /token") else free_busy
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body
+                )
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        base = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        monkeypatch.setattr(google, "TOKEN_URL", f"{base}/token")
+        monkeypatch.setattr(google, "CALENDAR_API_BASE", f"{base}/calendar/v3")
+        provider = AsyncGoogleCalendarProvider()
+        start = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+        end = datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)
+        first = await provider.get_free_slots("user@example.com", start, end, 60)
+        second = await provider.get_free_slots("user@example.com", start, end, 60)
+        await provider.client.close()
+        server.close()
+        return provider, first, second
+
+    provider, first, second = asyncio.run(scenario())
+
+    assert first == second == [
+        {"start": "2024-01-01T10:00:00+00:00", "end": "2024-01-01T11:00:00+00:00"}
+    ]
+    assert paths[0] == "/token"
+    # The second lookup reuses the cached access token.
+    assert paths[1:] == ["/calendar/v3/freeBusy", "/calendar/v3/freeBusy"]
+    assert provider.client.connections_opened == 1
+
+
+def test_google_provider_free_busy_queries_all_calendars(monkeypatch):
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET_NAME", "client-secret")
+    monkeypatch.setenv("GOOGLE_OAUTH_USER_SECRET_PREFIX", "user-secret/")
+    secrets = {
+        "client-secret": {"client_id": "id", "client_secret": "secret"},
+        "user-secret/user@example.com": {
+            "refresh_token": "refresh",
+            "calendar_ids": ["primary", "team@example.com"],
+            "time_zone": "UTC",
+        },
+    }
+    monkeypatch.setattr(
+        google, "get_secret_cached", lambda name, **kwargs: json.dumps(secrets[name])
+    )
+    monkeypatch.setattr(google, "log_json", lambda *args, **kwargs: None)
+    free_busy = {
+        "calendars": {
+            "primary": {
+                "busy": [{"start": "2024-01-01T09:00:00Z", "end": "2024-01-01T09:30:00Z"}]
+            },
+            "team@example.com": {
+                "busy": [{"start": "2024-01-01T10:00:00Z", "end": "2024-01-01T12:00:00Z"}]
+            },
+        }
+    }
+    responses = [
+        DummyResponse(200, {"access_token": "token"}),
+        DummyResponse(200, free_busy),
+        DummyResponse(
+            200,
+            {"calendars": {"primary": {"errors": [{"reason": "notFound"}]}}},
+        ),
+    ]
+    requests = []
+
+    def fake_urlopen(request, *args, **kwargs):
+        requests.append(request)
+        return responses.pop(0)
+
+    monkeypatch.setattr(google, "urlopen", fake_urlopen)
+
+    provider = google.GoogleCalendarProvider()
+    start = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)
+    slots = provider.get_free_slots("user@example.com", start, end, 30)
+
+    assert slots == [
+        {"start": "2024-01-01T09:30:00+00:00", "end": "2024-01-01T10:00:00+00:00"}
+    ]
+    assert requests[1].full_url == "https://www.googleapis.com/calendar/v3/freeBusy"
+    assert json.loads(requests[1].data)["items"] == [
+        {"id": "primary"},
+        {"id": "team@example.com"},
+    ]
+    with pytest.raises(ValueError, match="notFound"):
+        provider.get_free_slots("user@example.com", start, end, 30)
+
+
+def test_access_token_cache_honors_expiry_and_refreshes_early(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(google.time, "monotonic", lambda: now[0])
+    exchanges = []
+
+    def fake_exchange(settings, deadline=None):
+        exchanges.append(settings["refresh_token"])
+        return {"access_token": f"token-{len(exchanges)}", "expires_in": 3600}
+
+    monkeypatch.setattr(google, "_exchange_refresh_token", fake_exchange)
+    settings = {"client_id": "id", "client_secret": "s", "refresh_token": "r1"}
+
+    assert google._access_token_for(settings) == "token-1"
+    assert google._access_token_for(settings) == "token-1"
+    # Another refresh token for the same client gets its own entry.
+    assert google._access_token_for({**settings, "refresh_token": "r2"}) == "token-2"
+    assert exchanges == ["r1", "r2"]
+
+    # Inside the refresh-ahead window: served from cache, refreshed in background.
+    now[0] += 3600 - 60 - 200
+    threads = []
+
+    class DeferredThread:
+        def __init__(self, target, args, daemon):
+            threads.append((target, args))
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(google.threading, "Thread", DeferredThread)
+    assert google._access_token_for(settings) == "token-1"
+    assert google._access_token_for(settings) == "token-1"
+    assert len(threads) == 1
+    target, args = threads[0]
+    target(*args)
+    assert google._access_token_for(settings) == "token-3"
+
+    # Past expires_in minus the margin, a lookup waits for a fresh token.
+    now[0] += 3600
+    assert google._access_token_for(settings) == "token-4"
+    assert exchanges == ["r1", "r2", "r1", "r1"]
@@ -0,0 +1,68 @@
+import pytest
+
+from utils import idempotency
+from utils.idempotency import (
+    DedupeStore,
+    LruDedupeCache,
+    SqliteDedupeBackend,
+    body_idempotency_key,
+    email_idempotency_key,
+    stamp_idempotency_key,
+)
+
+
+def test_keys_are_stable_and_normalized():
+    assert email_idempotency_key("<ABC@mail.example.com>") == email_idempotency_key(
+        " abc@mail.example.com "
+    )
+    assert email_idempotency_key("") == ""
+    assert body_idempotency_key({"b": 1, "a": 2}) == body_idempotency_key({"a": 2, "b": 1})
+    assert body_idempotency_key({"a": 1}) != body_idempotency_key({"a": 2})
+
+
+def test_stamp_prefers_existing_key():
+    assert stamp_idempotency_key({"body": {"idempotencyKey": "email:x"}})[
+        "idempotencyKey"
+    ] == "email:x"
+    raw = stamp_idempotency_key({"rawBody": "{}", "isBase64Encoded": False})
+    assert raw["idempotencyKey"] == body_idempotency_key("{}")
+
+
+def test_lru_cache_evicts_oldest_and_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(idempotency.time, "time", lambda: now[0])
+    cache = LruDedupeCache(max_entries=2)
+    cache.mark("a", 60)
+    cache.mark("b", 60)
+    assert cache.seen("a")
+    cache.mark("c", 60)
+
+    assert not cache.seen("b")
+    assert cache.seen("a") and cache.seen("c")
+    now[0] += 61
+    assert not cache.seen("a")
+
+
+def test_store_reads_through_shared_sqlite_backend(tmp_path):
+    path = str(tmp_path / "dedupe.sqlite3")
+    first = DedupeStore(ttl_seconds=60, shared=SqliteDedupeBackend(path))
+    second = DedupeStore(ttl_seconds=60, shared=SqliteDedupeBackend(path))
+
+    assert not second.seen("email:1")
+    first.mark("email:1")
+
+    assert second.seen("email:1")
+    assert second.local.seen("email:1")
+
+
+def test_dedupe_store_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("DEDUPE_BACKEND", "sqlite")
+    monkeypatch.setenv("DEDUPE_SQLITE_PATH", str(tmp_path / "d.sqlite3"))
+    monkeypatch.setenv("DEDUPE_TTL_SECONDS", "120")
+    store = idempotency.dedupe_store_from_env()
+    assert isinstance(store.shared, SqliteDedupeBackend)
+    assert store.ttl_seconds == 120
+
+    monkeypatch.setenv("DEDUPE_BACKEND", "redis")
+    with pytest.raises(ValueError):
+        idempotency.dedupe_store_from_env()
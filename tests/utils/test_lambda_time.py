@@ -1,6 +1,14 @@
 from types import SimpleNamespace
 
-from utils.lambda_time import http_timeout_seconds, remaining_ms
+import pytest
+
+from utils.lambda_time import (
+    Deadline,
+    DeadlineExceeded,
+    call_timeout,
+    http_timeout_seconds,
+    remaining_ms,
+)
 
 
 def test_remaining_ms_uses_context_method():
@@ -21,3 +29,23 @@ def test_http_timeout_seconds_respects_cap_and_floor():
 
     high_context = SimpleNamespace(get_remaining_time_in_millis=lambda: 60000)
     assert http_timeout_seconds(high_context, cap=5, reserve_s=1, floor=1) == 5
+
+
+def test_deadline_timeout_subtracts_reserve_and_caps():
+    deadline = Deadline.from_context(
+        SimpleNamespace(get_remaining_time_in_millis=lambda: 5000), reserve_ms=1000
+    )
+    assert 3 < deadline.timeout(cap=10, reserve_s=0.5) <= 3.5
+    assert deadline.timeout(cap=2) == 2
+    assert call_timeout(None, 7) == 7
+
+
+def test_deadline_raises_when_budget_is_spent():
+    deadline = Deadline.from_context(
+        SimpleNamespace(get_remaining_time_in_millis=lambda: 300)
+    )
+    assert not deadline.expired()
+    with pytest.raises(DeadlineExceeded):
+        deadline.timeout(cap=10, reserve_s=0.5)
+    with pytest.raises(DeadlineExceeded):
+        Deadline(0).check("fetch")
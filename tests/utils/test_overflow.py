@@ -0,0 +1,65 @@
+import json
+
+from utils import overflow
+
+
+def test_spill_messages_skips_without_bucket(monkeypatch):
+    monkeypatch.delenv("OVERFLOW_BUCKET", raising=False)
+
+    assert overflow.spill_messages("https://queue", [{"MessageBody": "{}"}]) is None
+
+
+def test_requeue_messages_batches_per_queue_and_returns_failures():
+    class FakeSqs:
+        def __init__(self):
+            self.calls = []
+
+        def send_message_batch(self, QueueUrl, Entries):
+            self.calls.append((QueueUrl, Entries))
+            failed = [{"Id": entry["Id"]} for entry in Entries if entry["MessageBody"] == "bad"]
+            return {"Failed": failed}
+
+    messages = [{"QueueUrl": "https://a", "MessageBody": str(n)} for n in range(12)]
+    messages.append({"QueueUrl": "https://b", "MessageBody": "bad", "MessageGroupId": "g"})
+    fake_sqs = FakeSqs()
+
+    remaining, rejected = overflow.requeue_messages(fake_sqs, messages)
+
+    assert [(url, len(entries)) for url, entries in fake_sqs.calls] == [
+        ("https://a", 10),
+        ("https://a", 2),
+        ("https://b", 1),
+    ]
+    assert fake_sqs.calls[2][1][0] == {"Id": "0", "MessageBody": "bad", "MessageGroupId": "g"}
+    assert remaining == [messages[-1]]
+    assert rejected == []
+    assert json.loads(json.dumps(remaining[0]))["QueueUrl"] == "https://b"
+
+
+def test_requeue_messages_splits_by_bytes_and_rejects_sender_faults():
+    class FakeSqs:
+        def __init__(self):
+            self.calls = []
+
+        def send_message_batch(self, QueueUrl, Entries):
+            self.calls.append(Entries)
+            assert sum(len(entry["MessageBody"]) for entry in Entries) <= 256 * 1024
+            failed = []
+            for entry in Entries:
+                if entry["MessageBody"] == "invalid":
+                    failed.append({"Id": entry["Id"], "SenderFault": True})
+                elif entry["MessageBody"] == "throttled":
+                    failed.append({"Id": entry["Id"], "SenderFault": False})
+            return {"Failed": failed}
+
+    large = "x" * (100 * 1024)
+    messages = [{"QueueUrl": "https://a", "MessageBody": large} for _ in range(5)]
+    messages.append({"QueueUrl": "https://a", "MessageBody": "invalid"})
+    messages.append({"QueueUrl": "https://a", "MessageBody": "throttled"})
+    fake_sqs = FakeSqs()
+
+    result = overflow.requeue_messages(fake_sqs, messages)
+
+    assert [len(entries) for entries in fake_sqs.calls] == [2, 2, 3]
+    assert result.remaining == [messages[-1]]
+    assert result.rejected == [messages[-2]]
@@ -0,0 +1,89 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+from utils import process_pool
+from utils.lambda_time import Deadline, DeadlineExceeded
+from utils.calendar.base import compute_free_slots
+
+
+@pytest.fixture
+def pool():
+    pool = process_pool.ProcessPool(2)
+    yield pool
+    pool.close()
+
+
+def test_process_pool_runs_in_persistent_child_processes(pool):
+    first = {pool.run(os.getpid) for _ in range(4)}
+    second = {pool.run(os.getpid) for _ in range(4)}
+
+    assert os.getpid() not in first
+    assert first == second
+    assert len(first) <= 2
+
+
+def test_process_pool_returns_results_and_raises_errors(pool):
+    start = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+    assert pool.run(compute_free_slots, start, end, [], 30) == compute_free_slots(
+        start, end, [], 30
+    )
+    with pytest.raises(ValueError):
+        pool.run(int, "not-a-number")
+    assert pool.run(pow, 2, 10) == 1024
+
+
+def test_process_pool_serves_concurrent_threads(pool):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda value: pool.run(pow, value, 2), range(8)))
+
+    assert results == [value * value for value in range(8)]
+
+
+def test_process_pool_replaces_dead_worker(pool):
+    with pytest.raises(RuntimeError):
+        pool.run(os._exit, 1)
+
+    assert pool.run(pow, 3, 2) == 9
+
+
+def test_process_pool_replaces_worker_past_deadline(pool):
+    before = {pool.run(os.getpid) for _ in range(4)}
+    started = time.monotonic()
+
+    with pytest.raises(DeadlineExceeded):
+        pool.run(time.sleep, 5, deadline=Deadline(time.monotonic() + 0.2))
+
+    assert time.monotonic() - started < 2
+    after = {pool.run(os.getpid) for _ in range(4)}
+    assert len(before - after) == 1
+    assert pool.run(pow, 3, 2) == 9
+
+
+def test_process_pool_starts_from_worker_threads():
+    # Pools are created lazily from lookup threads; workers come from a
+    # forkserver so no thread's held locks are copied into them.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pool = executor.submit(process_pool.ProcessPool, 2).result()
+    try:
+        assert pool._ctx.get_start_method() == "forkserver"
+        assert pool.run(pow, 2, 5) == 32
+    finally:
+        pool.close()
+
+
+def test_run_cpu_bound_runs_inline_without_pool(monkeypatch):
+    monkeypatch.setattr(process_pool, "_POOL", None)
+    monkeypatch.setenv("PROCESS_POOL_SIZE", "1")
+
+    assert process_pool.get_process_pool() is None
+    assert process_pool.run_cpu_bound(os.getpid) == os.getpid()
+    # Opt-in: no pool without PROCESS_POOL_SIZE, whatever the CPU count.
+    monkeypatch.delenv("PROCESS_POOL_SIZE")
+    monkeypatch.setattr(process_pool.os, "cpu_count", lambda: 8)
+    assert process_pool.get_process_pool() is None
@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from utils import result_sink
+
+
+class FakeS3:
+    def __init__(self, fail_part=None):
+        self.calls = []
+        self.parts = []
+        self.fail_part = fail_part
+
+    def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs["Key"]))
+        self.body = kwargs["Body"]
+
+    def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create_multipart_upload", kwargs["ContentEncoding"]))
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, **kwargs):
+        if kwargs["PartNumber"] == self.fail_part:
+            raise RuntimeError("part upload failed")
+        self.parts.append(kwargs["Body"])
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.calls.append(("complete_multipart_upload", kwargs["MultipartUpload"]))
+
+    def abort_multipart_upload(self, **kwargs):
+        self.calls.append(("abort_multipart_upload", kwargs["UploadId"]))
+
+
+def _rows(count):
+    # Random-ish text so gzip cannot shrink parts below the buffer bound.
+    return [{"id": index, "text": os.urandom(64).hex()} for index in range(count)]
+
+
+def test_s3_sink_streams_bounded_multipart_parts(monkeypatch):
+    s3 = FakeS3()
+    monkeypatch.setattr(result_sink, "get_s3_client", lambda: s3)
+    monkeypatch.setattr(result_sink, "MIN_PART_BYTES", 1024)
+    sink = result_sink.S3MultipartSink("bucket", "results/batch.ndjson.gz", 1024)
+
+    rows = _rows(2000)
+    for row in rows:
+        sink.write(row)
+        assert len(sink._buffer) < 1024
+    location = sink.close()
+
+    assert location == "s3://bucket/results/batch.ndjson.gz"
+    assert len(s3.parts) > 2
+    assert s3.calls[-1] == (
+        "complete_multipart_upload",
+        {"Parts": [{"ETag": f"etag-{n}", "PartNumber": n} for n in range(1, len(s3.parts) + 1)]},
+    )
+    lines = gzip.decompress(b"".join(s3.parts)).decode().splitlines()
+    assert [json.loads(line) for line in lines] == rows
+
+
+def test_s3_sink_small_batch_uses_put_object_and_aborts_on_failure(monkeypatch):
+    s3 = FakeS3()
+    monkeypatch.setattr(result_sink, "get_s3_client", lambda: s3)
+    sink = result_sink.S3MultipartSink("bucket", "small.ndjson.gz")
+    sink.write({"ok": True})
+    sink.close()
+    assert s3.calls == [("put_object", "small.ndjson.gz")]
+    assert json.loads(gzip.decompress(s3.body)) == {"ok": True}
+
+    s3 = FakeS3(fail_part=2)
+    monkeypatch.setattr(result_sink, "get_s3_client", lambda: s3)
+    monkeypatch.setattr(result_sink, "MIN_PART_BYTES", 1024)
+    sink = result_sink.S3MultipartSink("bucket", "big.ndjson.gz", 1024)
+    with pytest.raises(RuntimeError):
+        for row in _rows(2000):
+            sink.write(row)
+    sink.abort()
+    assert s3.calls[-1] == ("abort_multipart_upload", "upload-1")
+
+
+def test_get_result_sink_local_backend(monkeypatch, tmp_path):
+    monkeypatch.delenv("RESULT_SINK", raising=False)
+    assert result_sink.get_result_sink("batch") is None
+
+    monkeypatch.setenv("RESULT_SINK", "local")
+    monkeypatch.setenv("RESULT_SINK_DIR", str(tmp_path))
+    sink = result_sink.get_result_sink("batch")
+    assert sink.close() is None
+    sink.write({"a": 1})
+    sink.write({"b": 2})
+    path = sink.close()
+
+    assert path.startswith(str(tmp_path)) and path.endswith("/batch.ndjson.gz")
+    with gzip.open(path, "rt") as handle:
+        assert [json.loads(line) for line in handle] == [{"a": 1}, {"b": 2}]
+
+
+def test_gzip_sink_base_requires_storage_hooks():
+    with pytest.raises(TypeError):
+        result_sink._GzipNdjsonSink(1024)
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+
+from utils import retry
+
+
+def test_is_retryable_distinguishes_throttling_from_client_faults():
+    throttled = ClientError({"Error": {"Code": "ThrottlingException"}}, "SendMessage")
+    invalid = ClientError({"Error": {"Code": "InvalidMessageContents"}}, "SendMessage")
+
+    assert retry.is_retryable(throttled)
+    assert not retry.is_retryable(invalid)
+
+
+def test_is_retryable_limits_retries_to_transient_failures():
+    server_error = ClientError(
+        {"Error": {"Code": "Unknown"}, "ResponseMetadata": {"HTTPStatusCode": 502}},
+        "SendMessage",
+    )
+
+    assert retry.is_retryable(server_error)
+    assert retry.is_retryable(EndpointConnectionError(endpoint_url="https://sqs"))
+    assert retry.is_retryable(ReadTimeoutError(endpoint_url="https://sqs"))
+    assert not retry.is_retryable(ValueError("bad payload"))
+    assert not retry.is_retryable(KeyError("QueueUrl"))
+
+
+def test_retry_delay_respects_attempts_and_time_budget():
+    plenty = SimpleNamespace(get_remaining_time_in_millis=lambda: 60000)
+    low = SimpleNamespace(get_remaining_time_in_millis=lambda: 500)
+
+    delay = retry.retry_delay(1, plenty, base_s=0.1, cap_s=1.0)
+    assert 0 <= delay <= 0.2
+    assert retry.retry_delay(4, plenty, max_attempts=4) is None
+    assert retry.retry_delay(1, low, reserve_ms=1000) is None
+
+
+def test_call_with_retries_stops_on_non_retryable(monkeypatch):
+    monkeypatch.setattr(retry.time, "sleep", lambda seconds: None)
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise ClientError({"Error": {"Code": "InvalidMessageContents"}}, "SendMessage")
+
+    with pytest.raises(ClientError):
+        retry.call_with_retries(fail, SimpleNamespace())
+
+    assert len(calls) == 1
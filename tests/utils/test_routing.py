@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from utils import routing
+
+
+def test_compile_routing_table_first_match_wins_across_fields():
+    table = routing.compile_routing_table(
+        json.dumps(
+            {
+                "default": "bulk",
+                "rules": [
+                    {"lane": "interactive", "field": "source", "equals": "email"},
+                    {"lane": "quiet", "field": "from", "prefix": ["noreply@", "no"]},
+                    {"lane": "partner", "field": "meta.partner", "prefix": "acme"},
+                ],
+            }
+        )
+    )
+
+    assert table.classify({"source": "email", "from": "noreply@example.com"}) == "interactive"
+    assert table.classify({"source": "hook", "from": "noreply@example.com"}) == "quiet"
+    assert table.classify({"from": "nobody@example.com"}) == "quiet"
+    assert table.classify({"meta": {"partner": "acme-eu"}}) == "partner"
+    assert table.classify({"meta": "flat"}) == "bulk"
+    assert table.classify(["not", "a", "dict"]) == "bulk"
+    assert table.lanes == ["bulk", "interactive", "partner", "quiet"]
+
+
+def test_compile_routing_table_defaults_when_empty():
+    table = routing.compile_routing_table(None)
+
+    assert table.classify({"source": "email"}) == routing.DEFAULT_LANE
+
+
+def test_compile_routing_table_rejects_incomplete_rules():
+    with pytest.raises(ValueError):
+        routing.compile_routing_table({"rules": [{"lane": "x", "field": "source"}]})
@@ -1,9 +1,11 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from botocore.exceptions import ClientError
 
 from utils import secrets
+from utils.lambda_time import Deadline, DeadlineExceeded
 
 
 def test_configure_secret_cache_sets_globals():
@@ -90,3 +92,41 @@ def test_fetch_secret_client_error_logs_and_raises(monkeypatch):
 
     assert log_calls
     assert log_calls[-1]["aws_error_code"] == "AccessDenied"
+
+
+def test_get_secret_cached_concurrent_misses_fetch_once(monkeypatch):
+    secrets._SECRET_CACHE.clear()
+    calls = {"count": 0}
+
+    class SlowClient:
+        def get_secret_value(self, SecretId):
+            calls["count"] += 1
+            time.sleep(0.05)
+            return {"SecretString": "fresh"}
+
+    monkeypatch.setattr(secrets, "get_secretsmanager_client", lambda: SlowClient())
+    monkeypatch.setattr(secrets, "log_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(secrets, "emit_metric", lambda *args, **kwargs: None)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(
+            executor.map(
+                lambda _: secrets.get_secret_cached("my-secret", ttl_seconds=10),
+                range(8),
+            )
+        )
+
+    assert values == ["fresh"] * 8
+    assert calls["count"] == 1
+
+
+def test_get_secret_cached_skips_fetch_past_deadline(monkeypatch):
+    secrets._SECRET_CACHE.clear()
+
+    def fail_client():
+        raise AssertionError("Secrets Manager should not be called past the deadline")
+
+    monkeypatch.setattr(secrets, "get_secretsmanager_client", fail_client)
+
+    with pytest.raises(DeadlineExceeded):
+        secrets.get_secret_cached("my-secret", deadline=Deadline(0))
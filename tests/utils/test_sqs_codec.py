@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from utils import sqs_codec
+
+
+@pytest.mark.parametrize("codec", ["zlib", "gzip"])
+def test_encode_decode_round_trip(codec):
+    message_body = json.dumps({"body": {"text": "hello world " * 200}})
+
+    encoded, attributes = sqs_codec.encode_message_body(message_body, codec)
+
+    assert len(encoded) < len(message_body)
+    record = {
+        "body": encoded,
+        "messageAttributes": {
+            name: {"stringValue": value["StringValue"], "dataType": value["DataType"]}
+            for name, value in attributes.items()
+        },
+    }
+    assert sqs_codec.decode_record_body(record) == message_body
+
+
+def test_encode_skips_small_or_disabled_bodies():
+    assert sqs_codec.encode_message_body("{}", "zlib") == ("{}", {})
+    assert sqs_codec.encode_message_body("x" * 4096, "") == ("x" * 4096, {})
+
+
+def test_decode_passes_through_plain_records():
+    assert sqs_codec.decode_record_body({"body": "{\"a\": 1}"}) == "{\"a\": 1}"
+
+
+def test_decode_rejects_unknown_codec():
+    record = {
+        "body": "abc",
+        "messageAttributes": {sqs_codec.CODEC_ATTRIBUTE: {"stringValue": "brotli"}},
+    }
+    with pytest.raises(ValueError):
+        sqs_codec.decode_record_body(record)
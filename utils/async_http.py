@@ -0,0 +1,237 @@
+import asyncio
+import ssl
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+# (scheme, host, port)
+_PoolKey = Tuple[str, str, int]
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class HttpResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class HttpProtocolError(Exception):
+    """The peer sent something that is not a valid HTTP/1.1 response."""
+
+
+class _ConnectionClosed(ConnectionError):
+    """An idle keep-alive connection was closed before any response byte."""
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "idle_since")
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = 0.0
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncHttpClient:
+    """Small HTTP/1.1 client on asyncio streams with TLS and keep-alive pooling.
+
+    Connections are pooled per (scheme, host, port) and reused until the
+    server asks to close or they sit idle past idle_timeout. The client is
+    bound to the event loop it is first used on.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections_per_host: int = 100,
+        idle_timeout: float = 30.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        self._max_connections_per_host = max_connections_per_host
+        self._idle_timeout = idle_timeout
+        self._ssl_context = ssl_context
+        self._idle: Dict[_PoolKey, List[_Connection]] = {}
+        self._limits: Dict[_PoolKey, asyncio.Semaphore] = {}
+        self.connections_opened = 0
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        timeout: float = 10.0,
+    ) -> HttpResponse:
+        """Send one request; the timeout covers connect, send, and full read."""
+        return await asyncio.wait_for(
+            self._request(method, url, headers or {}, body), timeout
+        )
+
+    async def close(self) -> None:
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+
+    async def _request(
+        self, method: str, url: str, headers: Dict[str, str], body: bytes
+    ) -> HttpResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in _DEFAULT_PORTS or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or _DEFAULT_PORTS[scheme]
+        key = (scheme, parts.hostname, port)
+        host_header = parts.hostname
+        if port != _DEFAULT_PORTS[scheme]:
+            host_header = f"{host_header}:{port}"
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        request_bytes = _encode_request(method, target, host_header, headers, body)
+
+        async with self._limit(key):
+            connection = self._pop_idle(key)
+            if connection is not None:
+                try:
+                    return await self._exchange(key, connection, request_bytes, method)
+                except _ConnectionClosed:
+                    # The server dropped the idle connection; retry once fresh.
+                    pass
+            connection = await self._connect(key)
+            return await self._exchange(key, connection, request_bytes, method)
+
+    def _limit(self, key: _PoolKey) -> asyncio.Semaphore:
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = asyncio.Semaphore(self._max_connections_per_host)
+            self._limits[key] = limit
+        return limit
+
+    def _pop_idle(self, key: _PoolKey) -> Optional[_Connection]:
+        connections = self._idle.get(key)
+        now = time.monotonic()
+        while connections:
+            connection = connections.pop()
+            if (
+                now - connection.idle_since < self._idle_timeout
+                and not connection.reader.at_eof()
+            ):
+                return connection
+            connection.close()
+        return None
+
+    async def _connect(self, key: _PoolKey) -> _Connection:
+        scheme, host, port = key
+        tls = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            tls = self._ssl_context
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=tls, server_hostname=host if tls else None
+        )
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def _exchange(
+        self, key: _PoolKey, connection: _Connection, request_bytes: bytes, method: str
+    ) -> HttpResponse:
+        try:
+            try:
+                connection.writer.write(request_bytes)
+                await connection.writer.drain()
+            except (BrokenPipeError, ConnectionResetError) as exc:
+                raise _ConnectionClosed(str(exc)) from exc
+            response, keep_alive = await _read_response(connection.reader, method)
+        except BaseException:
+            # Covers cancellation by the request timeout: the stream position
+            # is unknown, so the connection can never be reused.
+            connection.close()
+            raise
+        if keep_alive:
+            connection.idle_since = time.monotonic()
+            self._idle.setdefault(key, []).append(connection)
+        else:
+            connection.close()
+        return response
+
+
+def _encode_request(
+    method: str, target: str, host: str, headers: Dict[str, str], body: bytes
+) -> bytes:
+    merged = {
+        "Host": host,
+        "User-Agent": "jarvis-async-http",
+        "Accept-Encoding": "identity",
+        "Connection": "keep-alive",
+    }
+    merged.update(headers)
+    if body or method.upper() in ("POST", "PUT", "PATCH"):
+        merged["Content-Length"] = str(len(body))
+    head = f"{method.upper()} {target} HTTP/1.1\r\n" + "".join(
+        f"{name}: {value}\r\n" for name, value in merged.items()
+    )
+    return head.encode("latin-1") + b"\r\n" + body
+
+
+async def _read_response(
+    reader: asyncio.StreamReader, method: str
+) -> Tuple[HttpResponse, bool]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise _ConnectionClosed("Connection closed before response")
+    version, _, rest = status_line.decode("latin-1").rstrip("\r\n").partition(" ")
+    status_text = rest.split(" ", 1)[0]
+    if not version.startswith("HTTP/1.") or not status_text.isdigit():
+        raise HttpProtocolError(f"Invalid status line: {status_line[:64]!r}")
+    status = int(status_text)
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = (
+        version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    )
+    if method.upper() == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif "chunked" in headers.get("transfer-encoding", "").lower():
+        body = await _read_chunked(reader)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        # No framing: the body runs to EOF and the connection is spent.
+        body = await reader.read()
+        keep_alive = False
+    return HttpResponse(status, headers, body), keep_alive
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size_line = await reader.readline()
+        if not size_line:
+            raise HttpProtocolError("Connection closed inside chunked body")
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError as exc:
+            raise HttpProtocolError(f"Invalid chunk size: {size_line[:32]!r}") from exc
+        if size == 0:
+            # Skip optional trailers up to the terminating blank line.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
@@ -1,3 +1,4 @@
+import threading
 from typing import Optional
 
 import boto3
@@ -6,32 +7,51 @@ from botocore.config import Config
 _S3_CLIENT = None
 _STS_CLIENT = None
 _SECRETS_CLIENT = None
+_SQS_CLIENT = None
 _ACCOUNT_ID: Optional[str] = None
+# boto3.client() shares the default session, which is not thread-safe; create
+# each singleton under a lock so concurrent workers never race on it.
+_CLIENT_LOCK = threading.Lock()
 
 
 def get_s3_client():
     global _S3_CLIENT
     if _S3_CLIENT is None:
-        _S3_CLIENT = boto3.client("s3")
+        with _CLIENT_LOCK:
+            if _S3_CLIENT is None:
+                _S3_CLIENT = boto3.client("s3")
     return _S3_CLIENT
 
 
 def get_sts_client():
     global _STS_CLIENT
     if _STS_CLIENT is None:
-        _STS_CLIENT = boto3.client("sts")
+        with _CLIENT_LOCK:
+            if _STS_CLIENT is None:
+                _STS_CLIENT = boto3.client("sts")
     return _STS_CLIENT
 
 
+def get_sqs_client():
+    global _SQS_CLIENT
+    if _SQS_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _SQS_CLIENT is None:
+                _SQS_CLIENT = boto3.client("sqs")
+    return _SQS_CLIENT
+
+
 def get_secretsmanager_client():
     global _SECRETS_CLIENT
     if _SECRETS_CLIENT is None:
-        config = Config(
-            connect_timeout=2,
-            read_timeout=3,
-            retries={"max_attempts": 2, "mode": "standard"},
-        )
-        _SECRETS_CLIENT = boto3.client("secretsmanager", config=config)
+        with _CLIENT_LOCK:
+            if _SECRETS_CLIENT is None:
+                config = Config(
+                    connect_timeout=2,
+                    read_timeout=3,
+                    retries={"max_attempts": 2, "mode": "standard"},
+                )
+                _SECRETS_CLIENT = boto3.client("secretsmanager", config=config)
     return _SECRETS_CLIENT
 
 
@@ -1,14 +1,37 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Iterable, Protocol
+from typing import Iterable, Optional, Protocol
+
+from utils.lambda_time import Deadline
 
 
 class CalendarProvider(Protocol):
     def get_free_slots(
-        self, email: str, start: datetime, end: datetime, slot_minutes: int
+        self,
+        email: str,
+        start: datetime,
+        end: datetime,
+        slot_minutes: int,
+        deadline: Optional[Deadline] = None,
+    ) -> list[dict]:
+        """Return free time slots between start and end.
+
+        Outbound calls must fit within deadline; raise DeadlineExceeded rather
+        than start one that cannot.
+        """
+
+
+class AsyncCalendarProvider(Protocol):
+    async def get_free_slots(
+        self,
+        email: str,
+        start: datetime,
+        end: datetime,
+        slot_minutes: int,
+        deadline: Optional[Deadline] = None,
     ) -> list[dict]:
-        """Return free time slots between start and end."""
+        """Coroutine form of CalendarProvider.get_free_slots."""
 
 
 def parse_rfc3339(value: str) -> datetime:
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 from urllib.error import HTTPError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
@@ -14,90 +18,206 @@ from utils.calendar.base import (
     parse_rfc3339,
     to_rfc3339,
 )
-from utils.observability import get_logger, log_json
+from utils.lambda_time import Deadline, DeadlineExceeded, call_timeout
+from utils.observability import get_logger, log_exception, log_json
+from utils.process_pool import run_cpu_bound
 from utils.secrets import get_secret_cached
 
 logger = get_logger(__name__)
 
+TOKEN_URL = "https://oauth2.googleapis.com/token"
+CALENDAR_API_BASE = "https://www.googleapis.com/calendar/v3"
+MAX_EVENT_PAGES = 4
+# freeBusy returns only busy ranges; events.list stays as a fallback mode.
+QUERY_MODES = ("freebusy", "events")
+# Google's per-request limit on freeBusy items.
+MAX_FREEBUSY_CALENDARS = 50
+TOKEN_REQUEST_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+# Upper bound for each Google request; a caller's deadline can shorten it.
+REQUEST_TIMEOUT_SECONDS = 10
+# Busy calendars large enough to be worth shipping to the process pool.
+SLOT_OFFLOAD_MIN_INTERVALS = int(
+    os.environ.get("PROCESS_POOL_MIN_BUSY_INTERVALS", "2000")
+)
+
+# Access tokens are cached per (client ID, refresh-token fingerprint) so warm
+# lookups skip the OAuth round trip. Tokens are dropped expires_in minus a
+# margin after issue and refreshed in the background shortly before that.
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get("GOOGLE_TOKEN_CACHE_SIZE", "1000"))
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+TOKEN_REFRESH_AHEAD_SECONDS = 300
+DEFAULT_TOKEN_LIFETIME_SECONDS = 3600
+
+# (client_id, sha256(refresh_token) prefix)
+TokenCacheKey = Tuple[str, str]
+
+
+class _CachedToken(NamedTuple):
+    access_token: str
+    # time.monotonic() deadlines; expires_at already includes the margin.
+    expires_at: float
+    refresh_at: float
+
+
+_TOKEN_CACHE: "OrderedDict[TokenCacheKey, _CachedToken]" = OrderedDict()
+_TOKEN_REFRESHING: set = set()
+_TOKEN_CACHE_LOCK = threading.Lock()
+
 
 class GoogleCalendarProvider(CalendarProvider):
     def get_free_slots(
-        self, email: str, start: datetime, end: datetime, slot_minutes: int
+        self,
+        email: str,
+        start: datetime,
+        end: datetime,
+        slot_minutes: int,
+        deadline: Optional[Deadline] = None,
     ) -> list[dict]:
-        log_json(
-            logger,
-            "info",
-            "calendar_free_slots_request",
-            provider="google",
-            email=email,
-            start=start,
-            end=end,
-        )
-        client_secret_name = os.environ.get("GOOGLE_OAUTH_CLIENT_SECRET_NAME")
-        if not client_secret_name:
-            raise ValueError("GOOGLE_OAUTH_CLIENT_SECRET_NAME is not set")
-        user_secret_prefix = os.environ.get("GOOGLE_OAUTH_USER_SECRET_PREFIX")
-        if not user_secret_prefix:
-            raise ValueError("GOOGLE_OAUTH_USER_SECRET_PREFIX is not set")
-
-        client_secret = _load_json_secret(client_secret_name)
-        client_id = client_secret.get("client_id")
-        client_secret_value = client_secret.get("client_secret")
-        if not client_id or not client_secret_value:
-            raise ValueError("Client secret missing client_id or client_secret")
-
-        user_secret_name = f"{user_secret_prefix}{email}"
-        user_secret = _load_json_secret(user_secret_name)
-        refresh_token = user_secret.get("refresh_token")
-        if not refresh_token:
-            raise ValueError("User secret missing refresh_token")
-        calendar_id = user_secret.get("calendar_id", "primary")
-        time_zone = user_secret.get("time_zone")
-
-        access_token = _exchange_refresh_token(
-            client_id=client_id,
-            client_secret=client_secret_value,
-            refresh_token=refresh_token,
-        )
-        busy_intervals, total_events, pages_fetched = _fetch_busy_intervals(
-            access_token=access_token,
-            calendar_id=calendar_id,
-            start=start,
-            end=end,
-            time_zone=time_zone,
+        _log_free_slots_request(email, start, end)
+        settings = _load_user_settings(email, deadline)
+
+        access_token = _access_token_for(settings, deadline)
+        if _query_mode() == "freebusy":
+            busy_intervals = _query_free_busy(
+                access_token=access_token,
+                calendar_ids=settings["calendar_ids"],
+                start=start,
+                end=end,
+                time_zone=settings["time_zone"],
+                deadline=deadline,
+            )
+            total_events, pages_fetched = len(busy_intervals), 1
+        else:
+            busy_intervals, total_events, pages_fetched = _fetch_busy_intervals(
+                access_token=access_token,
+                calendar_id=settings["calendar_id"],
+                start=start,
+                end=end,
+                time_zone=settings["time_zone"],
+                deadline=deadline,
+            )
+        return _free_slots_from_busy(
+            email,
+            start,
+            end,
+            slot_minutes,
+            busy_intervals,
+            total_events=total_events,
+            pages_fetched=pages_fetched,
+            deadline=deadline,
         )
-        log_json(
-            logger,
-            "debug",
-            "calendar_busy_intervals",
-            provider="google",
-            email=email,
-            count=len(busy_intervals),
+
+
+def _log_free_slots_request(email: str, start: datetime, end: datetime) -> None:
+    log_json(
+        logger,
+        "info",
+        "calendar_free_slots_request",
+        provider="google",
+        email=email,
+        start=start,
+        end=end,
+    )
+
+
+def _query_mode() -> str:
+    mode = os.environ.get("GOOGLE_CALENDAR_QUERY_MODE", "freebusy").lower()
+    if mode not in QUERY_MODES:
+        raise ValueError(f"GOOGLE_CALENDAR_QUERY_MODE must be one of {QUERY_MODES}")
+    return mode
+
+
+def _load_user_settings(
+    email: str, deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
+    """OAuth client credentials plus the user's refresh token and calendar."""
+    client_secret_name = os.environ.get("GOOGLE_OAUTH_CLIENT_SECRET_NAME")
+    if not client_secret_name:
+        raise ValueError("GOOGLE_OAUTH_CLIENT_SECRET_NAME is not set")
+    user_secret_prefix = os.environ.get("GOOGLE_OAUTH_USER_SECRET_PREFIX")
+    if not user_secret_prefix:
+        raise ValueError("GOOGLE_OAUTH_USER_SECRET_PREFIX is not set")
+
+    client_secret = _load_json_secret(client_secret_name, deadline)
+    client_id = client_secret.get("client_id")
+    client_secret_value = client_secret.get("client_secret")
+    if not client_id or not client_secret_value:
+        raise ValueError("Client secret missing client_id or client_secret")
+
+    user_secret_name = f"{user_secret_prefix}{email}"
+    user_secret = _load_json_secret(user_secret_name, deadline)
+    refresh_token = user_secret.get("refresh_token")
+    if not refresh_token:
+        raise ValueError("User secret missing refresh_token")
+    calendar_id = user_secret.get("calendar_id", "primary")
+    return {
+        "client_id": client_id,
+        "client_secret": client_secret_value,
+        "refresh_token": refresh_token,
+        "calendar_id": calendar_id,
+        # freeBusy checks every listed calendar in one request.
+        "calendar_ids": list(user_secret.get("calendar_ids") or [calendar_id]),
+        "time_zone": user_secret.get("time_zone"),
+    }
+
+
+def _free_slots_from_busy(
+    email: str,
+    start: datetime,
+    end: datetime,
+    slot_minutes: int,
+    busy_intervals: list[dict],
+    *,
+    total_events: int,
+    pages_fetched: int,
+    deadline: Optional[Deadline] = None,
+) -> list[dict]:
+    log_json(
+        logger,
+        "debug",
+        "calendar_busy_intervals",
+        provider="google",
+        email=email,
+        count=len(busy_intervals),
+    )
+    if len(busy_intervals) >= SLOT_OFFLOAD_MIN_INTERVALS:
+        slots = run_cpu_bound(
+            compute_free_slots,
+            start,
+            end,
+            busy_intervals,
+            slot_minutes,
+            deadline=deadline,
         )
+    else:
         slots = compute_free_slots(start, end, busy_intervals, slot_minutes)
-        log_json(
-            logger,
-            "debug",
-            "calendar_free_slots",
-            provider="google",
-            email=email,
-            count=len(slots),
-        )
-        log_json(
-            logger,
-            "info",
-            "google_calendar_events_summary",
-            pages_fetched=pages_fetched,
-            total_events=total_events,
-            busy_intervals_count=len(busy_intervals),
-            free_slots_count=len(slots),
-        )
-        return slots
+    log_json(
+        logger,
+        "debug",
+        "calendar_free_slots",
+        provider="google",
+        email=email,
+        count=len(slots),
+    )
+    log_json(
+        logger,
+        "info",
+        "google_calendar_events_summary",
+        pages_fetched=pages_fetched,
+        total_events=total_events,
+        busy_intervals_count=len(busy_intervals),
+        free_slots_count=len(slots),
+    )
+    return slots
 
 
-def _load_json_secret(secret_name: str) -> Dict[str, Any]:
+def _load_json_secret(
+    secret_name: str, deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
     try:
-        secret_value = get_secret_cached(secret_name)
+        secret_value = get_secret_cached(secret_name, deadline=deadline)
+    except DeadlineExceeded:
+        raise
     except Exception as exc:
         raise ValueError(f"Missing secret: {secret_name}") from exc
     try:
@@ -106,8 +226,96 @@ def _load_json_secret(secret_name: str) -> Dict[str, Any]:
         raise ValueError(f"Secret {secret_name} is not valid JSON") from exc
 
 
-def _exchange_refresh_token(*, client_id: str, client_secret: str, refresh_token: str) -> str:
-    body_bytes = urlencode(
+def _access_token_for(
+    settings: Dict[str, Any], deadline: Optional[Deadline] = None
+) -> str:
+    key = _token_cache_key(settings["client_id"], settings["refresh_token"])
+    access_token, refresh_due = _cached_token(key)
+    if access_token is None:
+        return _store_token(key, _exchange_refresh_token(settings, deadline))
+    if refresh_due:
+        threading.Thread(
+            target=_refresh_token_in_background, args=(key, settings), daemon=True
+        ).start()
+    return access_token
+
+
+def _refresh_token_in_background(
+    key: TokenCacheKey, settings: Dict[str, Any]
+) -> None:
+    try:
+        _store_token(key, _exchange_refresh_token(settings))
+    except Exception:
+        # The cached token is still valid; the next lookup tries again.
+        log_exception(logger, "google_token_refresh_failed", client_id=key[0])
+    finally:
+        _release_token_refresh(key)
+
+
+def _token_cache_key(client_id: str, refresh_token: str) -> TokenCacheKey:
+    fingerprint = hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()[:32]
+    return client_id, fingerprint
+
+
+def _cached_token(key: TokenCacheKey) -> Tuple[Optional[str], bool]:
+    """Return (token, refresh_due); refresh_due claims the background refresh."""
+    now = time.monotonic()
+    with _TOKEN_CACHE_LOCK:
+        entry = _TOKEN_CACHE.get(key)
+        if entry is None:
+            return None, False
+        if now >= entry.expires_at:
+            del _TOKEN_CACHE[key]
+            return None, False
+        _TOKEN_CACHE.move_to_end(key)
+        if now >= entry.refresh_at and key not in _TOKEN_REFRESHING:
+            _TOKEN_REFRESHING.add(key)
+            return entry.access_token, True
+        return entry.access_token, False
+
+
+def _store_token(key: TokenCacheKey, response: Dict[str, Any]) -> str:
+    access_token = _access_token_from(response)
+    lifetime = int(response.get("expires_in") or DEFAULT_TOKEN_LIFETIME_SECONDS)
+    usable = lifetime - TOKEN_EXPIRY_MARGIN_SECONDS
+    if usable <= 0:
+        return access_token
+    now = time.monotonic()
+    entry = _CachedToken(
+        access_token,
+        expires_at=now + usable,
+        refresh_at=now + usable - min(TOKEN_REFRESH_AHEAD_SECONDS, usable / 2),
+    )
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[key] = entry
+        _TOKEN_CACHE.move_to_end(key)
+        while len(_TOKEN_CACHE) > TOKEN_CACHE_MAX_ENTRIES:
+            _TOKEN_CACHE.popitem(last=False)
+    return access_token
+
+
+def _release_token_refresh(key: TokenCacheKey) -> None:
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_REFRESHING.discard(key)
+
+
+def _exchange_refresh_token(
+    settings: Dict[str, Any], deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
+    return _request_json(
+        TOKEN_URL,
+        headers=TOKEN_REQUEST_HEADERS,
+        body_bytes=_token_request_body(
+            settings["client_id"], settings["client_secret"], settings["refresh_token"]
+        ),
+        timeout=call_timeout(deadline, REQUEST_TIMEOUT_SECONDS, "oauth token exchange"),
+    )
+
+
+def _token_request_body(
+    client_id: str, client_secret: str, refresh_token: str
+) -> bytes:
+    return urlencode(
         {
             "client_id": client_id,
             "client_secret": client_secret,
@@ -115,11 +323,9 @@ def _exchange_refresh_token(*, client_id: str, client_secret: str, refresh_token
             "grant_type": "refresh_token",
         }
     ).encode()
-    response = _request_json(
-        "https://oauth2.googleapis.com/token",
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        body_bytes=body_bytes,
-    )
+
+
+def _access_token_from(response: Dict[str, Any]) -> str:
     access_token = response.get("access_token")
     if not access_token:
         raise ValueError("Token response missing access_token")
@@ -133,42 +339,22 @@ def _fetch_busy_intervals(
     start: datetime,
     end: datetime,
     time_zone: str | None,
+    deadline: Optional[Deadline] = None,
 ) -> Tuple[list[dict], int, int]:
     events: list[dict] = []
     page_token: str | None = None
     page = 1
-    while page <= 4:
-        params: Dict[str, Any] = {
-            "timeMin": start.isoformat(),
-            "timeMax": end.isoformat(),
-            "singleEvents": "true",
-            "orderBy": "startTime",
-            "maxResults": 2500,
-        }
-        if time_zone:
-            params["timeZone"] = time_zone
-        if page_token:
-            params["pageToken"] = page_token
-        query_string = urlencode(params)
-        request_url = (
-            f"https://www.googleapis.com/calendar/v3/calendars/{calendar_id}/events"
-            f"?{query_string}"
-        )
-        log_json(
-            logger,
-            "info",
-            "google_calendar_events_request",
-            calendar_id=calendar_id,
-            time_min=params["timeMin"],
-            time_max=params["timeMax"],
-            page=page,
-            request_url=request_url,
-            query_params=params,
+    while page <= MAX_EVENT_PAGES:
+        request_url = _events_page_url(
+            calendar_id, start, end, time_zone, page_token, page
         )
         response = _request_calendar_events(
             request_url=request_url,
             access_token=access_token,
             page=page,
+            timeout=call_timeout(
+                deadline, REQUEST_TIMEOUT_SECONDS, f"calendar events page {page}"
+            ),
         )
         events.extend(response.get("items", []))
         page_token = response.get("nextPageToken")
@@ -176,6 +362,132 @@ def _fetch_busy_intervals(
             break
         page += 1
 
+    busy_intervals = _busy_intervals_from_events(events, start, end)
+    pages_fetched = min(page, MAX_EVENT_PAGES)
+    return busy_intervals, len(events), pages_fetched
+
+
+def _query_free_busy(
+    *,
+    access_token: str,
+    calendar_ids: list[str],
+    start: datetime,
+    end: datetime,
+    time_zone: str | None,
+    deadline: Optional[Deadline] = None,
+) -> list[dict]:
+    url, body = _free_busy_request(calendar_ids, start, end, time_zone)
+    response = _request_json(
+        url,
+        headers=_free_busy_headers(access_token),
+        body_bytes=body,
+        timeout=call_timeout(deadline, REQUEST_TIMEOUT_SECONDS, "calendar freeBusy"),
+    )
+    return _busy_intervals_from_free_busy(response, start, end)
+
+
+def _free_busy_request(
+    calendar_ids: list[str], start: datetime, end: datetime, time_zone: str | None
+) -> Tuple[str, bytes]:
+    if not 1 <= len(calendar_ids) <= MAX_FREEBUSY_CALENDARS:
+        raise ValueError(
+            f"freeBusy needs 1 to {MAX_FREEBUSY_CALENDARS} calendars, "
+            f"got {len(calendar_ids)}"
+        )
+    payload: Dict[str, Any] = {
+        "timeMin": start.isoformat(),
+        "timeMax": end.isoformat(),
+        "items": [{"id": calendar_id} for calendar_id in calendar_ids],
+    }
+    if time_zone:
+        payload["timeZone"] = time_zone
+    log_json(
+        logger,
+        "info",
+        "google_calendar_freebusy_request",
+        calendar_ids=calendar_ids,
+        time_min=payload["timeMin"],
+        time_max=payload["timeMax"],
+    )
+    return f"{CALENDAR_API_BASE}/freeBusy", json.dumps(payload).encode()
+
+
+def _free_busy_headers(access_token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+    }
+
+
+def _busy_intervals_from_free_busy(
+    response: Dict[str, Any], start: datetime, end: datetime
+) -> list[dict]:
+    busy_intervals: list[dict] = []
+    for calendar_id, calendar in (response.get("calendars") or {}).items():
+        errors = calendar.get("errors")
+        if errors:
+            # e.g. notFound / internalError: free time would be a guess.
+            reasons = ",".join(str(error.get("reason")) for error in errors)
+            raise ValueError(f"freeBusy error for calendar {calendar_id}: {reasons}")
+        for interval in calendar.get("busy", []):
+            busy_start = parse_rfc3339(interval["start"])
+            busy_end = parse_rfc3339(interval["end"])
+            if busy_end <= start or busy_start >= end:
+                continue
+            busy_intervals.append(
+                {
+                    "start": to_rfc3339(max(busy_start, start)),
+                    "end": to_rfc3339(min(busy_end, end)),
+                }
+            )
+    log_json(
+        logger,
+        "info",
+        "google_calendar_freebusy_response",
+        calendars=len(response.get("calendars") or {}),
+        busy_intervals_count=len(busy_intervals),
+    )
+    return busy_intervals
+
+
+def _events_page_url(
+    calendar_id: str,
+    start: datetime,
+    end: datetime,
+    time_zone: str | None,
+    page_token: str | None,
+    page: int,
+) -> str:
+    params: Dict[str, Any] = {
+        "timeMin": start.isoformat(),
+        "timeMax": end.isoformat(),
+        "singleEvents": "true",
+        "orderBy": "startTime",
+        "maxResults": 2500,
+    }
+    if time_zone:
+        params["timeZone"] = time_zone
+    if page_token:
+        params["pageToken"] = page_token
+    query_string = urlencode(params)
+    request_url = f"{CALENDAR_API_BASE}/calendars/{calendar_id}/events?{query_string}"
+    log_json(
+        logger,
+        "info",
+        "google_calendar_events_request",
+        calendar_id=calendar_id,
+        time_min=params["timeMin"],
+        time_max=params["timeMax"],
+        page=page,
+        request_url=request_url,
+        query_params=params,
+    )
+    return request_url
+
+
+def _busy_intervals_from_events(
+    events: list[dict], start: datetime, end: datetime
+) -> list[dict]:
     busy_intervals: list[dict] = []
     default_tz = start.tzinfo
     for event in events:
@@ -191,8 +503,7 @@ def _fetch_busy_intervals(
                 "end": to_rfc3339(min(event_end, end)),
             }
         )
-    pages_fetched = min(page, 4)
-    return busy_intervals, len(events), pages_fetched
+    return busy_intervals
 
 
 def _parse_event_time(value: Dict[str, Any], default_tz) -> datetime | None:
@@ -212,6 +523,7 @@ def _request_calendar_events(
     request_url: str,
     access_token: str,
     page: int,
+    timeout: float = REQUEST_TIMEOUT_SECONDS,
 ) -> Dict[str, Any]:
     request = Request(
         request_url,
@@ -219,82 +531,76 @@ def _request_calendar_events(
         headers={"Authorization": f"Bearer {access_token}"},
     )
     try:
-        with urlopen(request, timeout=10) as response:
+        with urlopen(request, timeout=timeout) as response:
             status = response.getcode()
             body = response.read()
     except HTTPError as exc:
-        status = exc.code
-        body = exc.read()
-        body_prefix = _truncate_body(body)
-        log_json(
-            logger,
-            "info",
-            "google_calendar_events_response",
-            page=page,
-            status_code=status,
-            items_count=0,
-            has_next_page_token=False,
-            body_prefix=body_prefix,
-        )
-        raise ValueError(
-            f"Google Calendar API error {status}: {body_prefix}"
-        ) from exc
+        # Non-2xx: logs the response and raises ValueError.
+        return _parse_events_response(exc.code, exc.read(), page)
+    return _parse_events_response(status, body, page)
 
+
+def _parse_events_response(status: int, body: bytes, page: int) -> Dict[str, Any]:
     body_prefix = _truncate_body(body)
     if status < 200 or status >= 300:
-        log_json(
-            logger,
-            "info",
-            "google_calendar_events_response",
-            page=page,
-            status_code=status,
-            items_count=0,
-            has_next_page_token=False,
-            body_prefix=body_prefix,
-        )
+        _log_events_response(page, status, body_prefix)
         raise ValueError(f"Google Calendar API error {status}: {body_prefix}")
 
     try:
         payload = json.loads(body.decode())
     except json.JSONDecodeError as exc:
-        log_json(
-            logger,
-            "info",
-            "google_calendar_events_response",
-            page=page,
-            status_code=status,
-            items_count=0,
-            has_next_page_token=False,
-            body_prefix=body_prefix,
-        )
+        _log_events_response(page, status, body_prefix)
         raise ValueError("Invalid JSON response from Google Calendar API") from exc
 
-    items = payload.get("items", [])
-    has_next = bool(payload.get("nextPageToken"))
+    _log_events_response(
+        page,
+        status,
+        body_prefix,
+        items_count=len(payload.get("items", [])),
+        has_next_page_token=bool(payload.get("nextPageToken")),
+    )
+    return payload
+
+
+def _log_events_response(
+    page: int,
+    status: int,
+    body_prefix: str,
+    *,
+    items_count: int = 0,
+    has_next_page_token: bool = False,
+) -> None:
     log_json(
         logger,
         "info",
         "google_calendar_events_response",
         page=page,
         status_code=status,
-        items_count=len(items),
-        has_next_page_token=has_next,
+        items_count=items_count,
+        has_next_page_token=has_next_page_token,
         body_prefix=body_prefix,
     )
-    return payload
 
 
-def _request_json(url: str, headers: Dict[str, str], body_bytes: bytes) -> Dict[str, Any]:
+def _request_json(
+    url: str,
+    headers: Dict[str, str],
+    body_bytes: bytes,
+    timeout: float = REQUEST_TIMEOUT_SECONDS,
+) -> Dict[str, Any]:
     request = Request(url, data=body_bytes, method="POST", headers=headers)
     try:
-        with urlopen(request, timeout=10) as response:
+        with urlopen(request, timeout=timeout) as response:
             status = response.getcode()
             body = response.read()
     except HTTPError as exc:
         body = exc.read()
         message = _format_http_error(exc.code, body)
         raise RuntimeError(message) from exc
+    return _parse_json_response(status, body)
+
 
+def _parse_json_response(status: int, body: bytes) -> Dict[str, Any]:
     if status >= 400:
         raise RuntimeError(_format_http_error(status, body))
 
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from utils.async_http import AsyncHttpClient
+from utils.calendar import google
+from utils.calendar.base import AsyncCalendarProvider
+from utils.lambda_time import Deadline, call_timeout
+from utils.observability import get_logger, log_exception
+
+logger = get_logger(__name__)
+
+
+class AsyncGoogleCalendarProvider(AsyncCalendarProvider):
+    """asyncio counterpart of GoogleCalendarProvider.
+
+    Token and events requests go through one keep-alive AsyncHttpClient, so
+    concurrent lookups share connections to Google. Secrets still come from
+    the (cached, blocking) secret store on a worker thread.
+    """
+
+    def __init__(self, client: Optional[AsyncHttpClient] = None) -> None:
+        self._client = client
+        # Strong references so background token refreshes are not collected.
+        self._background: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def client(self) -> AsyncHttpClient:
+        # Created lazily so it binds to the loop that first uses it.
+        if self._client is None:
+            self._client = AsyncHttpClient()
+        return self._client
+
+    async def get_free_slots(
+        self,
+        email: str,
+        start: datetime,
+        end: datetime,
+        slot_minutes: int,
+        deadline: Optional[Deadline] = None,
+    ) -> list[dict]:
+        google._log_free_slots_request(email, start, end)
+        settings = await asyncio.to_thread(google._load_user_settings, email, deadline)
+
+        access_token = await self._access_token_for(settings, deadline)
+        if google._query_mode() == "freebusy":
+            busy_intervals = await self._query_free_busy(
+                access_token=access_token,
+                calendar_ids=settings["calendar_ids"],
+                start=start,
+                end=end,
+                time_zone=settings["time_zone"],
+                deadline=deadline,
+            )
+            total_events, pages_fetched = len(busy_intervals), 1
+        else:
+            (
+                busy_intervals,
+                total_events,
+                pages_fetched,
+            ) = await self._fetch_busy_intervals(
+                access_token=access_token,
+                calendar_id=settings["calendar_id"],
+                start=start,
+                end=end,
+                time_zone=settings["time_zone"],
+                deadline=deadline,
+            )
+        finish_args = (email, start, end, slot_minutes, busy_intervals)
+        finish_kwargs = {
+            "total_events": total_events,
+            "pages_fetched": pages_fetched,
+            "deadline": deadline,
+        }
+        if len(busy_intervals) >= google.SLOT_OFFLOAD_MIN_INTERVALS:
+            # Large calendars go to the process pool; wait off the event loop.
+            return await asyncio.to_thread(
+                google._free_slots_from_busy, *finish_args, **finish_kwargs
+            )
+        return google._free_slots_from_busy(*finish_args, **finish_kwargs)
+
+    async def _access_token_for(
+        self, settings: Dict[str, Any], deadline: Optional[Deadline]
+    ) -> str:
+        # Shares the sync provider's token cache.
+        key = google._token_cache_key(settings["client_id"], settings["refresh_token"])
+        access_token, refresh_due = google._cached_token(key)
+        if access_token is None:
+            response = await self._exchange_refresh_token(settings, deadline)
+            return google._store_token(key, response)
+        if refresh_due:
+            task = asyncio.create_task(self._refresh_token_in_background(key, settings))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return access_token
+
+    async def _refresh_token_in_background(
+        self, key: google.TokenCacheKey, settings: Dict[str, Any]
+    ) -> None:
+        try:
+            google._store_token(key, await self._exchange_refresh_token(settings, None))
+        except Exception:
+            log_exception(logger, "google_token_refresh_failed", client_id=key[0])
+        finally:
+            google._release_token_refresh(key)
+
+    async def _exchange_refresh_token(
+        self, settings: Dict[str, Any], deadline: Optional[Deadline]
+    ) -> Dict[str, Any]:
+        response = await self.client.request(
+            "POST",
+            google.TOKEN_URL,
+            headers=google.TOKEN_REQUEST_HEADERS,
+            body=google._token_request_body(
+                settings["client_id"],
+                settings["client_secret"],
+                settings["refresh_token"],
+            ),
+            timeout=call_timeout(
+                deadline, google.REQUEST_TIMEOUT_SECONDS, "oauth token exchange"
+            ),
+        )
+        return google._parse_json_response(response.status, response.body)
+
+    async def _query_free_busy(
+        self,
+        *,
+        access_token: str,
+        calendar_ids: list[str],
+        start: datetime,
+        end: datetime,
+        time_zone: str | None,
+        deadline: Optional[Deadline],
+    ) -> list[dict]:
+        url, body = google._free_busy_request(calendar_ids, start, end, time_zone)
+        response = await self.client.request(
+            "POST",
+            url,
+            headers=google._free_busy_headers(access_token),
+            body=body,
+            timeout=call_timeout(
+                deadline, google.REQUEST_TIMEOUT_SECONDS, "calendar freeBusy"
+            ),
+        )
+        return google._busy_intervals_from_free_busy(
+            google._parse_json_response(response.status, response.body), start, end
+        )
+
+    async def _fetch_busy_intervals(
+        self,
+        *,
+        access_token: str,
+        calendar_id: str,
+        start: datetime,
+        end: datetime,
+        time_zone: str | None,
+        deadline: Optional[Deadline],
+    ) -> Tuple[list[dict], int, int]:
+        events: list[dict] = []
+        page_token: str | None = None
+        page = 1
+        while page <= google.MAX_EVENT_PAGES:
+            request_url = google._events_page_url(
+                calendar_id, start, end, time_zone, page_token, page
+            )
+            response = await self.client.request(
+                "GET",
+                request_url,
+                headers={"Authorization": f"Bearer {access_token}"},
+                timeout=call_timeout(
+                    deadline,
+                    google.REQUEST_TIMEOUT_SECONDS,
+                    f"calendar events page {page}",
+                ),
+            )
+            payload = google._parse_events_response(
+                response.status, response.body, page
+            )
+            events.extend(payload.get("items", []))
+            page_token = payload.get("nextPageToken")
+            if not page_token:
+                break
+            page += 1
+
+        busy_intervals = google._busy_intervals_from_events(events, start, end)
+        return busy_intervals, len(events), min(page, google.MAX_EVENT_PAGES)
@@ -1,15 +1,29 @@
 import os
 
-from utils.calendar.base import CalendarProvider
+from utils.calendar.base import AsyncCalendarProvider, CalendarProvider
 from utils.calendar.google import GoogleCalendarProvider
+from utils.calendar.google_async import AsyncGoogleCalendarProvider
 
 
 _PROVIDERS = {"google": GoogleCalendarProvider}
+_ASYNC_PROVIDERS = {"google": AsyncGoogleCalendarProvider}
+
+
+def _provider_name() -> str:
+    return os.environ.get("CALENDAR_PROVIDER", "google").lower()
 
 
 def get_provider() -> CalendarProvider:
-    provider_name = os.environ.get("CALENDAR_PROVIDER", "google").lower()
+    provider_name = _provider_name()
     provider_class = _PROVIDERS.get(provider_name)
     if not provider_class:
         raise ValueError(f"Unknown calendar provider: {provider_name}")
     return provider_class()
+
+
+def get_async_provider() -> AsyncCalendarProvider:
+    provider_name = _provider_name()
+    provider_class = _ASYNC_PROVIDERS.get(provider_name)
+    if not provider_class:
+        raise ValueError(f"Unknown async calendar provider: {provider_name}")
+    return provider_class()
@@ -0,0 +1,72 @@
+import json
+import os
+import uuid
+from typing import Any, Dict
+
+from utils.aws_clients import get_s3_client
+
+DEFAULT_THRESHOLD_BYTES = 200 * 1024
+DEFAULT_PREFIX = "ingress-payloads/"
+
+
+def offload_large_body(envelope: Dict[str, Any], message_body: str) -> str:
+    """Return the SQS message body for ``envelope``.
+
+    When ``CLAIM_CHECK_BUCKET`` is set and ``message_body`` exceeds
+    ``CLAIM_CHECK_THRESHOLD_BYTES``, the envelope body (``body`` or, for raw
+    envelopes, ``rawBody``) is written to S3 and the returned message carries a
+    ``bodyRef`` pointer. Parsed bodies also keep their ``source`` so consumers
+    can dispatch without fetching them.
+    """
+    bucket = os.environ.get("CLAIM_CHECK_BUCKET")
+    threshold = int(
+        os.environ.get("CLAIM_CHECK_THRESHOLD_BYTES", str(DEFAULT_THRESHOLD_BYTES))
+    )
+    if not bucket or len(message_body.encode("utf-8")) <= threshold:
+        return message_body
+
+    prefix = os.environ.get("CLAIM_CHECK_PREFIX", DEFAULT_PREFIX)
+    request_id = envelope.get("requestId") or "unknown"
+    field = "rawBody" if "rawBody" in envelope else "body"
+    body = envelope.get(field)
+    if field == "rawBody":
+        key = f"{prefix}{request_id}/{uuid.uuid4().hex}.raw"
+        body_bytes = body.encode("utf-8")
+        content_type = "application/octet-stream"
+    else:
+        key = f"{prefix}{request_id}/{uuid.uuid4().hex}.json"
+        body_bytes = json.dumps(body).encode("utf-8")
+        content_type = "application/json"
+    get_s3_client().put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=body_bytes,
+        ContentType=content_type,
+    )
+
+    pointer = {name: value for name, value in envelope.items() if name != field}
+    pointer["bodyRef"] = {
+        "bucket": bucket,
+        "key": key,
+        "size": len(body_bytes),
+        "field": field,
+    }
+    if isinstance(body, dict) and "source" in body:
+        pointer["source"] = body["source"]
+    return json.dumps(pointer)
+
+
+def fetch_offloaded_body(envelope: Dict[str, Any]) -> None:
+    """Restore an offloaded ``body``/``rawBody`` field from S3 in place."""
+    body_ref = envelope.get("bodyRef")
+    if not body_ref:
+        return
+    field = body_ref.get("field", "body")
+    if field in envelope:
+        return
+    response = get_s3_client().get_object(Bucket=body_ref["bucket"], Key=body_ref["key"])
+    body_bytes = response["Body"].read()
+    if field == "rawBody":
+        envelope[field] = body_bytes.decode("utf-8")
+    else:
+        envelope[field] = json.loads(body_bytes)
@@ -1,21 +1,35 @@
-import boto3
 import hashlib
 import hmac
-from typing import Dict
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.aws_clients import get_secretsmanager_client
 
 SECRET_CACHE: Dict[str, str] = {}
 
+CURRENT_VERSION_STAGE = "AWSCURRENT"
+PREVIOUS_VERSION_STAGE = "AWSPREVIOUS"
+
 
-def get_secret(secret_name: str) -> str:
+def get_secret(
+    secret_name: str,
+    version_stage: Optional[str] = None,
+    force_refresh: bool = False,
+) -> str:
     """Fetch a string secret value from AWS Secrets Manager."""
-    if secret_name in SECRET_CACHE:
-        return SECRET_CACHE[secret_name]
-    client = boto3.client("secretsmanager")
-    response = client.get_secret_value(SecretId=secret_name)
+    cache_key = secret_name if version_stage is None else f"{secret_name}@{version_stage}"
+    if not force_refresh and cache_key in SECRET_CACHE:
+        return SECRET_CACHE[cache_key]
+    client = get_secretsmanager_client()
+    request = {"SecretId": secret_name}
+    if version_stage is not None:
+        request["VersionStage"] = version_stage
+    response = client.get_secret_value(**request)
     secret_value = response.get("SecretString")
     if not secret_value:
         raise ValueError("SecretString is empty")
-    SECRET_CACHE[secret_name] = secret_value
+    SECRET_CACHE[cache_key] = secret_value
     return secret_value
 
 
@@ -26,3 +40,71 @@ def hmac_sha256_hex(key: str, message: str) -> str:
         message.encode("utf-8"),
         hashlib.sha256,
     ).hexdigest().lower()
+
+
+class SigningKey:
+    """Pre-keyed HMAC-SHA256 state that is copied for every message."""
+
+    __slots__ = ("key_id", "version_stage", "_mac")
+
+    def __init__(self, secret: str, *, key_id: str = "", version_stage: str = "") -> None:
+        self.key_id = key_id
+        self.version_stage = version_stage
+        self._mac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+    def sign_hex(self, message: str) -> str:
+        mac = self._mac.copy()
+        mac.update(message.encode("utf-8"))
+        return mac.hexdigest()
+
+
+class KeyRing:
+    """Signing keys per secret name: the current version, then the previous one.
+
+    ``loader`` is called as ``loader(secret_name, version_stage=..., force_refresh=True)``
+    at most once per ``ttl_seconds`` per secret name, so rotated secrets are picked
+    up without a redeploy. A missing previous version is not an error.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[..., str],
+        *,
+        ttl_seconds: float = 300,
+        max_entries: int = 512,
+    ) -> None:
+        self._loader = loader
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[List[SigningKey], float]]" = OrderedDict()
+
+    def keys(self, secret_name: str, key_id: str = "") -> List[SigningKey]:
+        now = time.time()
+        entry = self._entries.get(secret_name)
+        if entry is not None and now - entry[1] < self._ttl_seconds:
+            self._entries.move_to_end(secret_name)
+            return entry[0]
+
+        current = self._loader(
+            secret_name, version_stage=CURRENT_VERSION_STAGE, force_refresh=True
+        )
+        keys = [SigningKey(current, key_id=key_id, version_stage=CURRENT_VERSION_STAGE)]
+        try:
+            previous = self._loader(
+                secret_name, version_stage=PREVIOUS_VERSION_STAGE, force_refresh=True
+            )
+        except Exception:
+            previous = None
+        if previous and previous != current:
+            keys.append(
+                SigningKey(previous, key_id=key_id, version_stage=PREVIOUS_VERSION_STAGE)
+            )
+
+        self._entries[secret_name] = (keys, now)
+        self._entries.move_to_end(secret_name)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return keys
+
+    def clear(self) -> None:
+        self._entries.clear()
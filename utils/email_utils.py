@@ -31,6 +31,7 @@ def parse_raw_email(raw_bytes: bytes) -> Dict[str, str]:
         "from": message.get("From", ""),
         "to": message.get("To", ""),
         "subject": message.get("Subject", ""),
+        "message_id": message.get("Message-ID", ""),
         "text": _get_email_text(message),
     }
 
@@ -0,0 +1,50 @@
+import base64
+import json
+from typing import Any, Dict, Optional
+
+from utils.claim_check import fetch_offloaded_body
+
+
+def build_raw_envelope(
+    request_id: Optional[str],
+    body: str,
+    is_base64_encoded: bool,
+) -> Dict[str, Any]:
+    """Wrap an API Gateway body as delivered, without decoding or parsing it."""
+    return {
+        "requestId": request_id,
+        "rawBody": body,
+        "isBase64Encoded": is_base64_encoded,
+    }
+
+
+def decode_raw_body(raw_body: str, is_base64_encoded: bool) -> Any:
+    if is_base64_encoded:
+        raw_body = base64.b64decode(raw_body).decode("utf-8")
+    try:
+        return json.loads(raw_body) if raw_body else None
+    except json.JSONDecodeError:
+        return {"raw": raw_body}
+
+
+def envelope_body(envelope: Dict[str, Any]) -> Any:
+    """Return the parsed envelope body, resolving claim-check and raw envelopes."""
+    if "body" not in envelope:
+        fetch_offloaded_body(envelope)
+    if "body" not in envelope and "rawBody" in envelope:
+        envelope["body"] = decode_raw_body(
+            envelope.pop("rawBody"), bool(envelope.pop("isBase64Encoded", False))
+        )
+    return envelope.get("body")
+
+
+def envelope_source(envelope: Dict[str, Any]) -> Any:
+    """Return the body ``source``, fetching an offloaded body only if needed."""
+    if "source" in envelope:
+        return envelope["source"]
+    body_ref = envelope.get("bodyRef")
+    if body_ref and body_ref.get("field", "body") == "body":
+        # Parsed bodies are offloaded with their source; none means no source.
+        return None
+    body = envelope_body(envelope)
+    return body.get("source") if isinstance(body, dict) else None
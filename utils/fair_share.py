@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+DEFAULT_HALF_LIFE_SECONDS = 60.0
+DEFAULT_MAX_SENDERS = 4096
+
+
+class FairSchedule(NamedTuple):
+    # Indexes into the input, in the order work should start.
+    order: List[int]
+    # Indexes over their sender's quota, to be handed back to the queue.
+    deferred: List[int]
+
+
+class SenderUsage:
+    """Work each sender ran recently in this container, decaying over time.
+
+    Usage halves every half_life_seconds, so a sender that keeps filling
+    batches stays high across invocations while quiet senders drift back to
+    zero. The least recently charged senders are dropped past max_senders.
+    """
+
+    def __init__(
+        self,
+        half_life_seconds: float = DEFAULT_HALF_LIFE_SECONDS,
+        max_senders: int = DEFAULT_MAX_SENDERS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if half_life_seconds <= 0:
+            raise ValueError("half_life_seconds must be positive")
+        self.half_life_seconds = half_life_seconds
+        self.max_senders = max_senders
+        self._clock = clock
+        # sender -> (usage, time.monotonic() it was last decayed to)
+        self._entries: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sender: str) -> float:
+        with self._lock:
+            return self._decayed(sender.lower(), self._clock())
+
+    def add(self, sender: str, amount: float) -> None:
+        sender = sender.lower()
+        with self._lock:
+            now = self._clock()
+            self._entries[sender] = (self._decayed(sender, now) + amount, now)
+            self._entries.move_to_end(sender)
+            while len(self._entries) > self.max_senders:
+                self._entries.popitem(last=False)
+
+    def _decayed(self, sender: str, now: float) -> float:
+        entry = self._entries.get(sender)
+        if entry is None:
+            return 0.0
+        usage, at = entry
+        return usage * 0.5 ** (max(0.0, now - at) / self.half_life_seconds)
+
+
+def parse_sender_weights(
+    spec: Union[str, Dict[str, Any], None]
+) -> Dict[str, float]:
+    """Parse a {"sender": weight} map (or its JSON); senders not listed weigh 1."""
+    weights = json.loads(spec) if isinstance(spec, str) and spec.strip() else spec
+    if not weights:
+        return {}
+    if not isinstance(weights, dict):
+        raise ValueError("Sender weights must be a JSON object")
+    parsed = {}
+    for sender, weight in weights.items():
+        weight = float(weight)
+        if weight <= 0:
+            raise ValueError(f"Sender weight for {sender} must be positive")
+        parsed[str(sender).lower()] = weight
+    return parsed
+
+
+def fair_schedule(
+    senders: Sequence[Optional[str]],
+    *,
+    weights: Dict[str, float],
+    quota: int,
+    pinned: Sequence[bool] = (),
+    costs: Sequence[float] = (),
+    usage: Optional[SenderUsage] = None,
+) -> FairSchedule:
+    """Order items by weighted fair queuing and cap each sender's usage.
+
+    Each item costs costs[i] (default 1). A sender's items finish at virtual
+    time (usage so far + cost) / weight, where usage starts from what the
+    sender ran in earlier batches (``usage``), so a sender that has been busy
+    recently goes after quiet ones instead of first. Items without a sender
+    (None) are not scheduled and keep their place at the front. With
+    quota > 0, an item is deferred once its sender's usage has reached
+    quota * weight, unless pinned; a sender's first item is always admitted.
+    Admitted items are charged to ``usage``.
+    """
+    used: Dict[str, float] = {}
+    keyed: List[Tuple[float, int]] = []
+    deferred: List[int] = []
+    for index, sender in enumerate(senders):
+        if sender is None:
+            keyed.append((0.0, index))
+            continue
+        sender = sender.lower()
+        weight = weights.get(sender, 1.0)
+        cost = costs[index] if index < len(costs) else 1
+        if sender not in used:
+            used[sender] = usage.get(sender) if usage is not None else 0.0
+        is_pinned = index < len(pinned) and pinned[index]
+        if quota > 0 and used[sender] >= quota * weight and not is_pinned:
+            deferred.append(index)
+            continue
+        used[sender] += cost
+        if usage is not None:
+            usage.add(sender, cost)
+        keyed.append((used[sender] / weight, index))
+    keyed.sort()
+    return FairSchedule([index for _, index in keyed], deferred)
+
+
+def queue_url_from_arn(queue_arn: str) -> str:
+    """arn:aws:sqs:<region>:<account>:<name> -> the queue's HTTPS URL."""
+    parts = queue_arn.split(":")
+    if len(parts) != 6 or parts[2] != "sqs":
+        raise ValueError(f"Not an SQS queue ARN: {queue_arn}")
+    _, partition, _, region, account, name = parts
+    domain = "amazonaws.com.cn" if partition == "aws-cn" else "amazonaws.com"
+    return f"https://sqs.{region}.{domain}/{account}/{name}"
@@ -1,13 +1,18 @@
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from urllib.request import Request, urlopen
 
+from utils.lambda_time import Deadline, call_timeout
+
 
 def post_json(
     url: str,
     headers: Dict[str, str],
     body_bytes: bytes,
-    timeout_seconds: int,
+    timeout_seconds: float,
+    deadline: Optional[Deadline] = None,
 ) -> Tuple[int, str]:
+    # With a deadline, timeout_seconds is only the cap for this call.
+    timeout_seconds = call_timeout(deadline, timeout_seconds, operation=url)
     request = Request(
         url,
         data=body_bytes,
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Protocol
+
+IDEMPOTENCY_KEY_FIELD = "idempotencyKey"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_LRU_SIZE = 10000
+DEFAULT_SQLITE_PATH = "/tmp/jarvis-dedupe.sqlite3"
+
+
+def email_idempotency_key(message_id: str) -> str:
+    """Key for an email, from its Message-ID header (empty if there is none).
+
+    SES redeliveries and duplicate S3 events carry the same Message-ID, so
+    every copy maps to one key.
+    """
+    message_id = message_id.strip().strip("<>").strip().lower()
+    if not message_id:
+        return ""
+    return "email:" + hashlib.sha256(message_id.encode("utf-8")).hexdigest()[:32]
+
+
+def body_idempotency_key(body: Any) -> str:
+    """Key for a webhook body: a hash of its canonical JSON (or raw text)."""
+    if isinstance(body, str):
+        content = body
+    else:
+        content = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return "body:" + hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+def stamp_idempotency_key(envelope: Dict[str, Any]) -> Dict[str, Any]:
+    """Set the envelope's key from its body, keeping one the sender already set."""
+    if envelope.get(IDEMPOTENCY_KEY_FIELD):
+        return envelope
+    body = envelope.get("body")
+    key = body.get(IDEMPOTENCY_KEY_FIELD) if isinstance(body, dict) else None
+    if not key:
+        content = body if "body" in envelope else envelope.get("rawBody")
+        key = body_idempotency_key(content)
+    envelope[IDEMPOTENCY_KEY_FIELD] = key
+    return envelope
+
+
+class DedupeBackend(Protocol):
+    def seen(self, key: str) -> bool:
+        """True if key was marked and has not expired."""
+
+    def mark(self, key: str, ttl_seconds: int) -> None:
+        """Record key as done for ttl_seconds."""
+
+
+class LruDedupeCache:
+    """Bounded in-memory key -> expiry map; oldest keys are evicted first."""
+
+    def __init__(self, max_entries: int = DEFAULT_LRU_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def mark(self, key: str, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = time.time() + ttl_seconds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteDedupeBackend:
+    """SQLite stand-in for a shared dedupe table (tests and local runs).
+
+    Rows are (key, expires_at); expired rows are ignored on read and pruned
+    on write.
+    """
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH) -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dedupe "
+                "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+
+    def seen(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM dedupe WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def mark(self, key: str, ttl_seconds: int) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dedupe (key, expires_at) VALUES (?, ?)",
+                (key, now + ttl_seconds),
+            )
+            self._conn.execute("DELETE FROM dedupe WHERE expires_at <= ?", (now,))
+
+
+class DedupeStore:
+    """In-memory LRU in front of an optional shared backend."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        local: Optional[LruDedupeCache] = None,
+        shared: Optional[DedupeBackend] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.local = local or LruDedupeCache()
+        self.shared = shared
+
+    def seen(self, key: str) -> bool:
+        if self.local.seen(key):
+            return True
+        if self.shared is not None and self.shared.seen(key):
+            # Remember shared hits locally; the shared TTL bounds this one.
+            self.local.mark(key, self.ttl_seconds)
+            return True
+        return False
+
+    def mark(self, key: str) -> None:
+        self.local.mark(key, self.ttl_seconds)
+        if self.shared is not None:
+            self.shared.mark(key, self.ttl_seconds)
+
+
+_BACKENDS: Dict[str, Callable[[], DedupeBackend]] = {
+    "sqlite": lambda: SqliteDedupeBackend(
+        os.environ.get("DEDUPE_SQLITE_PATH", DEFAULT_SQLITE_PATH)
+    ),
+}
+
+
+def register_dedupe_backend(name: str, factory: Callable[[], DedupeBackend]) -> None:
+    """Make a shared backend selectable with DEDUPE_BACKEND=<name>."""
+    _BACKENDS[name] = factory
+
+
+def dedupe_store_from_env() -> DedupeStore:
+    """Build a store from DEDUPE_* variables; callers keep it per container."""
+    backend_name = os.environ.get("DEDUPE_BACKEND", "").lower()
+    shared = None
+    if backend_name:
+        factory = _BACKENDS.get(backend_name)
+        if factory is None:
+            raise ValueError(f"Unknown DEDUPE_BACKEND: {backend_name}")
+        shared = factory()
+    return DedupeStore(
+        ttl_seconds=int(os.environ.get("DEDUPE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        local=LruDedupeCache(int(os.environ.get("DEDUPE_LRU_SIZE", DEFAULT_LRU_SIZE))),
+        shared=shared,
+    )
@@ -1,3 +1,11 @@
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of starting work that cannot finish before the deadline."""
+
+
 def remaining_ms(context) -> int:
     return getattr(context, "get_remaining_time_in_millis", lambda: 10000)()
 
@@ -9,3 +17,43 @@ def http_timeout_seconds(
     floor: int = 1,
 ) -> int:
     return min(cap, max(floor, remaining_ms(context) // 1000 - reserve_s))
+
+
+class Deadline:
+    """Absolute point on the monotonic clock by which the invocation must finish."""
+
+    __slots__ = ("_expires_at",)
+
+    def __init__(self, expires_at: float) -> None:
+        self._expires_at = expires_at
+
+    @classmethod
+    def from_context(cls, context, reserve_ms: int = 0) -> "Deadline":
+        """Deadline at the Lambda's remaining time minus reserve_ms for cleanup."""
+        return cls(time.monotonic() + (remaining_ms(context) - reserve_ms) / 1000)
+
+    def remaining_seconds(self) -> float:
+        return self._expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining_seconds() <= 0
+
+    def check(self, operation: str = "") -> None:
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline exceeded before {operation or 'call'}")
+
+    def timeout(self, cap: float, reserve_s: float = 0.5, operation: str = "") -> float:
+        """Per-call timeout: the remaining budget minus reserve_s, at most cap."""
+        budget = self.remaining_seconds() - reserve_s
+        if budget <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before {operation or 'call'}")
+        return min(cap, budget)
+
+
+def call_timeout(
+    deadline: Optional[Deadline], cap: float, operation: str = ""
+) -> float:
+    """Timeout for one outbound call; cap alone when there is no deadline."""
+    if deadline is None:
+        return cap
+    return deadline.timeout(cap, operation=operation)
@@ -12,13 +12,15 @@ def get_logger(name: str) -> logging.Logger:
 
 
 def log_json(logger: logging.Logger, level: str, msg: str, **fields: Any) -> None:
-    payload = {"msg": msg, **fields}
     level_name = level.lower()
     if level_name == "exception":
-        logger.exception(json.dumps(payload, default=str))
+        logger.exception(json.dumps({"msg": msg, **fields}, default=str))
         return
     level_value = logging._nameToLevel.get(level.upper(), logging.INFO)
-    logger.log(level_value, json.dumps(payload, default=str))
+    # Skip serialization entirely for suppressed levels (e.g. debug on hot paths).
+    if not logger.isEnabledFor(level_value):
+        return
+    logger.log(level_value, json.dumps({"msg": msg, **fields}, default=str))
 
 
 def log_exception(logger: logging.Logger, msg: str, **fields: Any) -> None:
@@ -0,0 +1,96 @@
+import json
+import os
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from utils.aws_clients import get_s3_client
+
+DEFAULT_PREFIX = "ingress-overflow/"
+DEFAULT_REJECTED_PREFIX = "ingress-overflow-rejected/"
+SQS_BATCH_LIMIT = 10
+SQS_BATCH_MAX_BYTES = 256 * 1024
+
+
+class RequeueResult(NamedTuple):
+    # Failed for reasons that may clear (throttling, SQS errors); keep them.
+    remaining: List[Dict[str, Any]]
+    # Failed with SenderFault: resending the same entry can never succeed.
+    rejected: List[Dict[str, Any]]
+
+
+def spill_messages(queue_url: str, messages: List[Dict[str, Any]]) -> Optional[str]:
+    """Write SendMessage fields to ``OVERFLOW_BUCKET`` as NDJSON.
+
+    Returns the object key, or None when no overflow bucket is configured.
+    """
+    bucket = os.environ.get("OVERFLOW_BUCKET")
+    if not bucket or not messages:
+        return None
+    prefix = os.environ.get("OVERFLOW_PREFIX", DEFAULT_PREFIX)
+    key = f"{prefix}{time.strftime('%Y/%m/%d/%H', time.gmtime())}/{uuid.uuid4().hex}.ndjson"
+    lines = [
+        json.dumps({"QueueUrl": queue_url, **_message_fields(message)})
+        for message in messages
+    ]
+    get_s3_client().put_object(
+        Bucket=bucket,
+        Key=key,
+        Body="\n".join(lines).encode("utf-8"),
+        ContentType="application/x-ndjson",
+    )
+    return key
+
+
+def requeue_messages(sqs_client, messages: List[Dict[str, Any]]) -> RequeueResult:
+    """Send spilled messages with SendMessageBatch and sort out the failures."""
+    by_queue: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for message in messages:
+        by_queue[message["QueueUrl"]].append(message)
+
+    remaining: List[Dict[str, Any]] = []
+    rejected: List[Dict[str, Any]] = []
+    for queue_url, queue_messages in by_queue.items():
+        for chunk in _batch_chunks(queue_messages):
+            entries = [
+                {"Id": str(index), **_message_fields(message)}
+                for index, message in enumerate(chunk)
+            ]
+            try:
+                response = sqs_client.send_message_batch(QueueUrl=queue_url, Entries=entries)
+            except Exception:
+                remaining.extend(chunk)
+                continue
+            for failure in response.get("Failed", []):
+                message = chunk[int(failure["Id"])]
+                if failure.get("SenderFault"):
+                    rejected.append(message)
+                else:
+                    remaining.append(message)
+    return RequeueResult(remaining, rejected)
+
+
+def _batch_chunks(messages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    # SendMessageBatch takes at most 10 entries and 256 KB in total; a request
+    # over either limit fails as a whole, every time.
+    chunks: List[List[Dict[str, Any]]] = []
+    chunk: List[Dict[str, Any]] = []
+    chunk_bytes = 0
+    for message in messages:
+        body_bytes = len(str(message.get("MessageBody", "")).encode("utf-8"))
+        if chunk and (
+            len(chunk) >= SQS_BATCH_LIMIT or chunk_bytes + body_bytes > SQS_BATCH_MAX_BYTES
+        ):
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(message)
+        chunk_bytes += body_bytes
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _message_fields(message: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: value for name, value in message.items() if name not in ("Id", "QueueUrl")}
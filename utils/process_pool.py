@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+from utils.lambda_time import Deadline, DeadlineExceeded
+from utils.observability import get_logger, log_json
+
+logger = get_logger(__name__)
+
+_POOL: Optional["ProcessPool"] = None
+_POOL_LOCK = threading.Lock()
+# True inside pool workers so offloaded functions never re-offload.
+_IN_WORKER = False
+
+
+def _worker_loop(conn: Any) -> None:
+    global _IN_WORKER, _POOL
+    _IN_WORKER = True
+    _POOL = None
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        func, args, kwargs = request
+        try:
+            response = ("ok", func(*args, **kwargs))
+        except Exception as exc:
+            response = ("error", exc)
+        try:
+            conn.send(response)
+        except Exception as exc:
+            conn.send(("error", RuntimeError(f"Unpicklable pool result: {exc!r}")))
+
+
+class _PoolWorker:
+    """One long-lived child process and the parent's end of its duplex pipe."""
+
+    __slots__ = ("process", "conn")
+
+    def __init__(self, ctx: Any) -> None:
+        parent_conn, child_conn = ctx.Pipe(duplex=True)
+        self.process = ctx.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        self.conn.send((func, args, kwargs))
+        if deadline is not None and not self.conn.poll(
+            max(0.0, deadline.remaining_seconds())
+        ):
+            raise DeadlineExceeded("Deadline exceeded waiting for process pool result")
+        status, value = self.conn.recv()
+        if status == "error":
+            raise value
+        return value
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class ProcessPool:
+    """Process + Pipe workers for CPU-bound calls.
+
+    multiprocessing.Pool and Queue rely on POSIX semaphores in /dev/shm, which
+    Lambda does not provide; pipes are plain socketpairs. Workers are started
+    once and reused across warm invocations. Threads borrow an idle worker
+    for each call, so up to `size` calls run in parallel.
+
+    The pool is usually created lazily from a lookup thread or
+    asyncio.to_thread, while other threads may hold locks (logging, boto3's
+    session, the import lock). A plain fork would copy those locks held into
+    the child, so workers come from a forkserver: a single-threaded server
+    process started with fork+exec.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._ctx = multiprocessing.get_context("forkserver")
+        self._idle: "queue.Queue[_PoolWorker]" = queue.Queue()
+        for _ in range(size):
+            self._idle.put(_PoolWorker(self._ctx))
+
+    def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        deadline: Optional[Deadline] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Call a module-level (picklable) function in a worker process.
+
+        With a deadline, waiting for an idle worker and for the result both
+        stop when it runs out; a worker still busy then is replaced.
+        """
+        timeout = None if deadline is None else max(0.0, deadline.remaining_seconds())
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise DeadlineExceeded("Deadline exceeded waiting for a pool worker")
+        try:
+            return worker.call(func, args, kwargs, deadline)
+        except DeadlineExceeded:
+            log_json(
+                logger,
+                "warning",
+                "process_pool_call_timed_out",
+                pid=worker.process.pid,
+            )
+            worker = self._replace(worker)
+            raise
+        except (EOFError, OSError, BrokenPipeError) as exc:
+            # The child died mid-call (e.g. OOM); replace it for the next caller.
+            log_json(
+                logger,
+                "warning",
+                "process_pool_worker_lost",
+                pid=worker.process.pid,
+                error_type=type(exc).__name__,
+            )
+            worker = self._replace(worker)
+            raise RuntimeError("Process pool worker exited during call") from exc
+        finally:
+            self._idle.put(worker)
+
+    def _replace(self, worker: _PoolWorker) -> _PoolWorker:
+        worker.process.kill()
+        worker.close()
+        return _PoolWorker(self._ctx)
+
+    def close(self) -> None:
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+def get_process_pool() -> Optional[ProcessPool]:
+    """Container-wide pool of PROCESS_POOL_SIZE workers; off unless set.
+
+    Returns None when the variable is unset or below 2, since the pool costs
+    a forkserver plus one process per worker and only pays off on functions
+    sized for several vCPUs.
+    """
+    global _POOL
+    if _IN_WORKER:
+        return None
+    if _POOL is None:
+        size = int(os.environ.get("PROCESS_POOL_SIZE") or 0)
+        if size < 2:
+            return None
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ProcessPool(size)
+                log_json(logger, "info", "process_pool_started", size=size)
+    return _POOL
+
+
+def run_cpu_bound(
+    func: Callable[..., Any],
+    *args: Any,
+    deadline: Optional[Deadline] = None,
+    **kwargs: Any,
+) -> Any:
+    """Run func in the process pool when one is available, else inline.
+
+    deadline bounds the wait on the pool (it is not passed to func); inline
+    calls only check it before starting.
+    """
+    pool = get_process_pool()
+    if pool is None:
+        if deadline is not None:
+            deadline.check("CPU-bound call")
+        return func(*args, **kwargs)
+    return pool.run(func, *args, deadline=deadline, **kwargs)
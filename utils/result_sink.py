@@ -0,0 +1,174 @@
+import abc
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Protocol
+
+from utils.aws_clients import get_s3_client
+
+DEFAULT_PREFIX = "worker-results/"
+# S3 rejects multipart parts under 5 MiB (except the last one).
+MIN_PART_BYTES = 5 * 1024 * 1024
+DEFAULT_PART_BYTES = 8 * 1024 * 1024
+
+
+class ResultSink(Protocol):
+    def write(self, payload: Dict[str, Any]) -> None:
+        """Append one result as an NDJSON line."""
+
+    def close(self) -> Optional[str]:
+        """Flush everything; return where the results landed (None if empty)."""
+
+    def abort(self) -> None:
+        """Discard anything written so far."""
+
+
+class _GzipNdjsonSink(abc.ABC):
+    """Gzip-compresses NDJSON lines incrementally into a bounded buffer.
+
+    Subclasses receive compressed chunks of at least part_bytes through
+    _flush_part, so memory stays near part_bytes however many results pass
+    through.
+    """
+
+    def __init__(self, part_bytes: int) -> None:
+        self.part_bytes = part_bytes
+        self.count = 0
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        self._buffer = bytearray()
+
+    def write(self, payload: Dict[str, Any]) -> None:
+        line = json.dumps(payload, separators=(",", ":"), default=str) + "\n"
+        self._buffer += self._compressor.compress(line.encode("utf-8"))
+        self.count += 1
+        if len(self._buffer) >= self.part_bytes:
+            self._flush_part(bytes(self._buffer), final=False)
+            self._buffer.clear()
+
+    def close(self) -> Optional[str]:
+        if not self.count:
+            return None
+        self._buffer += self._compressor.flush()
+        self._flush_part(bytes(self._buffer), final=True)
+        self._buffer.clear()
+        return self._location()
+
+    def abort(self) -> None:
+        self._buffer.clear()
+
+    @abc.abstractmethod
+    def _flush_part(self, data: bytes, *, final: bool) -> None:
+        """Store one compressed chunk; final is set for the last one."""
+
+    @abc.abstractmethod
+    def _location(self) -> str:
+        """Where close() reports the results landed."""
+
+
+class S3MultipartSink(_GzipNdjsonSink):
+    """Streams results to one gzip NDJSON object via S3 multipart upload.
+
+    Small result sets that never fill a part are written with one PutObject.
+    """
+
+    def __init__(
+        self, bucket: str, key: str, part_bytes: int = DEFAULT_PART_BYTES
+    ) -> None:
+        super().__init__(max(part_bytes, MIN_PART_BYTES))
+        self.bucket = bucket
+        self.key = key
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict[str, Any]] = []
+
+    def _flush_part(self, data: bytes, *, final: bool) -> None:
+        s3 = get_s3_client()
+        if final and self._upload_id is None:
+            s3.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=data,
+                ContentType="application/x-ndjson",
+                ContentEncoding="gzip",
+            )
+            return
+        if self._upload_id is None:
+            self._upload_id = s3.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType="application/x-ndjson",
+                ContentEncoding="gzip",
+            )["UploadId"]
+        part_number = len(self._parts) + 1
+        response = s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        if final:
+            s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+
+    def _location(self) -> str:
+        return f"s3://{self.bucket}/{self.key}"
+
+    def abort(self) -> None:
+        super().abort()
+        if self._upload_id is not None:
+            # Incomplete uploads are billed until aborted.
+            get_s3_client().abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+            self._upload_id = None
+
+
+class LocalFileSink(_GzipNdjsonSink):
+    """Writes the same gzip NDJSON stream to a local file (tests, local runs)."""
+
+    def __init__(self, path: str, part_bytes: int = 64 * 1024) -> None:
+        super().__init__(part_bytes)
+        self.path = path
+        self._file = None
+
+    def _flush_part(self, data: bytes, *, final: bool) -> None:
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "wb")
+        self._file.write(data)
+        if final:
+            self._file.close()
+
+    def _location(self) -> str:
+        return self.path
+
+    def abort(self) -> None:
+        super().abort()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self.path)
+
+
+def get_result_sink(batch_id: str) -> Optional[ResultSink]:
+    """Sink selected by RESULT_SINK (``s3`` or ``local``); None when unset."""
+    kind = os.environ.get("RESULT_SINK", "").lower()
+    if not kind:
+        return None
+    prefix = os.environ.get("RESULT_SINK_PREFIX", DEFAULT_PREFIX)
+    name = f"{prefix}{time.strftime('%Y/%m/%d/%H', time.gmtime())}/{batch_id}.ndjson.gz"
+    if kind == "s3":
+        bucket = os.environ.get("RESULT_SINK_BUCKET")
+        if not bucket:
+            raise ValueError("RESULT_SINK_BUCKET is not set")
+        part_bytes = int(os.environ.get("RESULT_SINK_PART_BYTES", DEFAULT_PART_BYTES))
+        return S3MultipartSink(bucket, name, part_bytes)
+    if kind == "local":
+        return LocalFileSink(os.path.join(os.environ.get("RESULT_SINK_DIR", "."), name))
+    raise ValueError(f"Unknown RESULT_SINK: {kind}")
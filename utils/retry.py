@@ -0,0 +1,83 @@
+import random
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+from botocore.exceptions import (
+    ClientError,
+    ConnectionClosedError,
+    ReadTimeoutError,
+)
+from botocore.exceptions import ConnectionError as BotoConnectionError
+
+from utils.lambda_time import remaining_ms
+
+T = TypeVar("T")
+
+RETRYABLE_ERROR_CODES = {
+    "InternalError",
+    "InternalFailure",
+    "KMS.ThrottlingException",
+    "RequestThrottled",
+    "ServiceUnavailable",
+    "SlowDown",
+    "ThrottlingException",
+    "Throttling",
+}
+
+
+# Transport failures where the request may not have reached AWS or the reply
+# was lost. botocore's ConnectionError covers EndpointConnectionError and
+# ConnectTimeoutError.
+RETRYABLE_TRANSPORT_ERRORS = (
+    BotoConnectionError,
+    ConnectionClosedError,
+    ReadTimeoutError,
+)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Throttling/5xx AWS errors and connection or timeout errors are retryable.
+
+    Anything else (validation errors, bugs in our own code) fails the same way
+    on every attempt.
+    """
+    if isinstance(exc, ClientError):
+        code = exc.response.get("Error", {}).get("Code", "")
+        status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return code in RETRYABLE_ERROR_CODES or status == 429 or status >= 500
+    return isinstance(exc, RETRYABLE_TRANSPORT_ERRORS)
+
+
+def retry_delay(
+    attempt: int,
+    context: Any,
+    *,
+    max_attempts: int = 4,
+    base_s: float = 0.05,
+    cap_s: float = 1.0,
+    reserve_ms: int = 1000,
+) -> Optional[float]:
+    """Full-jitter delay before retry ``attempt`` (1-based), or None to give up.
+
+    Gives up once ``max_attempts`` is reached or the delay would eat into the
+    last ``reserve_ms`` of the Lambda invocation.
+    """
+    if attempt >= max_attempts:
+        return None
+    delay = random.uniform(0, min(cap_s, base_s * (2 ** attempt)))
+    if remaining_ms(context) - reserve_ms < delay * 1000:
+        return None
+    return delay
+
+
+def call_with_retries(fn: Callable[[], T], context: Any, **retry_options: Any) -> T:
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as exc:
+            attempt += 1
+            delay = retry_delay(attempt, context, **retry_options) if is_retryable(exc) else None
+            if delay is None:
+                raise
+            time.sleep(delay)
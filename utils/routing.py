@@ -0,0 +1,114 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_LANE = "default"
+
+# Key marking a trie node where a prefix ends; never a single character.
+_TERMINAL = ""
+
+
+class _PrefixTrie:
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, prefix: str, rule_index: int) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = min(node.get(_TERMINAL, rule_index), rule_index)
+
+    def best_match(self, value: str) -> Optional[int]:
+        node = self._root
+        best = node.get(_TERMINAL)
+        for char in value:
+            node = node.get(char)
+            if node is None:
+                break
+            matched = node.get(_TERMINAL)
+            if matched is not None and (best is None or matched < best):
+                best = matched
+        return best
+
+
+class RoutingTable:
+    """Rule table compiled into per-field exact-match maps and prefix tries.
+
+    Rules keep first-match-wins semantics: every lookup yields the lowest
+    matching rule index across all fields.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]], default_lane: str = DEFAULT_LANE) -> None:
+        self.default_lane = default_lane
+        self._lanes: List[str] = []
+        self._exact: Dict[str, Dict[str, int]] = {}
+        self._prefixes: Dict[str, _PrefixTrie] = {}
+        for rule_index, rule in enumerate(rules):
+            lane = rule.get("lane")
+            field = rule.get("field")
+            if not lane or not field:
+                raise ValueError(f"Routing rule {rule_index} needs 'lane' and 'field'")
+            equals = _as_list(rule.get("equals"))
+            prefixes = _as_list(rule.get("prefix"))
+            if not equals and not prefixes:
+                raise ValueError(f"Routing rule {rule_index} needs 'equals' or 'prefix'")
+            self._lanes.append(lane)
+            exact = self._exact.setdefault(field, {})
+            for value in equals:
+                exact.setdefault(value, rule_index)
+            if prefixes:
+                trie = self._prefixes.setdefault(field, _PrefixTrie())
+                for prefix in prefixes:
+                    trie.insert(prefix, rule_index)
+        self._fields = sorted(set(self._exact) | set(self._prefixes))
+
+    @property
+    def lanes(self) -> List[str]:
+        return sorted(set(self._lanes) | {self.default_lane})
+
+    def classify(self, body: Any) -> str:
+        if not isinstance(body, dict):
+            return self.default_lane
+        best: Optional[int] = None
+        for field in self._fields:
+            value = _field_value(body, field)
+            if value is None:
+                continue
+            value = str(value)
+            matched = self._exact.get(field, {}).get(value)
+            if matched is not None and (best is None or matched < best):
+                best = matched
+            trie = self._prefixes.get(field)
+            if trie is not None:
+                matched = trie.best_match(value)
+                if matched is not None and (best is None or matched < best):
+                    best = matched
+        return self.default_lane if best is None else self._lanes[best]
+
+
+def compile_routing_table(spec: Union[str, Dict[str, Any], None]) -> RoutingTable:
+    """Build a RoutingTable from ``{"default": lane, "rules": [...]}`` (or its JSON).
+
+    Each rule is ``{"lane": ..., "field": "source", "equals": [...]}`` and/or
+    ``"prefix": [...]``; ``field`` may be a dotted path into the body.
+    """
+    if isinstance(spec, str):
+        spec = json.loads(spec) if spec.strip() else None
+    spec = spec or {}
+    return RoutingTable(spec.get("rules") or [], spec.get("default") or DEFAULT_LANE)
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def _field_value(body: Dict[str, Any], field: str) -> Any:
+    value: Any = body
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
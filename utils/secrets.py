@@ -1,12 +1,17 @@
+import threading
 import time
 from typing import Any, Dict, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
 from utils.aws_clients import get_secretsmanager_client
+from utils.lambda_time import Deadline
 from utils.observability import emit_metric, elapsed_ms, get_logger, log_json
 
 _SECRET_CACHE: Dict[str, Tuple[str, float]] = {}
+# Per-secret locks so concurrent misses on one name trigger a single fetch.
+_SECRET_LOCKS: Dict[str, threading.Lock] = {}
+_SECRET_LOCKS_GUARD = threading.Lock()
 _SECRET_LOGGER = None
 _SECRET_COMMON_FIELDS: Dict[str, Any] = {}
 _SECRET_METRIC_DIMS: Optional[Dict[str, str]] = None
@@ -93,29 +98,60 @@ def _fetch_secret(secret_name: str) -> str:
     return secret_value
 
 
-def get_secret_cached(secret_name: str, *, ttl_seconds: int = 900) -> str:
-    now = time.time()
+def _secret_lock(secret_name: str) -> threading.Lock:
+    with _SECRET_LOCKS_GUARD:
+        lock = _SECRET_LOCKS.get(secret_name)
+        if lock is None:
+            lock = _SECRET_LOCKS[secret_name] = threading.Lock()
+        return lock
+
+
+def _cached_secret(secret_name: str, now: float, ttl_seconds: int) -> Optional[str]:
     cache_entry = _SECRET_CACHE.get(secret_name)
-    if cache_entry:
-        cached_value, cached_at = cache_entry
-        cache_age = now - cached_at
-        if cache_age < ttl_seconds:
-            duration_ms = int((time.time() - now) * 1000)
-            _log(
-                "email_adapter_secret_cache_hit",
-                secret_name=secret_name,
-                duration_ms=duration_ms,
-                cache_age_ms=int(cache_age * 1000),
-            )
-            return cached_value
+    if not cache_entry:
+        return None
+    cached_value, cached_at = cache_entry
+    cache_age = now - cached_at
+    if cache_age >= ttl_seconds:
+        return None
+    duration_ms = int((time.time() - now) * 1000)
+    _log(
+        "email_adapter_secret_cache_hit",
+        secret_name=secret_name,
+        duration_ms=duration_ms,
+        cache_age_ms=int(cache_age * 1000),
+    )
+    return cached_value
+
 
-    cache_age_ms = None
-    if cache_entry:
-        cache_age_ms = int((now - cache_entry[1]) * 1000)
-    miss_start = time.time()
-    secret_value = _fetch_secret(secret_name)
-    fetched_at = time.time()
-    _SECRET_CACHE[secret_name] = (secret_value, fetched_at)
+def get_secret_cached(
+    secret_name: str,
+    *,
+    ttl_seconds: int = 900,
+    deadline: Optional[Deadline] = None,
+) -> str:
+    now = time.time()
+    cached_value = _cached_secret(secret_name, now, ttl_seconds)
+    if cached_value is not None:
+        return cached_value
+
+    with _secret_lock(secret_name):
+        # Another thread may have refreshed the entry while we waited.
+        cached_value = _cached_secret(secret_name, time.time(), ttl_seconds)
+        if cached_value is not None:
+            return cached_value
+        # The Secrets Manager client has fixed socket timeouts, so the deadline
+        # only decides whether a fetch may start at all.
+        if deadline is not None:
+            deadline.check(f"secret fetch {secret_name}")
+        cache_entry = _SECRET_CACHE.get(secret_name)
+        cache_age_ms = None
+        if cache_entry:
+            cache_age_ms = int((now - cache_entry[1]) * 1000)
+        miss_start = time.time()
+        secret_value = _fetch_secret(secret_name)
+        fetched_at = time.time()
+        _SECRET_CACHE[secret_name] = (secret_value, fetched_at)
     duration_ms = int((fetched_at - miss_start) * 1000)
     _log(
         "email_adapter_secret_cache_miss",
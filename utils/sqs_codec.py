@@ -0,0 +1,54 @@
+import base64
+import gzip
+import zlib
+from typing import Any, Dict, Tuple
+
+CODEC_ATTRIBUTE = "jarvis-codec"
+CODEC_ZLIB = "zlib+base64"
+CODEC_GZIP = "gzip+base64"
+
+_CODEC_ALIASES = {
+    "zlib": CODEC_ZLIB,
+    CODEC_ZLIB: CODEC_ZLIB,
+    "gzip": CODEC_GZIP,
+    CODEC_GZIP: CODEC_GZIP,
+}
+
+
+def encode_message_body(
+    message_body: str,
+    codec: str,
+    min_bytes: int = 1024,
+) -> Tuple[str, Dict[str, Any]]:
+    """Compress ``message_body`` with ``codec`` and return it with SQS attributes.
+
+    Bodies below ``min_bytes``, unknown/empty codecs, and bodies that do not
+    shrink are returned unchanged with no attributes.
+    """
+    codec_name = _CODEC_ALIASES.get((codec or "").lower())
+    raw = message_body.encode("utf-8")
+    if not codec_name or len(raw) < min_bytes:
+        return message_body, {}
+    if codec_name == CODEC_GZIP:
+        compressed = gzip.compress(raw)
+    else:
+        compressed = zlib.compress(raw)
+    encoded = base64.b64encode(compressed).decode("ascii")
+    if len(encoded) >= len(raw):
+        return message_body, {}
+    return encoded, {CODEC_ATTRIBUTE: {"DataType": "String", "StringValue": codec_name}}
+
+
+def decode_record_body(record: Dict[str, Any]) -> str:
+    """Return the SQS record body, decompressing it when it carries the codec attribute."""
+    body = record.get("body") or ""
+    attribute = (record.get("messageAttributes") or {}).get(CODEC_ATTRIBUTE)
+    if not attribute or not body:
+        return body
+    codec_name = attribute.get("stringValue") or attribute.get("StringValue")
+    compressed = base64.b64decode(body)
+    if codec_name == CODEC_GZIP:
+        return gzip.decompress(compressed).decode("utf-8")
+    if codec_name == CODEC_ZLIB:
+        return zlib.decompress(compressed).decode("utf-8")
+    raise ValueError(f"Unknown message codec: {codec_name}")